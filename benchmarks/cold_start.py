@@ -0,0 +1,86 @@
+"""
+Benchmark cold start: waktu memuat semua workbook dashboard dari nol.
+
+Setiap skenario dijalankan di proses Python baru dengan folder cache kosong
+(kecuali skenario "warm"), lalu hasilnya ditambahkan ke
+benchmarks/results/cold_start.csv supaya regresi terlihat dari waktu ke waktu.
+
+    python benchmarks/cold_start.py
+"""
+import csv
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_PATH = os.path.join(ROOT, "benchmarks", "results", "cold_start.csv")
+
+# Dijalankan di proses anak: ukur waktu sampai halaman awal bisa tampil
+# (warm_up kembali) dan sampai semua data siap
+CHILD = """
+import json, sys, time
+started = time.perf_counter()
+sys.path.insert(0, {root!r})
+import data_loader
+imported = time.perf_counter()
+data_loader.warm_up()
+first_paint = time.perf_counter()
+data_loader.wait_until_warm()
+store, data = data_loader.load_transaction_store()
+ready = time.perf_counter()
+print(json.dumps({{
+    "engine": data_loader.EXCEL_ENGINE or "openpyxl",
+    "rows": len(store),
+    "first_paint_s": round(first_paint - started, 3),
+    "ready_s": round(ready - started, 3),
+}}))
+"""
+
+SCENARIOS = [
+    ("serial_openpyxl", {"ROP_EXCEL_ENGINE": "openpyxl", "ROP_LOAD_WORKERS": "1"}, False),
+    ("parallel_openpyxl", {"ROP_EXCEL_ENGINE": "openpyxl"}, False),
+    ("parallel_default_engine", {}, False),
+    ("warm_cache", {}, True),
+]
+
+
+def run_scenario(env_overrides, cache_dir):
+    env = dict(os.environ, ROP_CACHE_DIR=cache_dir, **env_overrides)
+    out = subprocess.run([sys.executable, "-c", CHILD.format(root=ROOT)],
+                         env=env, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, env_overrides, reuse_cache in SCENARIOS:
+            cache_dir = os.path.join(tmp, "shared-cache" if reuse_cache else name)
+            if reuse_cache:
+                # Isi cache dulu, lalu ukur start berikutnya
+                run_scenario(env_overrides, cache_dir)
+            result = run_scenario(env_overrides, cache_dir)
+            result.update(scenario=name, cpu_count=os.cpu_count())
+            rows.append(result)
+            print(f"{name:<26} engine={result['engine']:<9} first paint {result['first_paint_s']:>6.2f}s"
+                  f"  data siap {result['ready_s']:>6.2f}s  ({result['rows']} baris)")
+
+    os.makedirs(os.path.dirname(RESULTS_PATH), exist_ok=True)
+    new_file = not os.path.exists(RESULTS_PATH)
+    fields = ["timestamp", "host", "scenario", "engine", "cpu_count", "rows", "first_paint_s", "ready_s"]
+    with open(RESULTS_PATH, "a", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        if new_file:
+            writer.writeheader()
+        stamp = datetime.now().isoformat(timespec="seconds")
+        for row in rows:
+            writer.writerow({"timestamp": stamp, "host": platform.node(), **row})
+    print(f"Hasil ditambahkan ke {RESULTS_PATH}")
+
+
+if __name__ == "__main__":
+    main()
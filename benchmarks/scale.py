@@ -0,0 +1,224 @@
+"""
+Benchmark skala: waktu setiap tahap dashboard dengan data gudang sintetis 1x,
+10x, 100x ukuran data asli (benchmarks/synthetic_data.py), di luar Streamlit.
+
+Setiap skala dijalankan di proses Python baru dengan folder cache & data
+kosong. Tahap yang diukur:
+
+- ingest: load_transaction_store dari workbook .xlsx sintetis (sampai
+  --ingest-max-scale; skala lebih besar memakai store yang dibangun di memori,
+  karena menulis Excel sebesar itu lama dan melewati batas baris .xlsx),
+- index nobar, usage cube, statistik permintaan, forecast, movement status,
+- evaluasi ROP seluruh katalog (rop_engine.evaluate_catalogue),
+- pencarian nobar (item_search.compute_search, p50/p95 beberapa query),
+- figure grafik bulanan & harian (charts.build_charts / charts.comparison_trend).
+
+Hasil ditambahkan ke benchmarks/results/scale.csv (satu baris per skala x
+tahap) dan dibandingkan dengan run sebelumnya di host yang sama; tahap yang
+lebih lambat dari REGRESSION_RATIO ditandai.
+
+    python benchmarks/scale.py                    # skala 1, 10, 100
+    python benchmarks/scale.py --scales 1,10 --fail-on-regression
+"""
+import argparse
+import csv
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_PATH = os.path.join(ROOT, "benchmarks", "results", "scale.csv")
+FIELDS = ["timestamp", "host", "cpu_count", "scale", "items", "rows", "stage", "seconds"]
+
+DEFAULT_SCALES = (1, 10, 100)
+# Tahap dianggap regresi jika lebih lambat dari run sebelumnya x rasio ini
+REGRESSION_RATIO = 1.5
+# Di bawah ini selisih waktu dianggap noise
+MIN_SECONDS = 0.05
+SEARCH_REPEAT = 3
+
+
+# ----------------------------------------------------
+# Proses anak: satu skala
+# ----------------------------------------------------
+def _timed(stages, name, fn):
+    started = time.perf_counter()
+    value = fn()
+    stages[name] = round(time.perf_counter() - started, 4)
+    return value
+
+
+def _queries(dataset):
+    """Query pencarian: barang terpopuler, barang jarang, prefix grup, nama barang, tidak ada."""
+    items = dataset["items"]["nobar"]
+    item, _, _ = dataset["transactions"][max(dataset["transactions"])]
+    counts = np.bincount(item, minlength=len(items))
+    return [
+        items.iloc[int(counts.argmax())],
+        items.iloc[int(counts.argmin())],
+        items.iloc[0][:4].lower(),
+        items.iloc[len(items) // 2][:7].lower(),
+        "zzzz",
+    ]
+
+
+def run_child(scale, ingest, seed):
+    sys.path.insert(0, ROOT)
+    sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+    import charts
+    import data_loader
+    import demand_stats
+    import forecast
+    import item_compare
+    import item_search
+    import lead_time_scenarios
+    import movement
+    import nobar_index
+    import rop_engine
+    import synthetic_data
+    import usage_cube
+
+    stages = {}
+    dataset = _timed(stages, "generate", lambda: synthetic_data.generate(scale, seed))
+    years = list(dataset["transactions"])
+
+    if ingest:
+        paths = _timed(stages, "write_xlsx",
+                       lambda: synthetic_data.write_workbooks(dataset, data_loader.DATA_DIR))
+        store, data = _timed(stages, "ingest_cold", lambda: data_loader.load_transaction_store(paths))
+        version, changes = data_loader.transaction_version(), data_loader.last_changes()
+    else:
+        store = _timed(stages, "store_build", lambda: synthetic_data.build_store(dataset))
+        data = data_loader.partition_by_year(store)
+        version, changes = data_loader.data_version(scale, seed), None
+
+    lead_times = {label: data_loader.prepare_lead_time(df.copy()) for label, df in dataset["lead_times"].items()}
+    tables = {
+        "transaction_store": store,
+        "data": data,
+        "rop_existing": dataset["rop_existing"],
+        "lead_times": lead_times,
+        "movement_status": dataset["movement_status"],
+    }
+    tables["item_index"] = _timed(stages, "index_build", lambda: nobar_index.get_index({
+        **data,
+        "movement_status": tables["movement_status"],
+        **{lead_time_scenarios.index_table(label): df for label, df in lead_times.items()},
+        "rop_existing": tables["rop_existing"],
+    }))
+    tables["usage_data"] = _timed(stages, "usage_cube", lambda: usage_cube.get_cube(data, version, changes))
+    tables["match_usage_keys"] = tables["item_index"].match_keys
+    tables["demand_stats"] = _timed(stages, "demand_stats", lambda: demand_stats.catalogue_stats(store))
+    tables["forecast"] = _timed(stages, "forecast", lambda: forecast.catalogue_forecast(store))
+    tables["movement"] = _timed(stages, "movement", lambda: movement.get_movement(data, version, changes))
+
+    usage_table = rop_engine.yearly_usage_table(tables["usage_data"].cells, years)
+    _timed(stages, "rop_catalogue", lambda: rop_engine.evaluate_catalogue(usage_table, lead_times))
+
+    # Pencarian: waktu per query (tanpa cache hasil), diulang beberapa kali
+    search_times, result = [], None
+    for query in _queries(dataset):
+        for _ in range(SEARCH_REPEAT):
+            started = time.perf_counter()
+            found = item_search.compute_search(tables, query, None, years)
+            search_times.append(time.perf_counter() - started)
+            if result is None and not found["empty"]:
+                result = found
+    stages["search_p50"] = round(float(np.percentile(search_times, 50)), 4)
+    stages["search_p95"] = round(float(np.percentile(search_times, 95)), 4)
+
+    _timed(stages, "figures", lambda: charts.build_charts(result, years))
+    _timed(stages, "figures_daily", lambda: charts.build_charts(result, years, "Harian"))
+    nobars = dataset["items"]["nobar"].iloc[:item_compare.MAX_TREND_ITEMS].tolist()
+    comparison = item_compare.compute_comparison(tables, nobars, None, years)
+    _timed(stages, "comparison_figure", lambda: charts.comparison_trend(comparison, years))
+    _timed(stages, "comparison_figure_daily", lambda: charts.comparison_trend(comparison, years, "Harian"))
+
+    print(json.dumps({"items": len(dataset["items"]), "rows": len(store), "stages": stages}))
+
+
+# ----------------------------------------------------
+# Proses induk
+# ----------------------------------------------------
+def run_scale(scale, ingest, seed):
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, ROP_CACHE_DIR=os.path.join(tmp, "cache"), ROP_DATA_DIR=tmp)
+        args = [sys.executable, os.path.abspath(__file__), "--child", str(scale), "--seed", str(seed)]
+        if ingest:
+            args.append("--ingest")
+        out = subprocess.run(args, env=env, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def previous_results(host):
+    """{(scale, stage): detik} dari run terakhir di host ini."""
+    previous = {}
+    if not os.path.exists(RESULTS_PATH):
+        return previous
+    with open(RESULTS_PATH, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            if row["host"] == host:
+                previous[(float(row["scale"]), row["stage"])] = float(row["seconds"])
+    return previous
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dashboard ROP dengan data sintetis")
+    parser.add_argument("--scales", default=",".join(str(s) for s in DEFAULT_SCALES),
+                        help="daftar skala dipisah koma (1 = ukuran data asli)")
+    parser.add_argument("--ingest-max-scale", type=float, default=10,
+                        help="skala terbesar yang di-ingest dari file .xlsx")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fail-on-regression", action="store_true",
+                        help="exit code 1 jika ada tahap yang melambat")
+    parser.add_argument("--child", type=float, help=argparse.SUPPRESS)
+    parser.add_argument("--ingest", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        run_child(args.child, args.ingest, args.seed)
+        return
+
+    host = platform.node()
+    previous = previous_results(host)
+    stamp = datetime.now().isoformat(timespec="seconds")
+    rows, regressions = [], []
+    for scale in [float(s) for s in args.scales.split(",") if s.strip()]:
+        result = run_scale(scale, scale <= args.ingest_max_scale, args.seed)
+        print(f"skala {scale:g}x: {result['items']} barang, {result['rows']} baris")
+        for stage, seconds in result["stages"].items():
+            before = previous.get((scale, stage))
+            note = ""
+            if before is not None:
+                note = f"  (sebelumnya {before:.3f}s)"
+                if seconds > max(before * REGRESSION_RATIO, before + MIN_SECONDS):
+                    note += "  <-- REGRESI"
+                    regressions.append((scale, stage, before, seconds))
+            print(f"  {stage:<18} {seconds:>9.3f}s{note}")
+            rows.append({"timestamp": stamp, "host": host, "cpu_count": os.cpu_count(), "scale": scale,
+                         "items": result["items"], "rows": result["rows"], "stage": stage, "seconds": seconds})
+
+    os.makedirs(os.path.dirname(RESULTS_PATH), exist_ok=True)
+    new_file = not os.path.exists(RESULTS_PATH)
+    with open(RESULTS_PATH, "a", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        if new_file:
+            writer.writeheader()
+        writer.writerows(rows)
+    print(f"Hasil ditambahkan ke {RESULTS_PATH}")
+
+    if regressions:
+        print(f"{len(regressions)} tahap melambat > {REGRESSION_RATIO}x dibanding run sebelumnya.")
+        if args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
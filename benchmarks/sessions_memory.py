@@ -0,0 +1,97 @@
+"""
+Benchmark memori multi-sesi: RSS server saat banyak sesi dashboard aktif.
+
+Di proses Python baru, N sesi AppTest dibuka satu per satu di proses yang sama
+(seperti satu server Streamlit) dan masing-masing mencari nobar yang berbeda.
+Semua sesi tetap hidup sampai akhir. RSS dicatat sesudah sesi pertama dan
+sesudah sesi terakhir. Karena tabel data dipakai bersama (shared_store), RSS
+seharusnya hampir tidak naik per sesi. Hasil ditambahkan ke
+benchmarks/results/sessions_memory.csv.
+
+    python benchmarks/sessions_memory.py --sessions 12 --max-rss-mb 400
+
+Dengan --max-rss-mb, script keluar dengan kode 1 jika RSS akhir melebihi batas.
+"""
+import argparse
+import csv
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_PATH = os.path.join(ROOT, "benchmarks", "results", "sessions_memory.csv")
+
+# Dijalankan di proses anak: semua sesi di satu proses, seperti server Streamlit
+CHILD = """
+import json, os, sys
+os.chdir({root!r})
+sys.path.insert(0, {root!r})
+from streamlit.testing.v1 import AppTest
+import shared_store
+
+sessions, rss = [], []
+for query in {queries!r}:
+    at = AppTest.from_file(os.path.join({root!r}, "streamlit_app.py"), default_timeout=600)
+    at.run()
+    at.sidebar.text_input[0].set_value(query)
+    [b for b in at.sidebar.button if b.label == "Search"][0].click().run()
+    if at.exception:
+        raise SystemExit(f"Sesi {{query}} gagal: {{at.exception[0].value}}")
+    sessions.append(at)
+    rss.append(shared_store.rss_bytes())
+print(json.dumps({{"rss": rss}}))
+"""
+
+
+def pick_queries(n):
+    """n nobar berbeda dari file transaksi terbaru (dibaca di proses induk, bukan di proses yang diukur)."""
+    sys.path.insert(0, ROOT)
+    import data_loader
+
+    files = data_loader.discover_transaction_files()
+    latest = files[max(files)][-1]
+    df = data_loader.read_excel_cached(latest, prepare=data_loader.prepare_transactions, memoize=False)
+    nobars = df["nobar"].astype(str).value_counts().index.tolist()
+    return nobars[:n]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="RSS server dashboard dengan banyak sesi aktif.")
+    parser.add_argument("--sessions", type=int, default=12, help="Jumlah sesi (default 12)")
+    parser.add_argument("--max-rss-mb", type=float, default=None, help="Batas RSS akhir (MB)")
+    args = parser.parse_args(argv)
+
+    queries = pick_queries(args.sessions)
+    out = subprocess.run([sys.executable, "-c", CHILD.format(root=ROOT, queries=queries)],
+                         capture_output=True, text=True, check=True)
+    rss = json.loads(out.stdout.strip().splitlines()[-1])["rss"]
+    first_mb, last_mb = rss[0] / 1e6, rss[-1] / 1e6
+    per_session = (last_mb - first_mb) / max(len(rss) - 1, 1)
+    print(f"{len(rss)} sesi: RSS sesi pertama {first_mb:.1f} MB, sesudah sesi terakhir {last_mb:.1f} MB "
+          f"(+{per_session:.1f} MB per sesi tambahan)")
+
+    os.makedirs(os.path.dirname(RESULTS_PATH), exist_ok=True)
+    new_file = not os.path.exists(RESULTS_PATH)
+    fields = ["timestamp", "host", "sessions", "rss_first_mb", "rss_last_mb", "mb_per_session"]
+    with open(RESULTS_PATH, "a", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        if new_file:
+            writer.writeheader()
+        writer.writerow({
+            "timestamp": datetime.now().isoformat(timespec="seconds"), "host": platform.node(),
+            "sessions": len(rss), "rss_first_mb": round(first_mb, 1), "rss_last_mb": round(last_mb, 1),
+            "mb_per_session": round(per_session, 2),
+        })
+    print(f"Hasil ditambahkan ke {RESULTS_PATH}")
+
+    if args.max_rss_mb is not None and last_mb > args.max_rss_mb:
+        print(f"RSS {last_mb:.1f} MB melebihi batas {args.max_rss_mb:.0f} MB")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+"""
+Data gudang sintetis dengan skema yang sama dengan workbook asli.
+
+Skala 1 kira-kira sebesar data asli (±1.800 barang, ±37.000 transaksi per
+tahun); skala 10 / 100 mengalikan jumlah barang dan transaksi. Popularitas
+barang mengikuti distribusi Zipf (sedikit barang sangat sering keluar, banyak
+barang jarang), jadi bentuk datanya mirip data asli.
+
+- generate(): tabel mentah (transaksi per tahun dengan tanggal dd/mm/YYYY,
+  lead time 2024/2023, ROP existing, movement status),
+- write_workbooks(): tulis sebagai file .xlsx di folder (untuk benchmark ingest),
+- build_store(): store transaksi ringkas langsung di memori (seperti hasil
+  data_loader.load_transaction_store, tanpa menulis/membaca Excel).
+
+Transaksi disimpan sebagai array (id barang, tanggal, jumlah) per tahun supaya
+skala 100 tetap muat di memori; tabel berskema workbook dibuat saat dibutuhkan.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+ITEMS_PER_SCALE = 1800
+ROWS_PER_YEAR_PER_SCALE = 37000
+YEARS = (2020, 2021, 2022, 2023, 2024)
+
+_GROUPS = ["CA0A", "CA1A", "CC6A", "PA3B", "PA3L", "PB1A", "PL3A", "RA1B", "RA5A", "RA8A", "TB1A", "TB6A"]
+_WORDS = ["BOLT", "NUT", "SCREW", "WASHER", "BEARING", "V-BELT", "GLOVE", "SAND", "PAPER", "DISC",
+          "PAINT", "ZINC", "FLUX", "HIGH", "TENSILE", "HEX", "HEAD", "SOCKET", "CAP", "STEEL",
+          "M12x50", "M16x80", "M22x100", "12.9", "8.8", "GRIT;60", "WITH-MSDS", "TIMING", "BELT", "OIL"]
+_UNITS = ["Pcs", "Bh", "Set", "Lbr", "Ltr", "Kg", "Mtr", "Roll", "Box", "Drum"]
+
+
+# ----------------------------------------------------
+# Master barang
+# ----------------------------------------------------
+def _items(rng, n_items):
+    group = rng.integers(0, len(_GROUPS), n_items)
+    counter = np.zeros(n_items, dtype=np.int64)
+    for g in range(len(_GROUPS)):
+        members = group == g
+        counter[members] = np.arange(1, members.sum() + 1)
+    nobar = [f"{_GROUPS[g]}{c:05d}" for g, c in zip(group, counter)]
+    n_words = rng.integers(2, 7, n_items)
+    words = rng.integers(0, len(_WORDS), (n_items, 6))
+    nabar = [";".join(_WORDS[w] for w in row[:k]) for row, k in zip(words, n_words)]
+    satuan = np.array(_UNITS)[rng.integers(0, len(_UNITS), n_items)]
+    # Popularitas Zipf, urutan barang diacak supaya tidak sama dengan urutan nobar
+    weights = 1.0 / np.arange(1, n_items + 1)
+    weights = weights[rng.permutation(n_items)]
+    return pd.DataFrame({"nobar": nobar, "nabar": nabar, "satuan": satuan}), weights / weights.sum()
+
+
+def _transactions(rng, n_rows, year, weights):
+    item = rng.choice(len(weights), size=n_rows, p=weights)
+    start = np.datetime64(f"{year}-01-01")
+    days = 366 if year % 4 == 0 else 365
+    tanggal = start + rng.integers(0, days, n_rows).astype("timedelta64[D]")
+    jumlah = np.maximum(np.round(rng.lognormal(1.5, 1.2, n_rows)), 1).astype(np.int64)
+    order = np.argsort(tanggal, kind="stable")
+    return item[order], tanggal[order], jumlah[order]
+
+
+def _lead_times(rng, items, shift=0.0):
+    n = len(items)
+    minimal = rng.integers(3, 30, n)
+    avg = np.round(minimal + rng.uniform(0, 10, n) + shift, 2)
+    maximal = np.ceil(avg + rng.uniform(0, 15, n)).astype(np.int64)
+    return items.assign(lead_time_minimal=minimal, lead_time_avg=avg, lead_time_maximal=maximal)
+
+
+def generate(scale=1, seed=0, years=YEARS):
+    """
+    Dataset sintetis: {"items", "transactions": {tahun: (id barang, tanggal,
+    jumlah)}, "lead_times": {2024: DataFrame, 2023: DataFrame},
+    "rop_existing", "movement_status"}.
+    """
+    rng = np.random.default_rng(seed)
+    n_items = max(int(ITEMS_PER_SCALE * scale), 10)
+    items, weights = _items(rng, n_items)
+    transactions = {year: _transactions(rng, int(ROWS_PER_YEAR_PER_SCALE * scale), year, weights)
+                    for year in years}
+
+    listed = rng.random(n_items) < 0.75
+    rop_existing = pd.DataFrame({
+        "nobar": items["nobar"][listed].to_numpy(),
+        "Rop Existing": rng.integers(1, 500, int(listed.sum())),
+    })
+    fast = weights > np.quantile(weights, 0.5)
+    movement_status = pd.DataFrame({
+        "nobar": items["nobar"][listed].to_numpy(),
+        "count": np.where(fast[listed], "Fast Moving", "Slow Moving"),
+    })
+    return {
+        "items": items,
+        "transactions": transactions,
+        "lead_times": {2024: _lead_times(rng, items), 2023: _lead_times(rng, items, shift=1.5)},
+        "rop_existing": rop_existing,
+        "movement_status": movement_status,
+    }
+
+
+# ----------------------------------------------------
+# Output
+# ----------------------------------------------------
+def transaction_frame(dataset, year):
+    """Transaksi satu tahun dalam skema workbook (tanggal sebagai teks dd/mm/YYYY)."""
+    item, tanggal, jumlah = dataset["transactions"][year]
+    items = dataset["items"]
+    return pd.DataFrame({
+        "tanggal": pd.DatetimeIndex(tanggal).strftime("%d/%m/%Y"),
+        "nobar": items["nobar"].to_numpy()[item],
+        "nabar": items["nabar"].to_numpy()[item],
+        "jumlah": jumlah,
+        "satuan": items["satuan"].to_numpy()[item],
+    })
+
+
+def write_workbooks(dataset, directory):
+    """
+    Tulis semua tabel sebagai .xlsx di `directory` dengan nama file yang dicari
+    data_loader ({tahun}.xlsx, Book1/Book2, rop existing, movement status).
+    Mengembalikan {tahun: path} transaksi.
+    """
+    import data_loader
+
+    os.makedirs(directory, exist_ok=True)
+    paths = {}
+    for year in dataset["transactions"]:
+        paths[year] = os.path.join(directory, f"{year}.xlsx")
+        transaction_frame(dataset, year).to_excel(paths[year], index=False)
+    for label, name in data_loader.LEAD_TIME_FILES.items():
+        dataset["lead_times"][label].to_excel(os.path.join(directory, name), index=False)
+    dataset["rop_existing"].to_excel(os.path.join(directory, data_loader.ROP_EXISTING_FILE), index=False)
+    dataset["movement_status"].to_excel(os.path.join(directory, data_loader.MOVEMENT_STATUS_FILE), index=False)
+    return paths
+
+
+def build_store(dataset):
+    """
+    Store transaksi ringkas langsung dari data sintetis, dengan kolom & dtype yang
+    sama dengan hasil data_loader.load_transaction_store (untuk skala yang terlalu
+    besar untuk ditulis ke Excel).
+    """
+    items = dataset["items"]
+    years = list(dataset["transactions"])
+    item = np.concatenate([dataset["transactions"][y][0] for y in years])
+    tanggal = np.concatenate([dataset["transactions"][y][1] for y in years])
+    tanggal = pd.DatetimeIndex(tanggal.astype("datetime64[ns]"))
+    jumlah = np.concatenate([dataset["transactions"][y][2] for y in years]).astype("float64")
+    source_year = np.repeat(np.array(years, dtype=np.int16),
+                            [len(dataset["transactions"][y][0]) for y in years])
+
+    def categorical(column):
+        categories, codes = np.unique(items[column].to_numpy(dtype=str), return_inverse=True)
+        return pd.Categorical.from_codes(codes[item], categories=categories)
+
+    return pd.DataFrame({
+        "source_year": source_year,
+        "tanggal": tanggal,
+        "nobar": categorical("nobar"),
+        "nabar": categorical("nabar"),
+        "jumlah": jumlah,
+        "satuan": categorical("satuan"),
+        "tanggal_gagal": np.zeros(len(item), dtype=bool),
+        "year": pd.array(tanggal.year, dtype="Int16"),
+        "month": pd.array(tanggal.month, dtype="Int8"),
+        "jumlah_gagal": np.zeros(len(item), dtype=bool),
+    })
@@ -0,0 +1,158 @@
+"""
+Figure Plotly untuk dashboard (tanpa Streamlit, jadi bisa diukur di benchmark).
+
+build_charts(): total & tren untuk hasil pencarian satu barang.
+comparison_trend(): tren beberapa barang (mode banding).
+
+Grafik digambar dari deret yang sudah diagregasi di hasil pencarian, tidak
+dari baris transaksi:
+
+- Bulanan: result["monthly"] / comparison["monthly"] (dari usage cube),
+- Mingguan / Harian: result["series"] / comparison["series"] (jumlah per hari).
+
+Trace garis yang lebih panjang dari MAX_POINTS titik diperkecil di server
+(min & max per bucket, jadi puncak tetap terlihat), dan memakai WebGL
+(scattergl) jika figure berisi lebih dari WEBGL_MIN_POINTS titik. Layout subplot
+per tahun dibangun sekali per daftar tahun dan dipakai bersama oleh figure bar
+dan tren.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+import item_compare
+import item_search
+
+# Granularitas grafik -> satuan periode di judul
+GRANULARITIES = {"Bulanan": "Bulan", "Mingguan": "Minggu", "Harian": "Hari"}
+MAX_POINTS = 400
+WEBGL_MIN_POINTS = 1000
+
+
+# ----------------------------------------------------
+# Deret & downsampling
+# ----------------------------------------------------
+def resample(series, granularity, by=()):
+    """
+    Deret harian (kolom by, year, tanggal, jumlah) dijumlahkan per minggu (Senin)
+    atau tetap harian. Minggu pertama yang mulai di tahun sebelumnya dipotong ke
+    1 Januari, jadi setiap bin tetap di dalam tahunnya sendiri.
+    """
+    if granularity != "Mingguan" or series.empty:
+        return series
+    by = list(by)
+    tanggal = series["tanggal"]
+    week = tanggal - pd.to_timedelta(tanggal.dt.weekday, unit="D")
+    year_start = tanggal - pd.to_timedelta(tanggal.dt.dayofyear - 1, unit="D")
+    week = week.where(week >= year_start, year_start)
+    return series.assign(tanggal=week).groupby(by + ["year", "tanggal"], sort=True)["jumlah"].sum().reset_index()
+
+
+def downsample(x, y, max_points=MAX_POINTS):
+    """(x, y) dengan paling banyak ±max_points titik: titik min & max di setiap bucket."""
+    n = len(y)
+    if n <= max_points:
+        return x, y
+    values = np.asarray(y, dtype=float)
+    bucket = np.arange(n) * (max_points // 2) // n
+    grouped = pd.Series(values).groupby(bucket)
+    keep = np.unique(np.concatenate([grouped.idxmin().to_numpy(), grouped.idxmax().to_numpy()]))
+    return np.asarray(x)[keep], values[keep]
+
+
+def _year_series(result, selected_years, granularity):
+    # {tahun: (x, jumlah)} untuk satu barang
+    if granularity == "Bulanan":
+        monthly = result["monthly"]
+        return {year: (monthly[year]['tanggal'], monthly[year]['jumlah'])
+                for year in selected_years if year in monthly}
+    series = resample(result["series"], granularity)
+    return {year: (part["tanggal"], part["jumlah"]) for year, part in series.groupby("year", sort=False)}
+
+
+# ----------------------------------------------------
+# Layout & trace
+# ----------------------------------------------------
+_LAYOUTS = {}
+_LOCK = threading.Lock()
+
+
+def _subplot_layout(selected_years):
+    # Layout make_subplots (satu kolom per tahun) dibangun sekali per daftar tahun
+    key = tuple(str(y) for y in selected_years)
+    with _LOCK:
+        layout = _LAYOUTS.get(key)
+        if layout is None:
+            if len(_LAYOUTS) >= 64:
+                _LAYOUTS.clear()
+            layout = make_subplots(rows=1, cols=len(key), subplot_titles=list(key)).layout.to_plotly_json()
+            _LAYOUTS[key] = layout
+    return layout
+
+
+def _trace(kind, x, y, col, webgl=False, **extra):
+    # Trace untuk subplot kolom ke-`col` (0 = kolom pertama)
+    axis = str(col + 1) if col else ""
+    trace = {"x": x, "y": y, "xaxis": "x" + axis, "yaxis": "y" + axis, **extra}
+    if kind == "bar":
+        trace["type"] = "bar"
+    else:
+        trace.update(type="scattergl" if webgl else "scatter", mode="lines+markers")
+    return trace
+
+
+# ----------------------------------------------------
+# Figure
+# ----------------------------------------------------
+def build_charts(result, selected_years, granularity="Bulanan"):
+    """Figure total (bar) dan tren (garis) per tahun untuk hasil pencarian, dari deret yang sama."""
+    per_year = _year_series(result, selected_years, granularity)
+    webgl = sum(len(y) for _, y in per_year.values()) > WEBGL_MIN_POINTS
+    bars, lines = [], []
+    for i, year in enumerate(selected_years):
+        if year not in per_year:
+            continue
+        x, y = per_year[year]
+        bars.append(_trace("bar", x, y, i, name=str(year)))
+        line_x, line_y = downsample(x, y)
+        lines.append(_trace("line", line_x, line_y, i, webgl, name=str(year)))
+
+    layout = _subplot_layout(selected_years)
+    period = GRANULARITIES[granularity]
+    fig = go.Figure(data=bars, layout=layout)
+    fig2 = go.Figure(data=lines, layout=layout)
+    fig.update_layout(title_text=f"Total Barang Keluar per {period}", showlegend=False, height=400)
+    fig2.update_layout(title_text=f"Tren Barang Keluar per {period}", showlegend=False, height=400)
+    return fig, fig2
+
+
+def comparison_trend(comparison, selected_years, granularity="Bulanan"):
+    """Satu trace per barang per tahun (maksimal item_compare.MAX_TREND_ITEMS barang)."""
+    nobars = comparison["items"]["nobar"].tolist()[:item_compare.MAX_TREND_ITEMS]
+    if granularity == "Bulanan":
+        months = item_search.MONTHS
+        series = comparison["monthly"].sort_values("month", kind="stable")
+        series = series.assign(tanggal=[months[m-1] for m in series["month"]])
+    else:
+        series = resample(comparison["series"], granularity, by=["nobar"])
+    # Satu groupby untuk semua (tahun, barang), bukan filter ulang per trace
+    groups = dict(list(series.groupby(["year", "nobar"], sort=False)))
+    webgl = len(series) > WEBGL_MIN_POINTS
+    colors = px.colors.qualitative.Plotly
+
+    traces = []
+    for i, year in enumerate(selected_years):
+        for j, nobar in enumerate(nobars):
+            trend = groups.get((year, nobar))
+            if trend is None or trend.empty:
+                continue
+            x, y = downsample(trend["tanggal"], trend["jumlah"])
+            traces.append(_trace("line", x, y, i, webgl, name=nobar, legendgroup=nobar,
+                                 showlegend=i == 0, line=dict(color=colors[j % len(colors)])))
+    fig = go.Figure(data=traces, layout=_subplot_layout(selected_years))
+    fig.update_layout(title_text=f"Tren Barang Keluar per {GRANULARITIES[granularity]}", height=450)
+    return fig
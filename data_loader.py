@@ -0,0 +1,671 @@
+"""
+Ingestion layer untuk workbook Excel dashboard ROP.
+
+Setiap workbook dibaca dengan openpyxl satu kali saja, lalu disimpan sebagai
+file Parquet di folder cache. Kunci cache adalah fingerprint file sumber
+(path + ukuran + mtime), jadi file Excel yang diganti otomatis dibaca ulang.
+Hasilnya juga disimpan di memori proses, sehingga rerun Streamlit cukup
+melakukan os.stat() per file.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import shared_store
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.environ.get("ROP_CACHE_DIR", os.path.join(BASE_DIR, ".rop_cache"))
+SHARED_DIR = os.path.join(CACHE_DIR, "shared")
+
+# Cache tingkat proses: {(path, prepare_name): (fingerprint, DataFrame)}
+_MEMORY_CACHE = {}
+_LOCK = threading.Lock()
+
+
+# ----------------------------------------------------
+# Fingerprint & lokasi cache
+# ----------------------------------------------------
+def file_fingerprint(path):
+    stat = os.stat(path)
+    return {
+        "path": os.path.abspath(path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+
+
+def _cache_files(path, prepare_name, cache_dir):
+    key = hashlib.sha1(f"{os.path.abspath(path)}|{prepare_name}".encode("utf-8")).hexdigest()[:16]
+    stem = os.path.splitext(os.path.basename(path))[0].replace(" ", "_")
+    base = os.path.join(cache_dir, f"{stem}-{key}")
+    return base + ".parquet", base + ".json"
+
+
+def arrow_safe(df):
+    """Salinan `df` yang bisa ditulis ke Parquet/Arrow: kolom object campuran (mis. angka & teks) jadi teks."""
+    df = df.copy()
+    for col in df.columns:
+        if df[col].dtype == object:
+            types = df[col].dropna().map(type).unique()
+            if len(types) > 1:
+                df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df
+
+
+# ----------------------------------------------------
+# Baca Excel dengan cache Parquet
+# ----------------------------------------------------
+def _default_excel_engine():
+    # Pakai calamine (jauh lebih cepat dari openpyxl) jika python-calamine terpasang
+    engine = os.environ.get("ROP_EXCEL_ENGINE")
+    if engine:
+        return engine
+    try:
+        import python_calamine  # noqa: F401
+        return "calamine"
+    except ImportError:
+        return None
+
+
+EXCEL_ENGINE = _default_excel_engine()
+
+# Jumlah proses untuk parsing workbook paralel (ROP_LOAD_WORKERS=1 mematikan pool)
+LOAD_WORKERS = int(os.environ.get("ROP_LOAD_WORKERS", "0")) or None
+
+
+def read_excel(path, **kwargs):
+    if EXCEL_ENGINE:
+        try:
+            return pd.read_excel(path, engine=EXCEL_ENGINE, **kwargs)
+        except (ValueError, ImportError):
+            # Versi pandas lama belum mendukung engine ini
+            pass
+    return pd.read_excel(path, **kwargs)
+
+
+def is_cache_fresh(path, prepare=None, cache_dir=None):
+    """True jika cache Parquet untuk `path` masih sesuai fingerprint file."""
+    prepare_name = getattr(prepare, "__name__", "raw") if prepare else "raw"
+    _, meta_path = _cache_files(path, prepare_name, cache_dir or CACHE_DIR)
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            return json.load(f) == file_fingerprint(path)
+    except (OSError, ValueError):
+        return False
+
+
+def _warm_cache(path, prepare):
+    read_excel_cached(path, prepare=prepare, memoize=False)
+    return path
+
+
+def preload_excel_caches(jobs, max_workers=None):
+    """
+    Parse workbook yang cache-nya basi secara paralel di process pool.
+    `jobs`: [(path, prepare), ...]. Worker hanya menulis cache Parquet, jadi
+    DataFrame besar tidak perlu dikirim balik antar proses.
+    """
+    stale = [(path, prepare) for path, prepare in jobs if not is_cache_fresh(path, prepare)]
+    if len(stale) < 2:
+        return []
+    max_workers = min(max_workers or LOAD_WORKERS or os.cpu_count() or 1, len(stale))
+    if max_workers < 2:
+        return []
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(_warm_cache, *zip(*stale)))
+    except (OSError, RuntimeError):
+        # Process pool tidak tersedia (mis. sandbox); jatuh ke pembacaan serial
+        return []
+
+
+def read_excel_cached(path, prepare=None, cache_dir=None, memoize=True):
+    """
+    Baca workbook `path` lewat cache. `prepare` (opsional) adalah fungsi
+    df -> df yang dijalankan sekali sebelum hasilnya di-cache.
+
+    DataFrame yang dikembalikan dipakai bersama oleh semua sesi; jangan diubah
+    in-place (pakai .copy() bila perlu). Dengan memoize=False hasilnya tidak
+    disimpan di memori proses (dipakai bila pemanggil menyimpan versi ringkasnya).
+    """
+    cache_dir = cache_dir or CACHE_DIR
+    prepare_name = getattr(prepare, "__name__", "raw") if prepare else "raw"
+    memo_key = (os.path.abspath(path), prepare_name)
+    fingerprint = file_fingerprint(path)
+
+    with _LOCK:
+        cached = _MEMORY_CACHE.get(memo_key)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+
+        parquet_path, meta_path = _cache_files(path, prepare_name, cache_dir)
+        df = None
+        if os.path.exists(parquet_path) and os.path.exists(meta_path):
+            try:
+                with open(meta_path, "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+                if meta == fingerprint:
+                    df = pd.read_parquet(parquet_path)
+            except (OSError, ValueError):
+                df = None
+
+        if df is None:
+            df = read_excel(path)
+            if prepare is not None:
+                df = prepare(df)
+            _write_cache(df, fingerprint, parquet_path, meta_path, cache_dir)
+
+        if memoize:
+            _MEMORY_CACHE[memo_key] = (fingerprint, df)
+        return df
+
+
+def _write_cache(df, fingerprint, parquet_path, meta_path, cache_dir):
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{parquet_path}.{os.getpid()}.tmp"
+        arrow_safe(df).to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, parquet_path)
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(fingerprint, f)
+    except (OSError, ImportError, ValueError):
+        # Cache disk hanya optimasi; kalau gagal tetap lanjut dengan data di memori
+        pass
+
+
+def clear_memory_cache():
+    with _LOCK:
+        _MEMORY_CACHE.clear()
+        _STORE.update(key=None, version=None, store=None, partitions=None, changes=None)
+    shared_store.clear()
+
+
+def data_version(*parts):
+    """Hash pendek dari fingerprint file sumber (+ nama tahap prepare)."""
+    return hashlib.sha1(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+
+
+def read_excel_shared(name, path, prepare=None):
+    """
+    Seperti read_excel_cached, tetapi hasilnya dipublikasikan sebagai file Arrow
+    yang di-memory-map (shared_store), jadi dipakai bersama antar proses.
+    """
+    path = _path(path)
+    prepare_name = getattr(prepare, "__name__", "raw") if prepare else "raw"
+    version = data_version(file_fingerprint(path), prepare_name)
+    return shared_store.get_shared(
+        name, version,
+        lambda: read_excel_cached(path, prepare=prepare, memoize=False),
+        SHARED_DIR,
+    )
+
+
+# ----------------------------------------------------
+# Loader tabel dashboard
+# ----------------------------------------------------
+ROP_EXISTING_FILE = "rop existing_fix.xlsx"
+LEAD_TIME_FILES = {
+    2024: "Book1.xlsx",
+    2023: "Book2.xlsx"
+}
+MOVEMENT_STATUS_FILE = "movement_status.xlsx"
+
+
+def _path(name):
+    return name if os.path.isabs(name) else os.path.join(BASE_DIR, name)
+
+
+# Skenario lead time tambahan di folder data: lead_time_<nama>.xlsx (per supplier, what-if, ...)
+LEAD_TIME_FILE_PATTERN = re.compile(r"^lead_time_(.+)\.xlsx$", re.IGNORECASE)
+
+
+def lead_time_files(data_dir=None):
+    """{skenario: path}: LEAD_TIME_FILES (label tahun) lalu file lead_time_<nama>.xlsx di `data_dir`."""
+    files = dict(LEAD_TIME_FILES)
+    data_dir = data_dir or DATA_DIR
+    for name in sorted(os.listdir(data_dir)):
+        match = LEAD_TIME_FILE_PATTERN.match(name)
+        if match and match.group(1) not in files:
+            files[match.group(1)] = os.path.join(data_dir, name)
+    return files
+
+
+def prepare_lead_time(df):
+    # Pastikan kolom lead_time numerik
+    for col in ["lead_time_minimal", "lead_time_avg", "lead_time_maximal"]:
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+    return df
+
+
+TANGGAL_FORMAT = "%d/%m/%Y"
+
+
+def prepare_transactions(df):
+    # Parse tanggal & jumlah sekali saat ingest, bukan di setiap pencarian
+    if "tanggal" in df.columns:
+        raw = df["tanggal"]
+        df["tanggal"] = pd.to_datetime(raw, format=TANGGAL_FORMAT, errors="coerce")
+        df["tanggal_gagal"] = df["tanggal"].isna() & raw.notna()
+        df["year"] = df["tanggal"].dt.year.astype("Int16")
+        df["month"] = df["tanggal"].dt.month.astype("Int8")
+    if "jumlah" in df.columns:
+        raw = df["jumlah"]
+        df["jumlah"] = pd.to_numeric(raw, errors="coerce").astype("float64")
+        df["jumlah_gagal"] = df["jumlah"].isna() & raw.notna()
+    return df
+
+
+# ----------------------------------------------------
+# Penyimpanan transaksi ringkas
+# ----------------------------------------------------
+ITEM_COLUMNS = ["nobar", "nabar", "satuan"]
+SOURCE_COLUMNS = ["source_year", "source_file"]
+
+# Store transaksi gabungan semua tahun
+_STORE = {"key": None, "version": None, "store": None, "partitions": None, "changes": None, "sources": None}
+# Satu build store sekaligus per proses: tahun yang dimuat, store dasar dan
+# update _STORE dibaca/ditulis di bagian kritis yang sama
+_STORE_BUILD_LOCK = threading.Lock()
+
+
+def _downcast_float(series):
+    # Turunkan ke float32 hanya jika tidak ada nilai yang berubah
+    narrow = series.astype("float32")
+    if (narrow.astype("float64") == series).all() or series.isna().all():
+        return narrow
+    return series
+
+
+def tag_source(df, year, path):
+    part = df.copy()
+    part.insert(0, "source_file", os.path.basename(path))
+    part.insert(0, "source_year", year)
+    return part
+
+
+def _union_categories(parts, col):
+    # Kategori gabungan (terurut) dari kolom categorical / object semua part
+    values = [p[col].cat.categories if isinstance(p[col].dtype, pd.CategoricalDtype) else p[col].dropna().unique()
+              for p in parts]
+    categories = pd.Index(np.concatenate([np.asarray(v, dtype=object) for v in values])).unique()
+    try:
+        return categories.sort_values()
+    except TypeError:
+        return categories
+
+
+def compact_transactions(parts):
+    """
+    Gabungkan frame transaksi (sudah diberi source_year/source_file) menjadi satu
+    DataFrame terurut per tahun sumber. Kolom barang (nobar/nabar/satuan) disimpan
+    sebagai categorical dengan kategori yang sama untuk semua tahun, kolom angka
+    memakai dtype sempit.
+
+    Part yang sudah categorical (store lama) hanya di-recode ke kategori gabungan,
+    tidak dijadikan object dulu, dan part diurutkan per tahun sebelum digabung,
+    jadi menambah baris baru tidak mengulang konversi seluruh riwayat.
+    """
+    parts = [p for p in parts if len(p)]
+    if not parts:
+        return pd.DataFrame()
+    parts = sorted(parts, key=lambda p: p["source_year"].min())
+    for col in ITEM_COLUMNS + ["source_file"]:
+        if col not in parts[0].columns:
+            continue
+        categories = _union_categories(parts, col)
+        parts = [p.assign(**{col: p[col].cat.set_categories(categories)
+                             if isinstance(p[col].dtype, pd.CategoricalDtype)
+                             else pd.Categorical(p[col], categories=categories)})
+                 for p in parts]
+    store = pd.concat(parts, ignore_index=True)
+    if not store["source_year"].is_monotonic_increasing:
+        store = store.sort_values("source_year", kind="stable").reset_index(drop=True)
+    store["source_year"] = pd.to_numeric(store["source_year"], downcast="integer")
+    if "jumlah" in store.columns:
+        store["jumlah"] = _downcast_float(store["jumlah"])
+    return store
+
+
+def partition_by_year(store):
+    """View per tahun sumber dari store (slice baris berurutan, tanpa salinan)."""
+    if store.empty:
+        return {}
+    years = store["source_year"].to_numpy()
+    partitions = {}
+    start = 0
+    for i in range(1, len(years) + 1):
+        if i == len(years) or years[i] != years[start]:
+            partitions[int(years[start])] = store.iloc[start:i]
+            start = i
+    return partitions
+
+
+# ----------------------------------------------------
+# Auto-discovery & ingest inkremental
+# ----------------------------------------------------
+DATA_DIR = os.environ.get("ROP_DATA_DIR", BASE_DIR)
+MANIFEST_PATH = os.path.join(CACHE_DIR, "ingest_manifest.json")
+
+# 2024.xlsx (tahunan) atau 2025-01.xlsx / 2025_01.xlsx (bulanan)
+TRANSACTION_FILE_PATTERN = re.compile(r"^(\d{4})(?:[-_](\d{1,2}))?\.xlsx$", re.IGNORECASE)
+
+
+def discover_transaction_files(data_dir=None):
+    """{tahun: [path, ...]} untuk semua file transaksi di `data_dir`, urut per tahun."""
+    data_dir = data_dir or DATA_DIR
+    found = {}
+    for name in sorted(os.listdir(data_dir)):
+        match = TRANSACTION_FILE_PATTERN.match(name)
+        if match:
+            found.setdefault(int(match.group(1)), []).append(os.path.join(data_dir, name))
+    return dict(sorted(found.items()))
+
+
+def normalize_file_paths(file_paths):
+    # {tahun: path} atau {tahun: [path, ...]} -> [(tahun, path_absolut), ...]
+    files = []
+    for year, paths in file_paths.items():
+        for path in ([paths] if isinstance(paths, str) else paths):
+            files.append((int(year), os.path.abspath(_path(path))))
+    return files
+
+
+def files_version(file_paths):
+    """Versi semua file di `file_paths` (tidak bergantung pada tahun yang sudah dimuat)."""
+    return data_version([(year, file_fingerprint(path)) for year, path in normalize_file_paths(file_paths)])
+
+
+def _load_manifest():
+    try:
+        with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"version": None, "files": {}}
+
+
+def _save_manifest(manifest):
+    try:
+        os.makedirs(os.path.dirname(MANIFEST_PATH), exist_ok=True)
+        with open(MANIFEST_PATH, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=1)
+    except OSError:
+        pass
+
+
+def rows_hash(df):
+    """
+    Hash isi baris (tanpa index); sama untuk baris yang sama di urutan yang sama.
+    Nilai dibandingkan sebagai teks, jadi frame dari cache Parquet dan dari parse
+    ulang workbook menghasilkan hash yang sama.
+    """
+    hashed = pd.util.hash_pandas_object(df.astype(str), index=False).to_numpy()
+    return hashlib.sha1(hashed.tobytes()).hexdigest()[:16]
+
+
+def _build_incremental(files, fingerprints, base_store, manifest):
+    """
+    Bangun store baru dari `base_store` (versi sebelumnya):
+    - file yang tidak berubah dipakai apa adanya,
+    - file yang bertambah panjang dan baris lamanya sama persis (hash baris yang
+      sudah di-ingest di manifest) diperlakukan sebagai append: hanya baris
+      barunya yang masuk `changes["appended"]`,
+    - file baru, mengecil, diedit, atau dihapus diproses ulang penuh.
+    Workbook yang berubah selalu di-parse penuh (Excel tidak bisa dibaca mulai
+    baris tertentu); yang dihemat pada append adalah agregasi sesudahnya (cube,
+    movement, SQLite hanya memproses baris baru).
+    Mengembalikan (store, files_manifest, changes).
+    """
+    previous = manifest.get("files", {}) if base_store is not None else {}
+    keep_files, new_parts = set(), []
+    appended, replaced = {}, set()
+    files_manifest = {}
+
+    for year, path in files:
+        fp = fingerprints[path]
+        old = previous.get(path)
+        if old is not None and old["fingerprint"] == fp and old["year"] == year:
+            keep_files.add(os.path.basename(path))
+            files_manifest[path] = old
+            continue
+
+        df = read_excel_cached(path, prepare=prepare_transactions, memoize=False)
+        files_manifest[path] = {"year": year, "fingerprint": fp, "rows": len(df), "hash": rows_hash(df)}
+        ingested = old["rows"] if old is not None else 0
+        if (old is not None and old["year"] == year and old.get("hash") and len(df) > ingested
+                and rows_hash(df.iloc[:ingested]) == old["hash"]):
+            keep_files.add(os.path.basename(path))
+            part = tag_source(df.iloc[ingested:], year, path)
+            new_parts.append(part)
+            appended.setdefault(year, []).append(part)
+            continue
+
+        new_parts.append(tag_source(df, year, path))
+        replaced.add(year)
+
+    # Tahun dari file yang dihapus / diganti juga harus diagregasi ulang
+    for path, old in previous.items():
+        if path not in files_manifest or os.path.basename(path) not in keep_files:
+            replaced.add(old["year"])
+
+    kept = []
+    if base_store is not None and len(base_store):
+        kept = list(partition_by_year(base_store[base_store["source_file"].astype(str).isin(keep_files)]).values())
+    store = compact_transactions(kept + new_parts)
+
+    changes = {
+        "base_version": manifest.get("version") if base_store is not None else None,
+        "appended": {y: pd.concat(parts, ignore_index=True)
+                     for y, parts in appended.items() if y not in replaced},
+        "replaced": replaced,
+    }
+    return store, files_manifest, changes
+
+
+def load_transaction_store(file_paths=None, data_dir=None, years=None):
+    """
+    Store transaksi ringkas + partisi per tahun. File transaksi ditemukan otomatis
+    di `data_dir` (kecuali `file_paths` diberikan); hanya file yang berubah yang
+    dibaca, dan file yang bertambah panjang hanya dibaca baris barunya.
+
+    Dengan `years`, hanya tahun itu (ditambah tahun yang sudah dimuat sebelumnya
+    di proses ini) yang dimuat, jadi tahun lain baru dibaca saat dipilih.
+    """
+    file_paths = file_paths or discover_transaction_files(data_dir)
+    with _STORE_BUILD_LOCK:
+        return _load_store(file_paths, years)
+
+
+def _load_store(file_paths, years):
+    # Dipanggil dengan _STORE_BUILD_LOCK: tahun yang dimuat dan store dasar tidak
+    # berubah oleh sesi lain sampai _STORE diperbarui
+    if years is not None:
+        loaded = set(_STORE["partitions"] or {})
+        wanted = set(int(y) for y in years) | loaded
+        file_paths = {y: p for y, p in file_paths.items() if int(y) in wanted}
+    files = normalize_file_paths(file_paths)
+    fingerprints = {path: file_fingerprint(path) for _, path in files}
+    key = tuple((year, tuple(fingerprints[path].values())) for year, path in files)
+    if _STORE["key"] == key:
+        return _STORE["store"], _STORE["partitions"]
+    base_store = _STORE["store"]
+
+    version = data_version(key)
+    manifest = _load_manifest()
+    result = {"changes": None}
+
+    def build():
+        base = base_store
+        if base is None and manifest.get("version"):
+            base = shared_store.open_published("transaksi", manifest["version"], SHARED_DIR)
+        # File yang belum pernah di-ingest di-parse paralel lebih dulu
+        known = manifest.get("files", {}) if base is not None else {}
+        preload_excel_caches([(path, prepare_transactions) for _, path in files if path not in known])
+        store, files_manifest, changes = _build_incremental(files, fingerprints, base, manifest)
+        result["changes"] = changes
+        _save_manifest({"version": version, "files": files_manifest})
+        return store
+
+    # Store dipublikasikan sebagai file Arrow bersama; proses lain cukup memory-map
+    store = shared_store.get_shared("transaksi", version, build, SHARED_DIR)
+    partitions = partition_by_year(store)
+    # Versi per tahun sumber: berubah hanya jika file tahun itu berubah
+    sources = {}
+    for year, path in files:
+        sources.setdefault(year, []).append((os.path.basename(path), fingerprints[path]))
+    sources = {year: data_version(parts) for year, parts in sources.items()}
+    with _LOCK:
+        _STORE.update(key=key, version=version, store=store, partitions=partitions,
+                      changes=result["changes"], sources=sources)
+    return store, partitions
+
+
+def transaction_version():
+    """Versi data transaksi yang sedang dimuat (hash fingerprint file sumber)."""
+    return _STORE["version"]
+
+
+def source_versions():
+    """
+    {tahun: versi} untuk partisi yang sedang dimuat. Partisi adalah objek baru
+    setiap kali store dibangun ulang, jadi cache per tahun (cube, movement)
+    membandingkan versi ini, bukan identitas DataFrame.
+    """
+    return dict(_STORE["sources"] or {})
+
+
+_ITEMS = {"store": None, "items": None}
+
+
+def item_master(store):
+    """
+    Master barang dari store transaksi: satu baris per nobar (nobar, nabar, satuan,
+    nobar_key) dari transaksi pertamanya. Dihitung sekali per objek store.
+    """
+    with _LOCK:
+        if _ITEMS["store"] is store:
+            return _ITEMS["items"]
+    columns = [c for c in ITEM_COLUMNS if c in store.columns]
+    items = store[columns].drop_duplicates("nobar").astype(object).reset_index(drop=True)
+    items["nobar"] = items["nobar"].astype(str)
+    items["nobar_key"] = items["nobar"].str.lower()
+    with _LOCK:
+        _ITEMS.update(store=store, items=items)
+    return items
+
+
+def dataset_version():
+    """Versi gabungan transaksi + tabel referensi (berubah jika salah satu file berubah)."""
+    references = [ROP_EXISTING_FILE, MOVEMENT_STATUS_FILE] + list(lead_time_files().values())
+    return data_version(transaction_version(), [file_fingerprint(_path(p)) for p in references])
+
+
+def last_changes():
+    """
+    Perubahan terakhir pada store: {"base_version", "appended": {tahun: baris baru},
+    "replaced": {tahun, ...}}, atau None jika store dibuka utuh dari cache.
+    """
+    return _STORE["changes"]
+
+
+def load_transactions(file_paths=None, data_dir=None, years=None):
+    return load_transaction_store(file_paths, data_dir, years)[1]
+
+
+# ----------------------------------------------------
+# Warm-up di background
+# ----------------------------------------------------
+_WARMUP = {"thread": None}
+
+
+def load_reference_tables():
+    """ROP existing, lead time dan movement status (dipakai setiap pencarian)."""
+    return load_rop_existing(), load_lead_times(), load_movement_status()
+
+
+def _warm_up(file_paths, years):
+    try:
+        jobs = [(path, prepare_transactions)
+                for year, path in normalize_file_paths(file_paths or discover_transaction_files())
+                if years is None or year in years]
+        jobs += [(_path(ROP_EXISTING_FILE), None), (_path(MOVEMENT_STATUS_FILE), None)]
+        jobs += [(_path(p), prepare_lead_time) for p in lead_time_files().values()]
+        preload_excel_caches(jobs)
+        load_transaction_store(file_paths, years=years)
+        load_reference_tables()
+    except Exception:
+        # Error yang sama akan muncul lagi (dan ditampilkan) saat data diminta di foreground
+        pass
+
+
+def warm_up(file_paths=None, years=None):
+    """
+    Mulai memuat data di thread background (sekali per proses) supaya halaman
+    awal bisa tampil tanpa menunggu parsing workbook.
+    """
+    with _LOCK:
+        thread = _WARMUP["thread"]
+        if thread is not None:
+            return thread
+        thread = threading.Thread(target=_warm_up, args=(file_paths, years),
+                                  name="rop-data-warmup", daemon=True)
+        _WARMUP["thread"] = thread
+    thread.start()
+    return thread
+
+
+def is_warm():
+    thread = _WARMUP["thread"]
+    return thread is not None and not thread.is_alive()
+
+
+def wait_until_warm(timeout=None):
+    thread = _WARMUP["thread"]
+    if thread is not None:
+        thread.join(timeout)
+
+
+def memory_report(tables):
+    """Ukuran memori (deep) per tabel dalam bytes dan MB."""
+    rows = []
+    for name, df in tables.items():
+        size = int(df.memory_usage(deep=True).sum())
+        rows.append({"tabel": str(name), "baris": len(df), "bytes": size, "MB": round(size / 1e6, 2)})
+    report = pd.DataFrame(rows)
+    if len(report):
+        total = {"tabel": "TOTAL", "baris": int(report["baris"].sum()),
+                 "bytes": int(report["bytes"].sum()), "MB": round(report["bytes"].sum() / 1e6, 2)}
+        report = pd.concat([report, pd.DataFrame([total])], ignore_index=True)
+    return report
+
+
+def ingest_report(data):
+    """Jumlah baris dan baris yang gagal di-parse per tahun transaksi."""
+    rows = []
+    for year, df in data.items():
+        rows.append({
+            "tahun": year,
+            "baris": len(df),
+            "tanggal_gagal": int(df["tanggal_gagal"].sum()) if "tanggal_gagal" in df.columns else 0,
+            "jumlah_gagal": int(df["jumlah_gagal"].sum()) if "jumlah_gagal" in df.columns else 0,
+        })
+    return pd.DataFrame(rows)
+
+
+def load_rop_existing():
+    return read_excel_shared("rop_existing", ROP_EXISTING_FILE)
+
+
+def load_lead_times():
+    """{skenario: DataFrame lead time} untuk semua file di lead_time_files()."""
+    return {label: read_excel_shared(f"lead_time_{label}", path, prepare=prepare_lead_time)
+            for label, path in lead_time_files().items()}
+
+
+def load_movement_status():
+    return read_excel_shared("movement_status", MOVEMENT_STATUS_FILE)
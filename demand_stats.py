@@ -0,0 +1,158 @@
+"""
+Statistik permintaan terukur dari riwayat transaksi (tanggal, jumlah).
+
+Untuk setiap barang x tahun dihitung permintaan harian dan mingguan yang
+sebenarnya: rata-rata, standar deviasi dan persentil. Hari/minggu tanpa
+transaksi ikut dihitung sebagai permintaan 0, tanpa membuat baris untuk setiap
+hari kosong: total per hari/minggu yang ada transaksinya diurutkan sekali, lalu
+statistik dan persentil semua grup dihitung sekaligus dengan NumPy.
+
+Tabel seluruh katalog disimpan sebagai file Arrow bersama per versi data
+(shared_store), jadi kartu evaluasi tidak menghitung ulang setiap pencarian.
+"""
+import numpy as np
+import pandas as pd
+
+import data_loader
+import shared_store
+from nobar_index import normalize_nobar
+
+HARI_PER_MINGGU = 7
+PERSENTIL_HARIAN = (50, 90, 95)
+PERSENTIL_MINGGUAN = (10, 50, 90, 95)
+
+
+# ----------------------------------------------------
+# Periode per tahun
+# ----------------------------------------------------
+def period_ends(store):
+    """{tahun terakhir: tanggal transaksi terakhir}; tahun berjalan belum genap 1 tahun."""
+    tanggal = store["tanggal"].dropna()
+    if tanggal.empty:
+        return {}
+    last = tanggal.max()
+    return {int(last.year): last}
+
+
+def _included_days(year, period_end=None, months=None):
+    # Mask hari (index = hari ke-n dalam tahun) yang masuk periode
+    days = pd.date_range(f"{year}-01-01", f"{year}-12-31", freq="D")
+    mask = np.ones(len(days), dtype=bool)
+    if period_end is not None:
+        mask &= days <= period_end
+    if months is not None:
+        mask &= np.isin(days.month, list(months))
+    return mask
+
+
+# ----------------------------------------------------
+# Statistik per grup (vektor)
+# ----------------------------------------------------
+def _bucket_stats(group_ids, values, n_buckets, percentiles, prefix):
+    """
+    Statistik per grup dari total per bucket (hari/minggu) yang tidak kosong.
+    group_ids/values: satu elemen per bucket terisi; n_buckets: jumlah bucket
+    per grup termasuk yang kosong (nilai 0).
+    """
+    n_groups = len(n_buckets)
+    n = np.asarray(n_buckets, dtype=float)
+    order = np.lexsort((values, group_ids))
+    group_ids, values = group_ids[order], values[order]
+    offsets = np.searchsorted(group_ids, np.arange(n_groups + 1))
+    filled = np.diff(offsets)
+    negatives = np.bincount(group_ids[values < 0], minlength=n_groups)
+    zeros = np.maximum(n - filled, 0).astype(np.int64)
+
+    total = np.bincount(group_ids, weights=values, minlength=n_groups)
+    total_sq = np.bincount(group_ids, weights=values * values, minlength=n_groups)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.where(n > 0, total / n, 0.0)
+        var = np.where(n > 1, (total_sq - n * mean * mean) / (n - 1), 0.0)
+    stats = {
+        f"{prefix}_aktif": filled,
+        f"{prefix}_mean": mean,
+        f"{prefix}_std": np.sqrt(np.clip(var, 0.0, None)),
+    }
+
+    def value_at(rank):
+        # Nilai ke-`rank` (0-based) dari deret terurut: negatif, nol, lalu positif
+        rank = np.minimum(rank, np.maximum(n - 1, 0).astype(np.int64))
+        in_negatives = rank < negatives
+        in_zeros = ~in_negatives & (rank < negatives + zeros)
+        pos = np.where(in_negatives, rank, rank - zeros)
+        pos = np.clip(offsets[:-1] + pos, 0, max(len(values) - 1, 0))
+        picked = values[pos] if len(values) else np.zeros(n_groups)
+        return np.where(in_zeros | (n == 0), 0.0, picked)
+
+    for p in percentiles:
+        # Interpolasi linear seperti np.percentile
+        h = np.maximum(n - 1, 0) * p / 100.0
+        lower = np.floor(h).astype(np.int64)
+        frac = h - lower
+        low_val, high_val = value_at(lower), value_at(lower + 1)
+        stats[f"{prefix}_p{p}"] = low_val + (high_val - low_val) * np.where(lower + 1 < n, frac, 0.0)
+    return stats
+
+
+def compute_demand_stats(frame, keys, period_end=None, months=None):
+    """
+    Statistik permintaan per (`keys` + tahun) dari frame berisi kolom `keys`,
+    tanggal (datetime) dan jumlah. `period_end` {tahun: tanggal terakhir} membatasi
+    tahun berjalan; `months` (1-12) membatasi periode ke bulan tertentu.
+    """
+    keys = list(keys)
+    period_end = period_end or {}
+    work = frame[keys + ["tanggal", "jumlah"]].dropna(subset=["tanggal", "jumlah"])
+    year = work["tanggal"].dt.year.to_numpy()
+    day = work["tanggal"].dt.dayofyear.to_numpy() - 1
+
+    # Urutan hari di dalam periode (hari di luar periode dibuang)
+    ordinal = np.full(len(work), -1, dtype=np.int64)
+    period_days = {}
+    for y in np.unique(year):
+        mask = _included_days(int(y), period_end.get(int(y)), months)
+        period_days[int(y)] = int(mask.sum())
+        rows = year == y
+        ordinal[rows] = np.where(mask[day[rows]], np.cumsum(mask)[day[rows]] - 1, -1)
+    keep = ordinal >= 0
+    work = work.loc[keep, keys + ["jumlah"]].assign(year=year[keep], hari=ordinal[keep])
+    work["minggu"] = work["hari"] // HARI_PER_MINGGU
+
+    columns = keys + ["year"]
+    if work.empty:
+        return pd.DataFrame(columns=columns + ["hari"])
+    daily = work.groupby(columns + ["hari"], sort=False, observed=True)["jumlah"].sum().reset_index()
+    weekly = work.groupby(columns + ["minggu"], sort=False, observed=True)["jumlah"].sum().reset_index()
+
+    groups = daily[columns].drop_duplicates().reset_index(drop=True)
+    group_index = pd.MultiIndex.from_frame(groups)
+    daily_ids = group_index.get_indexer(pd.MultiIndex.from_frame(daily[columns]))
+    weekly_ids = group_index.get_indexer(pd.MultiIndex.from_frame(weekly[columns]))
+
+    n_days = groups["year"].map(period_days).to_numpy()
+    n_weeks = -(-n_days // HARI_PER_MINGGU)
+    result = groups.assign(hari=n_days)
+    result = result.assign(**_bucket_stats(daily_ids, daily["jumlah"].to_numpy(dtype=float),
+                                           n_days, PERSENTIL_HARIAN, "harian"))
+    result = result.assign(**_bucket_stats(weekly_ids, weekly["jumlah"].to_numpy(dtype=float),
+                                           n_weeks, PERSENTIL_MINGGUAN, "mingguan"))
+    return result
+
+
+# ----------------------------------------------------
+# Tabel seluruh katalog (dipublikasikan per versi data)
+# ----------------------------------------------------
+def catalogue_stats(store):
+    frame = pd.DataFrame({
+        "nobar_key": normalize_nobar(store["nobar"]),
+        "tanggal": store["tanggal"],
+        "jumlah": store["jumlah"].astype("float64"),
+    })
+    return compute_demand_stats(frame, ["nobar_key"], period_ends(store))
+
+
+def get_demand_stats(store, version):
+    """Statistik permintaan semua barang untuk versi data `version` (dibangun sekali)."""
+    return shared_store.get_shared(
+        "demand_stats", version, lambda: catalogue_stats(store), data_loader.SHARED_DIR
+    )
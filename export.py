@@ -0,0 +1,152 @@
+"""
+Unduhan dari dashboard: tabel barang yang sedang dicari dan evaluasi ROP
+seluruh katalog, sebagai XLSX / CSV / Parquet.
+
+- tables_file(): tabel hasil pencarian / banding yang sedang tampil (kecil,
+  dibuat di memori). XLSX satu sheet per tabel; CSV/Parquet satu tabel panjang
+  dengan kolom "Tabel".
+- catalogue_file(): evaluasi seluruh katalog (format sama dengan rop_batch),
+  dihitung per chunk nobar dan ditulis bertahap dengan rop_batch.ChunkWriter ke
+  file di EXPORT_DIR. File disimpan per (versi data, tahun, skenario, format),
+  jadi unduhan berikutnya tidak menghitung ulang; file dari versi data lama
+  dihapus setelah build baru selesai.
+
+Dashboard memberikan fungsi ini ke st.download_button sebagai callable, jadi
+file baru dibuat saat tombol diklik, di thread terpisah dari script halaman.
+"""
+import contextlib
+import glob
+import io
+import os
+import re
+import threading
+
+import pandas as pd
+
+import data_loader
+import lead_time_scenarios
+import rop_batch
+import rop_engine
+
+FORMATS = {
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "csv": "text/csv",
+    "parquet": "application/octet-stream",
+}
+EXPORT_DIR = os.path.join(data_loader.CACHE_DIR, "exports")
+CHUNK_SIZE = 500
+
+
+# ----------------------------------------------------
+# Tabel hasil pencarian / banding
+# ----------------------------------------------------
+def search_tables(result):
+    """{nama sheet: DataFrame} untuk hasil item_search.search."""
+    named = {
+        "Pemakaian": result["df_pemakaian"],
+        "Statistik Permintaan": result["df_demand"],
+    }
+    for label, evaluation in result["evaluations"].items():
+        named[f"Evaluasi {label}"] = evaluation["df_eval"]
+    return named
+
+
+def comparison_tables(comparison):
+    """{nama sheet: DataFrame} untuk hasil item_compare.compare."""
+    named = {"Pemakaian": comparison["usage"]}
+    for label, evaluation in comparison["evaluations"].items():
+        named[f"Evaluasi {label}"] = evaluation
+    return named
+
+
+def _sheet_name(name):
+    # Nama sheet Excel: maksimal 31 karakter, tanpa []:*?/\
+    return re.sub(r"[\[\]:*?/\\]", "-", str(name))[:31]
+
+
+def tables_file(named_tables, fmt):
+    """Isi file (bytes) untuk beberapa tabel kecil."""
+    buffer = io.BytesIO()
+    if fmt == "xlsx":
+        with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
+            for name, df in named_tables.items():
+                df.to_excel(writer, sheet_name=_sheet_name(name), index=False)
+        return buffer.getvalue()
+    long = pd.concat([df.assign(Tabel=name)[["Tabel"] + list(df.columns)] for name, df in named_tables.items()],
+                     ignore_index=True)
+    if fmt == "csv":
+        return long.to_csv(index=False).encode("utf-8")
+    # Kolom campuran (angka & teks, mis. baris Keterangan Pemakaian) ditulis sebagai teks
+    long = data_loader.arrow_safe(long)
+    long.columns = [str(c) for c in long.columns]
+    long.to_parquet(buffer, index=False)
+    return buffer.getvalue()
+
+
+# ----------------------------------------------------
+# Seluruh katalog (bertahap per chunk)
+# ----------------------------------------------------
+_BUILDS = {}
+_LOCK = threading.Lock()
+
+
+def catalogue_path(years, what_ifs, fmt):
+    key = data_loader.data_version(tuple(years), tuple(what_ifs))
+    return os.path.join(EXPORT_DIR, f"katalog-{data_loader.dataset_version()}-{key}.{fmt}")
+
+
+def _remove_stale(path):
+    """Hapus file katalog dari versi data lama (versi ada di awal nama file)."""
+    prefix = os.path.basename(path).rsplit("-", 1)[0] + "-"
+    for old in glob.glob(os.path.join(EXPORT_DIR, "katalog-*")):
+        name = os.path.basename(old)
+        # File .tmp milik build lain yang sedang berjalan dibiarkan
+        if not name.startswith(prefix) and not name.endswith(".tmp"):
+            with contextlib.suppress(OSError):
+                os.remove(old)
+    with _LOCK:
+        for key in [k for k in _BUILDS if not os.path.basename(k).startswith(prefix)]:
+            del _BUILDS[key]
+
+
+def catalogue_file(tables, years, what_ifs, fmt):
+    """
+    Path file evaluasi seluruh katalog untuk tahun sumber `years` (dibuat jika
+    belum ada). Baris per (lead time, nobar, tahun) seperti rop_batch.
+    """
+    path = catalogue_path(years, what_ifs, fmt)
+    with _LOCK:
+        lock = _BUILDS.setdefault(path, threading.Lock())
+    # Satu build per file; permintaan lain menunggu lalu memakai file yang sama
+    with lock:
+        if os.path.exists(path):
+            return path
+        # Backend pemakaian yang aktif (kubus di memori atau SQLite), sama dengan dashboard
+        cells = tables["usage_data"].catalogue_cells(years)
+        usage_table = rop_engine.yearly_usage_table(cells, years)
+        lead_times = lead_time_scenarios.scenario_tables(tables["lead_times"], what_ifs)
+
+        os.makedirs(EXPORT_DIR, exist_ok=True)
+        partial = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            writer = rop_batch.ChunkWriter(partial, fmt)
+            try:
+                for part in rop_batch.evaluate_chunks(usage_table, lead_times, tables["rop_existing"],
+                                                      chunk_size=CHUNK_SIZE):
+                    writer.write(part)
+            finally:
+                writer.close()
+            os.replace(partial, path)
+            _remove_stale(path)
+        except BaseException:
+            # File setengah jadi tidak boleh tertinggal di EXPORT_DIR
+            with contextlib.suppress(OSError):
+                os.remove(partial)
+            raise
+        return path
+
+
+def read_file(path):
+    """Isi file (bytes); file langsung ditutup lagi."""
+    with open(path, "rb") as f:
+        return f.read()
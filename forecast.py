@@ -0,0 +1,161 @@
+"""
+Forecast pemakaian tahun berikutnya untuk semua barang sekaligus.
+
+Riwayat pemakaian bulanan seluruh katalog disusun menjadi satu matriks
+(barang x bulan, bulan tanpa transaksi = 0), lalu dua model sederhana dihitung
+untuk semua baris matriks dengan operasi NumPy (tanpa loop per barang):
+
+- Seasonal Naive: bulan m tahun forecast = pemakaian bulan m tahun terakhir,
+- Exponential Smoothing: level SES, alpha dipilih per barang dari grid
+  berdasarkan error one-step-ahead.
+
+Model per barang dipilih dari error (MAE) pada 12 bulan terakhir yang ditahan
+(model dilatih tanpa 12 bulan itu). Tabel hasil dipublikasikan sebagai file
+Arrow bersama per versi data (shared_store), sama seperti demand_stats.
+"""
+import numpy as np
+import pandas as pd
+
+import data_loader
+import shared_store
+from nobar_index import normalize_nobar
+
+BULAN = 12
+ALPHAS = np.array([0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9])
+MODELS = ("Seasonal Naive", "Exponential Smoothing")
+FORECAST_COLUMNS = [f"bulan_{m}" for m in range(1, BULAN + 1)]
+HISTORY_COLUMNS = ["nobar", "tanggal", "jumlah"]
+
+
+# ----------------------------------------------------
+# Matriks pemakaian bulanan
+# ----------------------------------------------------
+def monthly_matrix(store):
+    """
+    (keys, matrix, first_period, last_period): matriks jumlah per barang x bulan
+    dari bulan transaksi pertama sampai terakhir; period = tahun * 12 + bulan - 1.
+    """
+    tanggal = store["tanggal"]
+    valid = tanggal.notna().to_numpy()
+    period = (tanggal.dt.year * BULAN + tanggal.dt.month - 1).to_numpy()[valid].astype(np.int64)
+    if len(period) == 0:
+        return np.array([], dtype=object), np.zeros((0, 0)), 0, -1
+    keys, item_ids = np.unique(normalize_nobar(store["nobar"]).to_numpy()[valid].astype(str),
+                               return_inverse=True)
+    first, last = int(period.min()), int(period.max())
+    matrix = np.zeros((len(keys), last - first + 1))
+    np.add.at(matrix, (item_ids, period - first), store["jumlah"].to_numpy(dtype=float)[valid])
+    return keys.astype(object), np.nan_to_num(matrix), first, last
+
+
+# ----------------------------------------------------
+# Model (vektor, semua barang sekaligus)
+# ----------------------------------------------------
+def seasonal_naive(history, periods, first_period):
+    """Forecast untuk `periods` (array period): nilai bulan yang sama dari tahun terakhir di history."""
+    n = history.shape[1]
+    last_period = first_period + n - 1
+    lag = periods - last_period
+    # Mundur per 12 bulan sampai jatuh di dalam history
+    source = periods - BULAN * np.ceil(lag / BULAN).astype(np.int64) - first_period
+    forecast = np.zeros((history.shape[0], len(periods)))
+    inside = source >= 0
+    forecast[:, inside] = history[:, source[inside]]
+    return forecast
+
+
+def exponential_smoothing(history):
+    """
+    Level SES per barang (alpha terbaik dari ALPHAS menurut SSE one-step-ahead).
+    Hasil: (level akhir, alpha). Level awal = rata-rata 12 bulan pertama.
+    """
+    n_items, n = history.shape
+    if n == 0:
+        return np.zeros(n_items), np.full(n_items, ALPHAS[0])
+    level = np.repeat(history[:, :BULAN].mean(axis=1, keepdims=True), len(ALPHAS), axis=1)
+    sse = np.zeros((n_items, len(ALPHAS)))
+    for t in range(n):
+        error = history[:, t:t + 1] - level
+        sse += error * error
+        level += ALPHAS * error
+    best = np.argmin(sse, axis=1)
+    rows = np.arange(n_items)
+    return level[rows, best], ALPHAS[best]
+
+
+def fit_forecast(keys, matrix, first_period, forecast_year):
+    """Tabel forecast bulanan (bulan_1..bulan_12) per barang untuk `forecast_year`."""
+    n_items, n = matrix.shape
+    periods = forecast_year * BULAN + np.arange(BULAN)
+    naive = seasonal_naive(matrix, periods, first_period)
+    level, alpha = exponential_smoothing(matrix)
+    ses = np.repeat(level[:, None], BULAN, axis=1)
+
+    # Pilih model per barang dari MAE 12 bulan terakhir (ditahan)
+    choose_naive = np.zeros(n_items, dtype=bool)
+    if n >= 2 * BULAN:
+        train, holdout = matrix[:, :-BULAN], matrix[:, -BULAN:]
+        holdout_periods = first_period + n - BULAN + np.arange(BULAN)
+        mae_naive = np.abs(seasonal_naive(train, holdout_periods, first_period) - holdout).mean(axis=1)
+        mae_ses = np.abs(exponential_smoothing(train)[0][:, None] - holdout).mean(axis=1)
+        choose_naive = mae_naive < mae_ses
+
+    forecast = np.clip(np.where(choose_naive[:, None], naive, ses), 0.0, None)
+    result = pd.DataFrame(forecast, columns=FORECAST_COLUMNS)
+    result.insert(0, "nobar_key", keys)
+    result.insert(1, "forecast_year", forecast_year)
+    result.insert(2, "model", np.where(choose_naive, MODELS[0], MODELS[1]))
+    result.insert(3, "alpha", alpha)
+    result["total"] = forecast.sum(axis=1)
+    return result
+
+
+# ----------------------------------------------------
+# Tabel seluruh katalog (dipublikasikan per versi data)
+# ----------------------------------------------------
+def catalogue_forecast(store):
+    keys, matrix, first_period, last_period = monthly_matrix(store)
+    forecast_year = last_period // BULAN + 1 if last_period >= 0 else 0
+    return fit_forecast(keys, matrix, first_period, forecast_year)
+
+
+def history_store(store, file_paths):
+    """
+    Riwayat transaksi semua tahun di `file_paths` untuk forecast. Tahun yang belum
+    dimuat di store (tahun dimuat saat dipilih) dibaca dari cache Parquet tanpa
+    masuk store, jadi forecast tidak bergantung pada tahun yang sudah dipilih.
+    """
+    loaded = set(store["source_year"].unique().tolist()) if len(store) else set()
+    parts = [store[HISTORY_COLUMNS]] if len(store) else []
+    for year, path in data_loader.normalize_file_paths(file_paths):
+        if year not in loaded:
+            df = data_loader.read_excel_cached(path, prepare=data_loader.prepare_transactions, memoize=False)
+            parts.append(df[HISTORY_COLUMNS])
+    if not parts:
+        return pd.DataFrame(columns=HISTORY_COLUMNS)
+    return pd.concat(parts, ignore_index=True)
+
+
+def get_forecast(store, version, file_paths=None):
+    """
+    Forecast tahun berikutnya semua barang untuk versi data `version` (dibangun
+    sekali). Dengan `file_paths`, riwayat diambil dari semua file itu (history_store)
+    dan `version` sebaiknya data_loader.files_version(file_paths).
+    """
+    build = (lambda: catalogue_forecast(history_store(store, file_paths))) if file_paths else \
+        (lambda: catalogue_forecast(store))
+    return shared_store.get_shared("forecast", version, build, data_loader.SHARED_DIR)
+
+
+def forecast_usage(forecast, keys, month_indices=None):
+    """
+    (tahun forecast, total pemakaian, nama model) untuk nobar_key terpilih dan
+    bulan (1-12); None jika tidak ada barang yang punya forecast.
+    """
+    rows = forecast[forecast["nobar_key"].isin(list(keys))]
+    if rows.empty:
+        return None
+    months = month_indices if month_indices is not None else range(1, BULAN + 1)
+    total = float(rows[[f"bulan_{m}" for m in months]].to_numpy().sum())
+    model = ", ".join(sorted(rows["model"].unique()))
+    return int(rows["forecast_year"].iloc[0]), round(total, 2), model
@@ -0,0 +1,157 @@
+"""
+Mode perbandingan beberapa nomor barang sekaligus.
+
+Daftar nobar (ditempel atau di-upload) dicocokkan persis (tidak peka huruf
+besar) ke master barang. Pemakaian semua barang diambil dengan satu query ke
+usage cube / SQLite, lalu pemakaian per tahun, evaluasi level order per lead
+time (rop_engine.evaluate_catalogue) dan tren bulanan dihitung dengan satu
+groupby untuk semua barang, bukan N pencarian terpisah.
+"""
+import io
+import os
+import re
+
+import pandas as pd
+
+import data_loader
+import item_search
+import lead_time_scenarios
+import profiling
+import rop_engine
+import usage_cube
+
+# Pemisah daftar nobar: baris baru, koma, titik koma, tab
+_SEPARATORS = re.compile(r"[\n,;\t]+")
+
+# Jumlah barang maksimal yang digambar di grafik tren
+MAX_TREND_ITEMS = 20
+
+EVAL_COLUMNS = {
+    "nobar": "Nomor Barang",
+    "nabar": "Nama Barang",
+    "year": "Tahun",
+    "usage": "Pemakaian Mutasi 1 th",
+    "rop": "ROP",
+    "min_stock": "Min Stock",
+    "order_qty": "Order Qty",
+    "max_stock": "Max Stock",
+    "Rop Existing": "ROP Existing",
+    "selisih_rop": "Selisih ROP",
+}
+
+
+# ----------------------------------------------------
+# Input daftar nobar
+# ----------------------------------------------------
+def parse_nobar_list(text):
+    """Daftar nobar unik (urutan input dipertahankan) dari teks yang ditempel."""
+    nobars = [part.strip() for part in _SEPARATORS.split(str(text or ""))]
+    return list(dict.fromkeys(n for n in nobars if n))
+
+
+def read_nobar_file(name, content):
+    """
+    Daftar nobar dari file upload (.csv, .xlsx, .txt). Untuk tabel dipakai kolom
+    'nobar' jika ada, selain itu kolom pertama.
+    """
+    ext = os.path.splitext(name)[1].lower()
+    if ext in (".csv", ".xlsx", ".xls"):
+        if ext == ".csv":
+            df = pd.read_csv(io.BytesIO(content), dtype=str)
+        else:
+            df = data_loader.read_excel(io.BytesIO(content), dtype=str)
+        if df.empty:
+            return []
+        column = next((c for c in df.columns if str(c).strip().lower() == "nobar"), df.columns[0])
+        return parse_nobar_list("\n".join(df[column].dropna().astype(str)))
+    return parse_nobar_list(content.decode("utf-8", errors="ignore"))
+
+
+# ----------------------------------------------------
+# Hitung perbandingan
+# ----------------------------------------------------
+def _item_transactions(store, keys, selected_years, m_indices):
+    """Baris transaksi barang `keys` (nobar_key) di tahun sumber & bulan terpilih."""
+    nobar = store["nobar"]
+    if isinstance(nobar.dtype, pd.CategoricalDtype):
+        # Cocokkan kategori sekali, lalu pilih baris lewat kode kategori
+        wanted = nobar.cat.categories.astype(str).str.lower().isin(keys)
+        mask = wanted[nobar.cat.codes.to_numpy()] & (nobar.cat.codes.to_numpy() >= 0)
+    else:
+        mask = nobar.astype(str).str.lower().isin(keys).to_numpy()
+    mask &= store["source_year"].isin([int(y) for y in selected_years]).to_numpy()
+    if m_indices is not None:
+        mask &= store["month"].isin(list(m_indices)).to_numpy(dtype=bool, na_value=False)
+    return store[mask]
+
+
+def compute_comparison(tables, nobars, m_indices, selected_years, what_ifs=()):
+    """
+    Hasil perbandingan (dict): items (master barang yang ditemukan), not_found,
+    usage (tabel pemakaian per tahun), evaluations {skenario lead time: tabel},
+    monthly (sel nobar x tahun x bulan untuk grafik tren) dan series (jumlah per
+    barang per hari).
+    """
+    with profiling.stage("filter"):
+        master = data_loader.item_master(tables["transaction_store"])
+        wanted = pd.DataFrame({"nobar_key": [n.lower() for n in nobars]}).drop_duplicates()
+        items = wanted.merge(master, on="nobar_key", how="inner")
+        found = set(items["nobar_key"])
+    result = {
+        "items": items[["nobar", "nabar", "satuan"]],
+        "not_found": [n for n in nobars if n.lower() not in found],
+    }
+    if items.empty:
+        return result
+
+    with profiling.stage("filter"):
+        # Satu slice untuk semua barang
+        keys = items["nobar_key"].tolist()
+        cells = tables["usage_data"].slice(keys, selected_years, m_indices)
+
+    with profiling.stage("aggregate"):
+        # Pemakaian per (barang, tahun); tahun tanpa transaksi bernilai 0
+        yearly = cells.groupby(["nobar_key", "year"])["jumlah"].sum()
+        full = pd.MultiIndex.from_product([keys, list(selected_years)], names=["nobar_key", "year"])
+        usage_table = (yearly.reindex(full, fill_value=0.0).astype(float).rename("usage").reset_index()
+                       .merge(items[["nobar_key", "nobar", "nabar"]], on="nobar_key"))
+
+        usage = usage_table.pivot(index="nobar_key", columns="year", values="usage").reindex(index=keys)
+        usage.columns = [str(y) for y in usage.columns]
+        result["usage"] = pd.concat([
+            items.set_index("nobar_key")[["nobar", "nabar", "satuan"]]
+            .rename(columns={"nobar": "Nomor Barang", "nabar": "Nama Barang", "satuan": "Satuan"}),
+            usage[[str(y) for y in selected_years]],
+        ], axis=1).reset_index(drop=True)
+
+    with profiling.stage("evaluate"):
+        # Evaluasi level order untuk setiap skenario lead time (vektor, semua barang sekaligus)
+        lead_times = lead_time_scenarios.scenario_tables(tables["lead_times"], what_ifs)
+        evaluated = rop_engine.evaluate_catalogue(usage_table[["nobar", "nabar", "year", "usage"]], lead_times)
+        evaluations = {}
+        if len(evaluated):
+            evaluated = rop_engine.compare_with_existing(evaluated, tables["rop_existing"])
+            for lt_year, part in evaluated.groupby("lead_time", sort=False):
+                evaluations[lt_year] = part[list(EVAL_COLUMNS)].rename(columns=EVAL_COLUMNS).reset_index(drop=True)
+        result["evaluations"] = evaluations
+
+    with profiling.stage("aggregate"):
+        # Tren bulanan per barang
+        monthly = cells.groupby(["nobar_key", "year", "month"])["jumlah"].sum().reset_index()
+        result["monthly"] = monthly.merge(items[["nobar_key", "nobar"]], on="nobar_key")
+        # Deret harian per barang (grafik harian/mingguan)
+        rows = _item_transactions(tables["transaction_store"], keys, selected_years, m_indices)
+        series = usage_cube.daily_usage(rows.assign(nobar_key=rows["nobar"].astype(str).str.lower()),
+                                        selected_years, by=["nobar_key"])
+        result["series"] = series.merge(items[["nobar_key", "nobar"]], on="nobar_key")
+    return result
+
+
+def compare(tables, nobars, m_indices, selected_years, what_ifs=()):
+    """compute_comparison() lewat cache hasil pencarian (item_search.SEARCH_CACHE)."""
+    key = (data_loader.dataset_version(), ("bandingkan",) + tuple(n.lower() for n in nobars),
+           tuple(sorted(set(m_indices))) if m_indices is not None else None, tuple(selected_years),
+           tuple(what_ifs))
+    return item_search.SEARCH_CACHE.get_or_compute(
+        key, lambda: compute_comparison(tables, nobars, m_indices, selected_years, what_ifs)
+    )
@@ -0,0 +1,319 @@
+"""
+Hasil pencarian satu nomor barang untuk dashboard.
+
+compute_search() menghitung semua yang ditampilkan setelah tombol Search:
+detail barang, tabel pemakaian per tahun, tabel evaluasi per lead time dan data
+grafik bulanan. Hasilnya disimpan di cache LRU/TTL per proses (result_cache),
+dengan kunci (versi data, nobar, bulan, tahun), jadi pencarian ulang barang
+yang sering dicari langsung diambil dari cache.
+"""
+import os
+
+import pandas as pd
+
+import data_loader
+import demand_stats
+import forecast
+import lead_time_scenarios
+import movement
+import profiling
+import result_cache
+import rop_engine
+import usage_cube
+from nobar_index import is_regex
+
+MONTHS = [
+    "Januari", "Februari", "Maret", "April", "Mei",
+    "Juni", "Juli", "Agustus", "September",
+    "Oktober", "November", "Desember"
+]
+
+# Dasar perhitungan pakai per hari
+DEMAND_BASES = {
+    "rumus": "Rumus (÷12 ÷4.29 ÷7)",
+    "terukur": "Terukur dari transaksi",
+}
+
+# Baris tabel statistik permintaan: (kolom demand_stats, label)
+DEMAND_ROWS = [
+    ("hari", "Hari dalam periode"),
+    ("harian_aktif", "Hari ada transaksi"),
+    ("harian_mean", "Rata-rata per hari"),
+    ("harian_std", "Std. dev. per hari"),
+    ("harian_p50", "P50 per hari"),
+    ("harian_p95", "P95 per hari"),
+    ("mingguan_mean", "Rata-rata per minggu"),
+    ("mingguan_std", "Std. dev. per minggu"),
+    ("mingguan_p10", "P10 per minggu"),
+    ("mingguan_p90", "P90 per minggu"),
+]
+
+SEARCH_CACHE = result_cache.ResultCache(
+    max_entries=int(os.environ.get("ROP_RESULT_CACHE_SIZE", "256")),
+    ttl_seconds=float(os.environ.get("ROP_RESULT_CACHE_TTL", "3600")),
+)
+
+
+# ----------------------------------------------------
+# Fungsi buat label Ranking
+# ----------------------------------------------------
+def get_rank_labels(n):
+    if n <= 0:
+        return []
+    if n == 1:
+        return ["Tertinggi"]
+    if n == 2:
+        return ["Tertinggi", "Terendah"]
+    if n == 3:
+        return ["Tertinggi", "Tertinggi ke-2", "Terendah"]
+    if n == 4:
+        return ["Tertinggi", "Tertinggi ke-2", "Tertinggi ke-3", "Terendah"]
+    # n >= 5
+    return ["Tertinggi", "Tertinggi ke-2", "Tertinggi ke-3", "Tertinggi ke-4", "Terendah"]
+
+
+def month_indices(selected_months):
+    """Nomor bulan (1-12) terpilih, atau None untuk "Semua Bulan"."""
+    if "Semua Bulan" in selected_months:
+        return None
+    return [MONTHS.index(m) + 1 for m in selected_months if m in MONTHS]
+
+
+def cache_key(nobar_input, m_indices, selected_years, version=None, demand_basis="rumus", what_ifs=()):
+    # Query biasa tidak peka huruf besar; pola regex disimpan apa adanya (\d != \D)
+    query = str(nobar_input)
+    if not is_regex(query):
+        query = query.lower()
+    months = tuple(sorted(set(m_indices))) if m_indices is not None else None
+    version = version if version is not None else data_loader.dataset_version()
+    return (version, query, months, tuple(selected_years), demand_basis, tuple(what_ifs))
+
+
+# ----------------------------------------------------
+# Hitung hasil pencarian
+# ----------------------------------------------------
+def _demand_stats(tables, keys, filtered_data, m_indices, selected_years):
+    """
+    Statistik permintaan terukur per tahun (index = tahun terpilih). Satu barang
+    tanpa filter bulan diambil dari tabel katalog yang sudah dihitung; selain itu
+    dihitung dari baris transaksi hasil filter.
+    """
+    if m_indices is None and len(keys) == 1:
+        stats = tables["demand_stats"]
+        stats = stats[stats["nobar_key"] == keys[0]]
+    else:
+        stats = demand_stats.compute_demand_stats(
+            filtered_data, [], demand_stats.period_ends(tables["transaction_store"]), m_indices
+        )
+    columns = [c for c, _ in DEMAND_ROWS]
+    stats = stats.set_index("year").reindex(columns=columns)
+    return stats.reindex([int(y) for y in selected_years]).fillna(0.0)
+
+
+def _usage_table(usage_per_year, daily, keterangan_pemakaian, selected_years):
+    usage_cols = ["Keterangan"] + [str(y) for y in selected_years]
+    usage_rows = [
+        ["Pemakaian Mutasi 1 th"] + usage_per_year,
+        ["Pakai per bulan"] + daily["per_bulan"].tolist(),
+        ["Pakai per minggu"] + daily["per_minggu"].tolist(),
+        ["Pakai per hari (Avg)"] + daily["per_hari_avg"].tolist(),
+        ["Pakai per hari (Min)"] + daily["per_hari_min"].tolist(),
+        ["Pakai per hari (Max)"] + daily["per_hari_max"].tolist(),
+        ["Keterangan Pemakaian"] + keterangan_pemakaian
+    ]
+    return pd.DataFrame(usage_rows, columns=usage_cols)
+
+
+def _evaluation_table(usage_per_year, levels, keterangan_pemakaian, selected_years, forecast_column=None):
+    eval_cols = ["Keterangan"] + [str(y) for y in selected_years]
+    eval_rows = [
+        ["Pemakaian Mutasi 1 th"] + [round(v, 2) for v in usage_per_year],
+        ["ROP"] + levels["rop"].tolist(),
+        ["Min Stock"] + levels["min_stock"].tolist(),
+        ["Order Qty"] + levels["order_qty"].tolist(),
+        ["Max Stock"] + levels["max_stock"].tolist(),
+        ["Keterangan Pemakaian"] + keterangan_pemakaian
+    ]
+    df_eval = pd.DataFrame(eval_rows, columns=eval_cols)
+    if forecast_column is not None:
+        # Kolom tahun forecast di kanan tahun-tahun riwayat
+        label, values = forecast_column
+        df_eval[label] = values
+    return df_eval
+
+
+def _forecast_daily(forecast_info, demand_basis, usage_per_year, stats, selected_years):
+    """
+    (pakai per hari untuk pemakaian forecast, keterangan dasar). Dasar "terukur":
+    statistik terukur tahun terbaru yang punya pemakaian, diskalakan ke total
+    forecast (tahun forecast belum punya transaksi); tanpa tahun seperti itu,
+    atau dengan dasar "rumus", pembagi tetap.
+    """
+    usage = forecast_info["usage"]
+    if demand_basis == "terukur":
+        profiles = [(int(y), u) for y, u in zip(selected_years, usage_per_year) if u > 0]
+        if profiles:
+            year, year_usage = max(profiles)
+            row = stats.loc[year]
+            scale = usage / year_usage
+            daily = rop_engine.measured_daily_usage(
+                [usage], [row["harian_mean"] * scale], [row["mingguan_mean"] * scale],
+                [row["mingguan_p10"] * scale], [row["mingguan_p90"] * scale]
+            )
+            return daily, f"terukur, profil {year}"
+    return rop_engine.daily_usage([usage]), "rumus"
+
+
+def _forecast_column(forecast_info, levels):
+    # (label kolom, nilai per baris tabel evaluasi) untuk pemakaian hasil forecast
+    values = [forecast_info["usage"]] + [int(levels[k][0]) for k in ("rop", "min_stock", "order_qty", "max_stock")]
+    return (f"{forecast_info['year']} (Forecast)",
+            values + [f"Forecast ({forecast_info['model']}; {forecast_info['basis']})"])
+
+
+def compute_search(tables, nobar_input, m_indices, selected_years, demand_basis="rumus", what_ifs=()):
+    """
+    Hasil pencarian (dict) untuk tabel dari streamlit_app.load_data(). Kunci:
+    errors, empty, detail, usage_per_year, keterangan_pemakaian, df_pemakaian,
+    demand_stats, df_demand, forecast, evaluations {skenario lead time: {...}}
+    monthly {tahun: DataFrame bulan/jumlah} dan series (jumlah per hari untuk
+    grafik harian/mingguan). `demand_basis` "terukur" memakai
+    statistik permintaan terukur untuk pakai per minggu/hari, selain itu rumus
+    pembagi tetap. `what_ifs`: skenario lead time tambahan (base, faktor, hari).
+    """
+    data = tables["data"]
+    item_index = tables["item_index"]
+    result = {"errors": [], "empty": True}
+
+    # Filter Data
+    with profiling.stage("filter"):
+        filtered_data = []
+        for year in selected_years:
+            if 'tanggal' not in data[year].columns:
+                result["errors"].append(f"Kolom 'tanggal' tidak ditemukan di data tahun {year}.")
+                continue
+            # tanggal sudah bertipe datetime (kolom year/month dibuat saat ingest)
+            df = item_index.filter(year, nobar_input)
+            if m_indices is not None:
+                df = df[df['month'].isin(m_indices)]
+            filtered_data.append(df)
+
+        filtered_data = pd.concat(filtered_data) if filtered_data else pd.DataFrame()
+    if filtered_data.empty:
+        return result
+    result["empty"] = False
+
+    with profiling.stage("filter"):
+        # Detail barang
+        first_row = filtered_data.iloc[0]
+        # Movement status dihitung dari transaksi; movement_status.xlsx sebagai override
+        movement_data = item_index.filter("movement_status", nobar_input)
+        override = movement_data.iloc[0].get('count', 'Status tidak ditemukan') \
+            if not movement_data.empty else None
+        status, movement_row, source = movement.movement_status(
+            tables["movement"], first_row.get("nobar", ""), override
+        )
+        result["detail"] = {
+            "nobar": first_row.get("nobar", ""),
+            "nabar": first_row.get("nabar", "nabar TIDAK ADA"),
+            "satuan": first_row.get("satuan", "satuan TIDAK ADA"),
+            "movement_status": status,
+            "movement_source": source,
+            "movement_computed": movement_row.to_dict() if movement_row is not None else None,
+        }
+
+        # Sel cube untuk barang & filter terpilih
+        keys = list(tables["match_usage_keys"](nobar_input))
+        usage_cells = tables["usage_data"].slice(keys, selected_years, m_indices)
+
+    with profiling.stage("aggregate"):
+        usage_per_year = usage_cube.yearly_usage(usage_cells, selected_years)
+
+        # Statistik permintaan terukur (selalu ditampilkan, dipakai jika dipilih)
+        stats = _demand_stats(tables, keys, filtered_data, m_indices, selected_years)
+        result["demand_stats"] = stats
+        result["df_demand"] = pd.DataFrame(
+            [[label] + stats[column].round(2).tolist() for column, label in DEMAND_ROWS],
+            columns=["Keterangan"] + [str(y) for y in selected_years],
+        )
+        if demand_basis == "terukur":
+            daily = rop_engine.measured_daily_usage(
+                usage_per_year, stats["harian_mean"], stats["mingguan_mean"],
+                stats["mingguan_p10"], stats["mingguan_p90"]
+            )
+        else:
+            daily = rop_engine.daily_usage(usage_per_year)
+
+        # Ranking
+        sorted_usage = sorted(zip(selected_years, usage_per_year), key=lambda x: x[1], reverse=True)
+        rank_labels = get_rank_labels(len(sorted_usage))
+        rank_dict = {yr: rank_labels[i] if i < len(rank_labels) else "-" for i, (yr, _) in enumerate(sorted_usage)}
+        keterangan_pemakaian = [rank_dict[y] for y in selected_years]
+
+        result["usage_per_year"] = usage_per_year
+        result["keterangan_pemakaian"] = keterangan_pemakaian
+        result["df_pemakaian"] = _usage_table(usage_per_year, daily, keterangan_pemakaian, selected_years)
+
+        # Forecast pemakaian tahun berikutnya (bulan terpilih), dari tabel katalog
+        forecast_info = forecast.forecast_usage(tables["forecast"], keys, m_indices)
+        if forecast_info is not None:
+            forecast_info = dict(zip(("year", "usage", "model"), forecast_info))
+        result["forecast"] = forecast_info
+
+    # ROP Existing (sama untuk semua lead time)
+    with profiling.stage("evaluate"):
+        rop_rows = item_index.filter("rop_existing", nobar_input)
+        rop_value = rop_rows.iloc[0]['Rop Existing'] if not rop_rows.empty else "Data tidak ditemukan"
+
+        # Semua skenario lead time dievaluasi sekaligus (satu order_levels)
+        lead_time_values = lead_time_scenarios.item_lead_times(
+            item_index, nobar_input, tables["lead_times"], what_ifs
+        )
+        scenario_levels = lead_time_scenarios.evaluate(daily, lead_time_values)
+        forecast_levels = {}
+        if forecast_info is not None:
+            # Dasar pakai per hari forecast mengikuti pilihan "Dasar pakai per hari"
+            forecast_daily, forecast_info["basis"] = _forecast_daily(
+                forecast_info, demand_basis, usage_per_year, stats, selected_years
+            )
+            forecast_levels = lead_time_scenarios.evaluate(forecast_daily, lead_time_values)
+
+        evaluations = {}
+        for label, lt in lead_time_values.items():
+            # Barang tanpa lead time: NaN ditampilkan sebagai 0, sama dengan evaluate_catalogue
+            lt_min, lt_avg, lt_max = (0 if pd.isna(v) else v for v in lt)
+            levels = scenario_levels[label]
+            forecast_column = _forecast_column(forecast_info, forecast_levels[label]) \
+                if forecast_info is not None else None
+            evaluations[label] = {
+                "df_eval": _evaluation_table(usage_per_year, levels, keterangan_pemakaian, selected_years,
+                                             forecast_column),
+                "rop_existing": rop_value,
+                "lt_min": lt_min,
+                "lt_avg": lt_avg,
+                "lt_max": lt_max,
+                "levels": levels,
+            }
+        result["evaluations"] = evaluations
+
+    # Data grafik bulanan per tahun
+    with profiling.stage("aggregate"):
+        usage_years = set(usage_cells['year'].unique())
+        monthly = {}
+        for year in selected_years:
+            if year in usage_years:
+                monthly_data = usage_cube.monthly_usage(usage_cells, year).rename_axis('tanggal').reset_index()
+                monthly_data['tanggal'] = monthly_data['tanggal'].apply(lambda x: MONTHS[x-1] if x-1 < len(MONTHS) else x)
+                monthly[year] = monthly_data
+        result["monthly"] = monthly
+        # Deret harian (grafik harian/mingguan diagregasi dari sini)
+        result["series"] = usage_cube.daily_usage(filtered_data, selected_years)
+    return result
+
+
+def search(tables, nobar_input, m_indices, selected_years, demand_basis="rumus", what_ifs=()):
+    """compute_search() lewat cache hasil; hasilnya read-only (dipakai bersama sesi lain)."""
+    key = cache_key(nobar_input, m_indices, selected_years, demand_basis=demand_basis, what_ifs=what_ifs)
+    return SEARCH_CACHE.get_or_compute(
+        key, lambda: compute_search(tables, nobar_input, m_indices, selected_years, demand_basis, what_ifs)
+    )
@@ -0,0 +1,119 @@
+"""
+Saran nomor barang (type-ahead) dari master barang.
+
+Struktur pencarian dibangun sekali per store transaksi:
+
+- nobar (lowercase) terurut, untuk prefix lewat searchsorted,
+- token nama barang (nabar dipecah di karakter non huruf/angka) terurut,
+  masing-masing dengan daftar id barang,
+- popularitas barang (jumlah baris transaksi).
+
+Peringkat: nobar sama persis > awalan nobar > nobar memuat query > semua kata
+query adalah awalan kata di nama barang. Di dalam peringkat yang sama, barang
+yang paling sering keluar didahulukan.
+"""
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+
+import data_loader
+
+TOP_K = 10
+_TOKEN_SPLIT = re.compile(r"[^0-9a-z]+")
+_NO_MATCH = 99
+
+
+def _tokens(text):
+    return [t for t in _TOKEN_SPLIT.split(str(text).lower()) if t]
+
+
+def _prefix_range(sorted_values, prefix):
+    lo = np.searchsorted(sorted_values, prefix, side="left")
+    hi = np.searchsorted(sorted_values, prefix + "\uffff", side="left")
+    return lo, hi
+
+
+def exact_query(nobar):
+    """Query regex yang hanya cocok dengan satu nobar (dipakai saat saran dipilih)."""
+    return "^" + re.escape(str(nobar)) + "$"
+
+
+class ItemSuggester:
+    def __init__(self, items, popularity=None):
+        # items: data_loader.item_master(); popularity: jumlah transaksi per baris items
+        self.items = items.reset_index(drop=True)
+        self.keys = self.items["nobar_key"].to_numpy(dtype=object)
+        self._key_order = np.argsort(self.keys, kind="stable")
+        self._sorted_keys = self.keys[self._key_order]
+        popularity = np.zeros(len(self.items)) if popularity is None \
+            else np.asarray(popularity, dtype=float)
+        # Urutan tetap per barang: paling populer dulu, lalu nobar
+        self._rank = np.empty(len(self.items), dtype=np.int64)
+        self._rank[np.lexsort((self.keys, -popularity))] = np.arange(len(self.items))
+        self._keys_text = self.keys.astype(str)
+
+        # Token nama -> id barang, disimpan rata (CSR) supaya satu rentang awalan
+        # token cukup diambil sebagai satu slice
+        postings = {}
+        names = self.items["nabar"] if "nabar" in self.items.columns else pd.Series([""] * len(self.items))
+        for item_id, name in enumerate(names.astype(str)):
+            for token in set(_tokens(name)):
+                postings.setdefault(token, []).append(item_id)
+        self._tokens = np.array(sorted(postings), dtype=object)
+        sizes = [len(postings[t]) for t in self._tokens]
+        self._token_ptr = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+        self._token_ids = np.fromiter((i for t in self._tokens for i in postings[t]),
+                                      dtype=np.int64, count=int(self._token_ptr[-1]))
+
+    def _name_matches(self, query_tokens):
+        hits = None
+        for token in query_tokens:
+            lo, hi = _prefix_range(self._tokens, token)
+            mask = np.zeros(len(self.keys), dtype=bool)
+            mask[self._token_ids[self._token_ptr[lo]:self._token_ptr[hi]]] = True
+            hits = mask if hits is None else hits & mask
+        return hits if hits is not None else np.zeros(len(self.keys), dtype=bool)
+
+    def suggest(self, query, k=TOP_K):
+        """Top-k barang (nobar, nabar, satuan) untuk `query`, sudah diurutkan."""
+        q = str(query).strip().lower()
+        if not q or len(self.keys) == 0:
+            return self.items.iloc[0:0]
+
+        score = np.full(len(self.keys), _NO_MATCH, dtype=np.int64)
+        score[np.char.find(self._keys_text, q) >= 0] = 2
+        lo, hi = _prefix_range(self._sorted_keys, q)
+        score[self._key_order[lo:hi]] = 1
+        score[self._key_order[lo:hi][self._sorted_keys[lo:hi] == q]] = 0
+        name_hits = self._name_matches(_tokens(q))
+        score[name_hits] = np.minimum(score[name_hits], 3)
+
+        candidates = np.flatnonzero(score < _NO_MATCH)
+        order_key = score[candidates] * len(self.keys) + self._rank[candidates]
+        if len(candidates) > k:
+            top = np.argpartition(order_key, k)[:k]
+        else:
+            top = np.arange(len(candidates))
+        top = top[np.argsort(order_key[top])]
+        return self.items.iloc[candidates[top]]
+
+
+# ----------------------------------------------------
+# Cache per proses
+# ----------------------------------------------------
+_SUGGESTER = {"store": None, "suggester": None}
+_LOCK = threading.Lock()
+
+
+def get_suggester(store):
+    """ItemSuggester untuk store transaksi (dibangun ulang hanya jika store berganti)."""
+    with _LOCK:
+        if _SUGGESTER["store"] is store:
+            return _SUGGESTER["suggester"]
+        items = data_loader.item_master(store)
+        counts = store["nobar"].astype(str).value_counts()
+        suggester = ItemSuggester(items, items["nobar"].map(counts).fillna(0).to_numpy())
+        _SUGGESTER.update(store=store, suggester=suggester)
+        return suggester
@@ -0,0 +1,102 @@
+"""
+Skenario lead time untuk evaluasi level order.
+
+Skenario terdaftar:
+
+- tabel file: data_loader.lead_time_files() (Book1.xlsx = 2024, Book2.xlsx =
+  2023, ditambah file lead_time_<nama>.xlsx di folder data, mis. per supplier),
+- what-if: (skenario dasar, faktor, tambahan hari), yaitu lead time skenario
+  dasar x faktor + tambahan hari.
+
+Lead time semua skenario diambil sekali per barang (lewat index nobar, atau
+satu tabel lebar untuk katalog di rop_engine.evaluate_catalogue), lalu
+ROP/Min/Order/Max semua skenario x tahun dihitung dengan satu panggilan
+rop_engine.order_levels (broadcast NumPy). Dashboard menampilkan satu kartu
+per skenario.
+"""
+import numpy as np
+
+import rop_engine
+from rop_engine import LEAD_TIME_COLUMNS
+
+
+# ----------------------------------------------------
+# What-if
+# ----------------------------------------------------
+def what_if_label(base, factor=1.0, extra_days=0.0):
+    """Nama skenario what-if, mis. "2024 x1.2 +3 hari"."""
+    parts = [str(base)]
+    if factor != 1:
+        parts.append(f"x{factor:g}")
+    if extra_days:
+        parts.append(f"{extra_days:+g} hari")
+    return " ".join(parts) if len(parts) > 1 else f"{base} (what-if)"
+
+
+def apply_what_if(values, factor=1.0, extra_days=0.0):
+    """Lead time x faktor + tambahan hari (tidak kurang dari 0; NaN tetap NaN)."""
+    return np.round(np.clip(np.asarray(values, dtype=float) * factor + extra_days, 0.0, None), 2)
+
+
+def scenario_tables(lead_times, what_ifs=()):
+    """
+    {skenario: DataFrame lead time} untuk rop_engine.evaluate_catalogue: tabel
+    file ditambah tabel turunan untuk setiap what-if (base, faktor, hari).
+    """
+    tables = dict(lead_times)
+    for base, factor, extra_days in what_ifs:
+        if base not in lead_times:
+            continue
+        derived = rop_engine.first_lead_time(lead_times[base])
+        derived[LEAD_TIME_COLUMNS] = apply_what_if(derived[LEAD_TIME_COLUMNS].to_numpy(), factor, extra_days)
+        tables[what_if_label(base, factor, extra_days)] = derived
+    return tables
+
+
+# ----------------------------------------------------
+# Satu barang (dashboard)
+# ----------------------------------------------------
+def index_table(label):
+    """Nama tabel lead time `label` di index nobar."""
+    return f"lead_time_{label}"
+
+
+def item_lead_times(item_index, nobar_input, labels, what_ifs=()):
+    """
+    {skenario: (min, avg, max)} untuk query nobar: baris pertama tabel lead time
+    yang cocok, atau NaN jika barang tidak ada di tabel itu. Seperti di
+    evaluate_catalogue, what-if tidak mengubah NaN dan evaluate() memakai 0.
+    """
+    values = {}
+    for label in labels:
+        lt = item_index.filter(index_table(label), nobar_input)
+        if lt.empty:
+            values[label] = (np.nan, np.nan, np.nan)
+        else:
+            first = lt.iloc[0]
+            values[label] = tuple(first[c] for c in LEAD_TIME_COLUMNS)
+    for base, factor, extra_days in what_ifs:
+        if base in values:
+            values[what_if_label(base, factor, extra_days)] = tuple(
+                apply_what_if(values[base], factor, extra_days).tolist()
+            )
+    return values
+
+
+def evaluate(daily, lead_time_values):
+    """
+    Level order semua skenario x tahun dengan satu order_levels. `daily`: hasil
+    rop_engine.daily_usage / measured_daily_usage (array per tahun). Hasil
+    {skenario: {rop, min_stock, order_qty, max_stock: array per tahun}}.
+    """
+    labels = list(lead_time_values)
+    if not labels:
+        return {}
+    lt = np.nan_to_num(np.array([lead_time_values[label] for label in labels], dtype=float))
+    levels = rop_engine.order_levels(
+        np.asarray(daily["per_hari_avg"], dtype=float)[None, :],
+        np.asarray(daily["per_hari_min"], dtype=float)[None, :],
+        np.asarray(daily["per_hari_max"], dtype=float)[None, :],
+        lt[:, 0:1], lt[:, 1:2], lt[:, 2:3],
+    )
+    return {label: {key: values[i] for key, values in levels.items()} for i, label in enumerate(labels)}
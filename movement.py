@@ -0,0 +1,157 @@
+"""
+Movement status (Fast / Slow / Non Moving) dihitung dari riwayat transaksi.
+
+Aktivitas per (barang, bulan) disimpan per tahun sumber: jumlah transaksi,
+total jumlah dan tanggal transaksi terakhir. Seperti usage cube, hanya tahun
+yang berubah yang diagregasi ulang, dan tahun yang hanya mendapat baris
+tambahan cukup digabung dengan agregasi baris barunya. Klasifikasi semua
+barang lalu dihitung sekaligus dari tabel aktivitas itu:
+
+- recency: hari sejak transaksi terakhir (terhadap tanggal transaksi terakhir di data),
+- frekuensi: jumlah transaksi & bulan aktif dalam JENDELA_BULAN terakhir,
+- volume: total jumlah dalam jendela yang sama.
+
+File movement_status.xlsx hanya dipakai sebagai override per nobar.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+import usage_cube
+from nobar_index import normalize_nobar
+
+JENDELA_BULAN = 12
+# Fast Moving: minimal transaksi dalam jendela, dan transaksi terakhir paling
+# lama FAST_MAX_RECENCY_HARI hari sebelum tanggal referensi
+FAST_MIN_TRANSAKSI = 5
+FAST_MAX_RECENCY_HARI = 90
+
+FAST, SLOW, NON = "Fast Moving", "Slow Moving", "Non Moving"
+ACTIVITY_COLUMNS = ["nobar_key", "period", "count", "jumlah", "last_date"]
+
+
+# ----------------------------------------------------
+# Aktivitas per barang x bulan
+# ----------------------------------------------------
+def aggregate_activity(df):
+    """Aktivitas (nobar_key, period = tahun*12 + bulan-1) dari satu frame transaksi."""
+    tanggal = df["tanggal"]
+    work = pd.DataFrame({
+        "nobar_key": normalize_nobar(df["nobar"]),
+        "period": tanggal.dt.year * 12 + tanggal.dt.month - 1,
+        "jumlah": df["jumlah"].astype("float64"),
+        "tanggal": tanggal,
+    }).dropna(subset=["tanggal"])
+    activity = (work.groupby(["nobar_key", "period"], sort=False)
+                .agg(count=("jumlah", "size"), jumlah=("jumlah", "sum"), last_date=("tanggal", "max"))
+                .reset_index())
+    activity["period"] = activity["period"].astype(np.int64)
+    return activity[ACTIVITY_COLUMNS]
+
+
+def combine_activity(frames):
+    """Jumlahkan beberapa tabel aktivitas (barang x bulan yang sama digabung)."""
+    frames = [f for f in frames if f is not None and len(f)]
+    if not frames:
+        return pd.DataFrame(columns=ACTIVITY_COLUMNS)
+    merged = pd.concat(frames, ignore_index=True)
+    return (merged.groupby(["nobar_key", "period"], sort=False)
+            .agg(count=("count", "sum"), jumlah=("jumlah", "sum"), last_date=("last_date", "max"))
+            .reset_index())[ACTIVITY_COLUMNS]
+
+
+# ----------------------------------------------------
+# Klasifikasi (vektor, semua barang)
+# ----------------------------------------------------
+def classify(activity):
+    """
+    Tabel per nobar_key: transaksi_terakhir, recency_hari, transaksi_12bln,
+    bulan_aktif_12bln, volume_12bln dan movement.
+    """
+    columns = ["nobar_key", "transaksi_terakhir", "recency_hari", "transaksi_12bln",
+               "bulan_aktif_12bln", "volume_12bln", "movement"]
+    if activity.empty:
+        return pd.DataFrame(columns=columns)
+    reference = activity["last_date"].max()
+    last_period = reference.year * 12 + reference.month - 1
+    in_window = (activity["period"] > last_period - JENDELA_BULAN).to_numpy()
+
+    codes, keys = pd.factorize(activity["nobar_key"])
+    n = len(keys)
+    window_codes = codes[in_window]
+    count = np.bincount(window_codes, weights=activity["count"].to_numpy()[in_window], minlength=n)
+    volume = np.bincount(window_codes, weights=activity["jumlah"].to_numpy()[in_window], minlength=n)
+    months = np.bincount(window_codes, minlength=n)
+    last_date = activity.groupby(codes)["last_date"].max().reindex(range(n)).to_numpy()
+
+    recency = (reference - pd.DatetimeIndex(last_date)).days.to_numpy()
+
+    # Non: tanpa pemakaian di jendela; Fast: sering DAN masih aktif baru-baru ini
+    fast = (count >= FAST_MIN_TRANSAKSI) & (recency <= FAST_MAX_RECENCY_HARI)
+    movement = np.where((count == 0) | (volume <= 0), NON, np.where(fast, FAST, SLOW))
+    return pd.DataFrame({
+        "nobar_key": np.asarray(keys, dtype=object),
+        "transaksi_terakhir": last_date,
+        "recency_hari": recency,
+        "transaksi_12bln": count.astype(np.int64),
+        "bulan_aktif_12bln": months.astype(np.int64),
+        "volume_12bln": volume,
+        "movement": movement,
+    })[columns]
+
+
+def movement_status(table, nobar, override=None):
+    """
+    (status, baris klasifikasi atau None, sumber) untuk satu nobar; `override`
+    (nilai dari movement_status.xlsx) menang jika ada.
+    """
+    rows = table[table["nobar_key"] == str(nobar).lower()]
+    row = rows.iloc[0] if len(rows) else None
+    if override is not None:
+        return override, row, "movement_status.xlsx"
+    if row is None:
+        return None, None, None
+    return row["movement"], row, "transaksi"
+
+
+# ----------------------------------------------------
+# Cache per proses (inkremental per tahun sumber)
+# ----------------------------------------------------
+_MOVEMENT = {"sources": {}, "parts": {}, "table": None, "version": None}
+_LOCK = threading.Lock()
+
+
+def get_movement(data, version=None, changes=None, source_versions=None):
+    """
+    Klasifikasi movement untuk dict {tahun: DataFrame transaksi}. Hanya tahun yang
+    berubah (versi file sumber dari `source_versions`, atau objek DataFrame-nya)
+    yang diproses ulang; jika `changes`
+    (data_loader.last_changes()) berasal dari versi sebelumnya, tahun yang hanya
+    mendapat baris tambahan cukup digabung dengan aktivitas baris barunya.
+    """
+    with _LOCK:
+        sources = _MOVEMENT["sources"]
+        changed = [y for y, df in data.items() if not usage_cube.is_unchanged(sources.get(y), df, y, source_versions)]
+        removed = [y for y in sources if y not in data]
+        if _MOVEMENT["table"] is not None and not changed and not removed:
+            return _MOVEMENT["table"]
+
+        appended = {}
+        if changes and _MOVEMENT["table"] is not None and changes.get("base_version") == _MOVEMENT["version"]:
+            appended = changes.get("appended", {})
+
+        parts = {y: p for y, p in _MOVEMENT["parts"].items() if y in data}
+        for y in changed:
+            if y in appended and y in parts:
+                parts[y] = combine_activity([parts[y], aggregate_activity(appended[y])])
+            else:
+                parts[y] = aggregate_activity(data[y])
+            sources[y] = usage_cube.source_key(data[y], y, source_versions)
+        for y in removed:
+            sources.pop(y, None)
+
+        # Bulan yang sama bisa muncul di beberapa tahun sumber
+        table = classify(combine_activity(list(parts.values())))
+        _MOVEMENT.update(parts=parts, table=table, version=version)
+        return table
@@ -0,0 +1,134 @@
+"""
+Index nomor barang (nobar) untuk pencarian cepat di semua tabel.
+
+Semantik pencarian sama dengan filter lama
+`df['nobar'].astype(str).str.contains(query, case=False, na=False)`:
+substring, tidak peka huruf besar/kecil. Bedanya, index dibangun sekali saat
+data dimuat:
+
+- setiap nobar unik (lowercase) mendapat key id,
+- per tabel disimpan posisi baris yang diurutkan per key id,
+- trigram (3 huruf) -> key id, untuk mempersempit kandidat substring.
+
+Lookup hanya memeriksa nobar unik yang lolos trigram, lalu mengambil posisi
+barisnya, sehingga biaya sebanding dengan jumlah hasil, bukan ukuran tabel.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+NGRAM = 3
+
+# Karakter regex; query yang memuatnya dicocokkan sebagai pola regex seperti dulu
+REGEX_CHARS = set(".^$*+?{}[]\\|()")
+
+
+def is_regex(query):
+    """True jika `query` dicocokkan sebagai pola regex (memuat karakter regex)."""
+    return any(ch in REGEX_CHARS for ch in str(query))
+
+
+def normalize_nobar(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Cukup lowercase kategorinya, lalu petakan lewat codes
+        categories = series.cat.categories.astype(str).str.lower().to_numpy(dtype=object)
+        codes = series.cat.codes.to_numpy()
+        values = np.where(codes >= 0, categories[codes] if len(categories) else "nan", "nan")
+        return pd.Series(values, index=series.index, dtype=object)
+    return series.astype(str).str.lower()
+
+
+def _ngrams(text):
+    return {text[i:i + NGRAM] for i in range(len(text) - NGRAM + 1)}
+
+
+class NobarIndex:
+    def __init__(self, tables):
+        # tables: {nama_tabel: DataFrame dengan kolom 'nobar'}
+        self.tables = dict(tables)
+
+        normalized = {name: normalize_nobar(df["nobar"]) for name, df in self.tables.items()
+                      if "nobar" in df.columns}
+        all_keys = pd.unique(pd.concat(list(normalized.values()), ignore_index=True)) \
+            if normalized else np.array([], dtype=object)
+        self.keys = np.sort(np.asarray(all_keys, dtype=object))
+        self._key_ids = {key: i for i, key in enumerate(self.keys)}
+
+        # Per tabel: posisi baris diurutkan per key id + batas tiap key
+        self._order = {}
+        self._bounds = {}
+        for name, norm in normalized.items():
+            codes = np.searchsorted(self.keys, norm.to_numpy(dtype=object))
+            order = np.argsort(codes, kind="stable")
+            self._order[name] = order
+            self._bounds[name] = np.searchsorted(codes[order], np.arange(len(self.keys) + 1))
+
+        # Trigram -> key id
+        postings = {}
+        for key_id, key in enumerate(self.keys):
+            for gram in _ngrams(key):
+                postings.setdefault(gram, []).append(key_id)
+        self._postings = {gram: np.asarray(ids, dtype=np.int64) for gram, ids in postings.items()}
+
+    # ------------------------------------------------
+    # Lookup
+    # ------------------------------------------------
+    def match_key_ids(self, query):
+        if is_regex(query):
+            # Pola regex dicocokkan ke nobar unik saja, bukan ke setiap baris
+            hits = pd.Series(self.keys, dtype=object).str.contains(query, case=False, na=False)
+            return np.flatnonzero(hits.to_numpy())
+        q = str(query).lower()
+        if len(q) < NGRAM:
+            candidates = range(len(self.keys))
+        else:
+            candidates = None
+            for gram in _ngrams(q):
+                ids = self._postings.get(gram)
+                if ids is None:
+                    return np.array([], dtype=np.int64)
+                candidates = ids if candidates is None else np.intersect1d(candidates, ids, assume_unique=True)
+                if len(candidates) == 0:
+                    return candidates
+        return np.array([i for i in candidates if q in self.keys[i]], dtype=np.int64)
+
+    def match_keys(self, query):
+        return self.keys[self.match_key_ids(query)]
+
+    def positions(self, name, query):
+        if name not in self._order:
+            return np.array([], dtype=np.int64)
+        key_ids = self.match_key_ids(query)
+        if len(key_ids) == 0:
+            return np.array([], dtype=np.int64)
+        order, bounds = self._order[name], self._bounds[name]
+        parts = [order[bounds[k]:bounds[k + 1]] for k in key_ids]
+        return np.sort(np.concatenate(parts))
+
+    def filter(self, name, query):
+        """Baris tabel `name` yang nobar-nya memuat `query` (urutan asli dipertahankan)."""
+        return self.tables[name].iloc[self.positions(name, query)]
+
+
+# ----------------------------------------------------
+# Cache index per proses
+# ----------------------------------------------------
+_INDEX_CACHE = {}
+_LOCK = threading.Lock()
+
+
+def get_index(tables):
+    """
+    Index untuk `tables`, dibangun ulang hanya jika salah satu DataFrame berganti
+    (data_loader mengembalikan objek yang sama selama file sumber tidak berubah).
+    """
+    signature = tuple(sorted((str(name), id(df)) for name, df in tables.items()))
+    with _LOCK:
+        cached = _INDEX_CACHE.get("current")
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        index = NobarIndex(tables)
+        # NobarIndex menyimpan referensi ke tabel, jadi id() di signature tetap valid
+        _INDEX_CACHE["current"] = (signature, index)
+        return index
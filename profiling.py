@@ -0,0 +1,226 @@
+"""
+Pengukuran waktu per tahap untuk satu request dashboard.
+
+Satu request (satu rerun halaman yang menampilkan hasil pencarian / banding)
+dibuka dengan start_request() dan ditutup dengan finish_request(), atau dengan
+`with request(...)` yang selalu menutupnya, juga saat error. Rerun fragment
+saja (@fragment_request) dicatat sebagai request tersendiri. Di antaranya,
+kode yang dibungkus `with stage(nama):` mencatat durasinya ke request yang
+sedang aktif di thread itu; di luar request, stage() tidak melakukan apa pun,
+jadi aman dipakai di modul hitung (item_search, item_compare, batch, benchmark).
+
+Tahap yang dipakai dashboard (STAGES): load, filter, aggregate, evaluate,
+style, chart. Setiap request ditambahkan sebagai satu baris JSON ke LOG_PATH
+untuk dianalisis lintas sesi:
+
+    python profiling.py              # ringkasan p50/p95 per tahap
+
+Opsional, satu request bisa direkam dengan cProfile (file .prof di
+PROFILE_DIR + ringkasan fungsi terlama untuk panel debug).
+"""
+import argparse
+import contextlib
+import contextvars
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import threading
+import time
+from datetime import datetime
+
+import data_loader
+
+STAGES = ("load", "filter", "aggregate", "evaluate", "style", "chart")
+# ROP_TIMING_LOG="" mematikan log
+LOG_PATH = os.environ.get("ROP_TIMING_LOG", os.path.join(data_loader.CACHE_DIR, "timing.jsonl"))
+PROFILE_DIR = os.path.join(data_loader.CACHE_DIR, "profiles")
+PROFILE_TOP = 25
+
+_CURRENT = contextvars.ContextVar("rop_request_timer", default=None)
+_LOG_LOCK = threading.Lock()
+# cProfile hanya bisa aktif satu per proses
+_PROFILE_LOCK = threading.Lock()
+
+
+# ----------------------------------------------------
+# Request & tahap
+# ----------------------------------------------------
+class RequestTimer:
+    """Durasi per tahap (detik, dijumlahkan jika tahap dipanggil beberapa kali) untuk satu request."""
+
+    def __init__(self, kind, profile=False, **meta):
+        self.kind = kind
+        self.meta = meta
+        self.stages = {}
+        self.started = time.perf_counter()
+        self.total = None
+        self.profiler = None
+        self.profile_path = None
+        self.profile_text = None
+        self.error = None
+        if profile and _PROFILE_LOCK.acquire(blocking=False):
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def add(self, name, seconds):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def record(self):
+        return {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "kind": self.kind,
+            **self.meta,
+            "total": round(self.total, 4),
+            "stages": {name: round(seconds, 4) for name, seconds in self.stages.items()},
+            "profile": self.profile_path,
+            "error": self.error,
+        }
+
+
+def start_request(kind, profile=False, **meta):
+    """Mulai request baru di thread ini; `meta` (query, tahun, sesi, ...) ikut dicatat di log."""
+    timer = RequestTimer(kind, profile, **meta)
+    _CURRENT.set(timer)
+    return timer
+
+
+def finish_request(timer):
+    """
+    Tutup request: lepas cProfile, simpan profil (jika direkam) dan tambahkan record
+    ke log. Hasil: record. Aman dipanggil lebih dari sekali (record yang sama).
+    """
+    if timer.total is not None:
+        return timer.record()
+    if _CURRENT.get() is timer:
+        _CURRENT.set(None)
+    timer.total = time.perf_counter() - timer.started
+    if timer.profiler is not None:
+        timer.profiler.disable()
+        _PROFILE_LOCK.release()
+        timer.profile_path, timer.profile_text = _save_profile(timer.profiler)
+    record = timer.record()
+    append_record(record)
+    return record
+
+
+@contextlib.contextmanager
+def request(kind, profile=False, **meta):
+    """
+    start_request() ... finish_request() yang selalu ditutup, juga jika blok gagal
+    (error dicatat di record lalu diteruskan). Hasil: timer.
+    """
+    timer = start_request(kind, profile, **meta)
+    try:
+        yield timer
+    except Exception as exc:
+        timer.error = f"{type(exc).__name__}: {exc}"
+        raise
+    finally:
+        finish_request(timer)
+
+
+def fragment_request(kind):
+    """
+    Decorator untuk fungsi @st.fragment. Saat fragment dijalankan ulang sendiri
+    (tanpa rerun halaman, jadi tanpa request aktif), rerun itu dicatat sebagai
+    request `kind` tersendiri; di dalam request halaman, tahapnya ikut request itu.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _CURRENT.get() is not None:
+                return func(*args, **kwargs)
+            with request(kind):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+@contextlib.contextmanager
+def stage(name):
+    """Catat durasi blok ke request aktif (tanpa request: tidak dicatat)."""
+    timer = _CURRENT.get()
+    if timer is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.add(name, time.perf_counter() - started)
+
+
+def breakdown(record):
+    """Tabel (tahap, detik, % total) dari satu record, termasuk waktu di luar tahap."""
+    import pandas as pd
+
+    stages = dict(record["stages"])
+    stages["lainnya"] = max(record["total"] - sum(stages.values()), 0.0)
+    table = pd.DataFrame({"tahap": list(stages), "detik": [round(s, 4) for s in stages.values()]})
+    table["% total"] = (100 * table["detik"] / record["total"]).round(1) if record["total"] else 0.0
+    return table
+
+
+# ----------------------------------------------------
+# Log & cProfile
+# ----------------------------------------------------
+def append_record(record, path=None):
+    path = LOG_PATH if path is None else path
+    if not path:
+        return
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with _LOG_LOCK, open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, default=str) + "\n")
+
+
+def _save_profile(profiler):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    path = os.path.join(PROFILE_DIR, datetime.now().strftime("%Y%m%d-%H%M%S-%f") + ".prof")
+    profiler.dump_stats(path)
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(PROFILE_TOP)
+    return path, out.getvalue()
+
+
+def read_log(path=None):
+    """Semua record di log sebagai DataFrame panjang (satu baris per request x tahap)."""
+    import pandas as pd
+
+    path = LOG_PATH if path is None else path
+    rows = []
+    if path and os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                for name, seconds in {**record["stages"], "total": record["total"]}.items():
+                    rows.append({"timestamp": record["timestamp"], "kind": record["kind"],
+                                 "stage": name, "seconds": seconds})
+    return pd.DataFrame(rows, columns=["timestamp", "kind", "stage", "seconds"])
+
+
+def summarize(log):
+    """Jumlah, p50, p95 dan maksimum detik per (jenis request, tahap)."""
+    grouped = log.groupby(["kind", "stage"])["seconds"]
+    return grouped.agg(
+        n="size", p50=lambda s: s.quantile(0.5), p95=lambda s: s.quantile(0.95), max="max"
+    ).round(4).reset_index()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ringkasan log waktu per tahap dashboard ROP")
+    parser.add_argument("--log", default=LOG_PATH, help="file log (default: %(default)s)")
+    args = parser.parse_args()
+    log = read_log(args.log)
+    if log.empty:
+        print(f"Belum ada record di {args.log}")
+        return
+    print(summarize(log).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
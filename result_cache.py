@@ -0,0 +1,65 @@
+"""
+Cache hasil per proses dengan batas jumlah entri (LRU) dan umur entri (TTL).
+
+Kunci selalu diawali versi data. Begitu entri dengan versi baru masuk, semua
+entri versi lama dibuang, jadi hasil lama tidak pernah tampil setelah workbook
+berubah. Nilai yang disimpan dipakai bersama oleh semua sesi dan harus
+diperlakukan read-only.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResultCache:
+    def __init__(self, max_entries=128, ttl_seconds=3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # {(version, ...): (waktu simpan, nilai)}
+        self._version = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _expired(self, stored_at):
+        return self.ttl_seconds is not None and time.monotonic() - stored_at > self.ttl_seconds
+
+    def get(self, key):
+        """Nilai untuk `key`, atau None jika tidak ada / sudah kedaluwarsa."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._expired(entry[0]):
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value):
+        with self._lock:
+            version = key[0]
+            if version != self._version:
+                # Data berubah: hasil versi lama tidak valid lagi
+                self._entries.clear()
+                self._version = version
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._version = None
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
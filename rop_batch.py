@@ -0,0 +1,227 @@
+"""
+CLI batch: evaluasi ROP untuk seluruh katalog barang tanpa membuka dashboard.
+
+Contoh:
+    python rop_batch.py --output laporan_rop.xlsx
+    python rop_batch.py --output laporan_rop.parquet --years 2023 2024 --workers 4
+    python rop_batch.py --output laporan_rop.csv --top 50
+    python rop_batch.py --output laporan_rop.csv --what-if 2024:1.2:0 2024:1:7
+
+Ingestion dan rumus sama dengan streamlit_app.py (data_loader, usage_cube,
+rop_engine). Katalog dipecah per chunk nobar, dihitung paralel di beberapa
+proses, lalu ditulis bertahap ke file output. Di akhir ditampilkan barang
+dengan selisih terbesar antara ROP hitungan dan `Rop Existing`.
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import data_loader
+import lead_time_scenarios
+import rop_engine
+import usage_cube
+
+OUTPUT_FORMATS = ("csv", "parquet", "xlsx")
+# Batas baris per sheet Excel; sisanya diteruskan ke sheet berikutnya
+EXCEL_MAX_ROWS = 1048576
+
+# Lead time untuk worker proses (di-set sekali lewat initializer)
+_WORKER_LEAD_TIMES = None
+
+
+def _init_worker(what_ifs=()):
+    # Worker membuka file Arrow bersama (memory map), bukan menerima salinan pickle
+    global _WORKER_LEAD_TIMES
+    _WORKER_LEAD_TIMES = lead_time_scenarios.scenario_tables(data_loader.load_lead_times(), what_ifs)
+
+
+def _evaluate_chunk(usage_chunk):
+    return rop_engine.evaluate_catalogue(usage_chunk, _WORKER_LEAD_TIMES)
+
+
+# ----------------------------------------------------
+# Barang dengan deviasi terbesar
+# ----------------------------------------------------
+def _top_deviations(df, top):
+    ranked = df.dropna(subset=["selisih_rop"])
+    order = ranked["selisih_rop"].abs().sort_values(ascending=False, kind="stable").index[:top]
+    return ranked.loc[order]
+
+
+# ----------------------------------------------------
+# Writer bertahap per format
+# ----------------------------------------------------
+class ChunkWriter:
+    def __init__(self, path, fmt, sheet_name="Evaluasi ROP"):
+        self.path = path
+        self.fmt = fmt
+        self.sheet_name = sheet_name
+        self._parquet = None
+        self._excel = None
+        self._sheet = None
+        self._sheet_rows = 0
+        self._sheets = 0
+        self._rows = 0
+
+    def write(self, df):
+        if self.fmt == "csv":
+            df.to_csv(self.path, mode="w" if self._rows == 0 else "a",
+                      header=self._rows == 0, index=False)
+        elif self.fmt == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            # Label lead time campuran (2024 & "2024 x1.2") ditulis sebagai teks
+            table = pa.Table.from_pandas(data_loader.arrow_safe(df), preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.path, table.schema)
+            self._parquet.write_table(table.cast(self._parquet.schema))
+        else:
+            for row in _excel_rows(df):
+                if self._sheet is None or self._sheet_rows >= EXCEL_MAX_ROWS:
+                    self._sheets += 1
+                    suffix = f" ({self._sheets})" if self._sheets > 1 else ""
+                    self._sheet = self._new_sheet(self.sheet_name + suffix, df.columns)
+                    self._sheet_rows = 1
+                self._sheet.append(row)
+                self._sheet_rows += 1
+        self._rows += len(df)
+
+    def _new_sheet(self, name, columns):
+        # openpyxl write-only: baris langsung ditulis ke file sementara, tidak ditahan di memori
+        if self._excel is None:
+            from openpyxl import Workbook
+            self._excel = Workbook(write_only=True)
+        sheet = self._excel.create_sheet(name)
+        sheet.append([str(c) for c in columns])
+        return sheet
+
+    def write_sheet(self, name, df):
+        # Sheet tambahan hanya untuk XLSX
+        if self.fmt == "xlsx":
+            sheet = self._new_sheet(name, df.columns)
+            for row in _excel_rows(df):
+                sheet.append(row)
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+        if self._excel is not None:
+            self._excel.save(self.path)
+
+
+def _excel_rows(df):
+    # Nilai Python biasa; NaN/NA jadi sel kosong
+    return df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+
+
+def _chunks(usage_table, chunk_size):
+    # Baris dikelompokkan per nobar sekali (argsort stabil), lalu diiris per blok nobar
+    if usage_table.empty:
+        return
+    codes = pd.factorize(usage_table["nobar"])[0]
+    order = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[order], np.arange(0, codes.max() + chunk_size + 1, chunk_size))
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        if end > start:
+            yield usage_table.iloc[order[start:end]]
+
+
+def evaluate_chunks(usage_table, lead_times, rop_existing, workers=1, chunk_size=500, what_ifs=()):
+    """
+    Hasil evaluasi + selisih dengan ROP Existing per chunk nobar (generator), jadi
+    katalog besar bisa ditulis bertahap tanpa menahan seluruh hasil di memori.
+    Dengan workers > 1 chunk dihitung paralel di beberapa proses.
+    """
+    chunks = _chunks(usage_table, chunk_size)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(tuple(what_ifs),)) as pool:
+            for part in pool.map(_evaluate_chunk, chunks):
+                yield rop_engine.compare_with_existing(part, rop_existing)
+    else:
+        for chunk in chunks:
+            yield rop_engine.compare_with_existing(rop_engine.evaluate_catalogue(chunk, lead_times), rop_existing)
+
+
+def _resolve_format(path, fmt):
+    fmt = fmt or os.path.splitext(path)[1].lstrip(".").lower()
+    if fmt not in OUTPUT_FORMATS:
+        raise SystemExit(f"Format output tidak dikenal: {fmt!r} (pilih {', '.join(OUTPUT_FORMATS)})")
+    return fmt
+
+
+# ----------------------------------------------------
+# Main
+# ----------------------------------------------------
+def parse_what_if(text):
+    """'BASE:FAKTOR:HARI' (mis. 2024:1.2:0) -> (base, faktor, hari); base tahun jadi int."""
+    base, factor, extra_days = text.rsplit(":", 2)
+    return (int(base) if base.isdigit() else base), float(factor), float(extra_days)
+
+
+def run(output, fmt=None, years=None, workers=None, chunk_size=500, top=20, log=print, what_ifs=()):
+    fmt = _resolve_format(output, fmt)
+    started = time.perf_counter()
+
+    data = data_loader.load_transactions()
+    lead_times = lead_time_scenarios.scenario_tables(data_loader.load_lead_times(), what_ifs)
+    rop_existing = data_loader.load_rop_existing()
+    cube = usage_cube.get_cube(data, data_loader.transaction_version(), data_loader.last_changes(),
+                               data_loader.source_versions())
+
+    report = data_loader.ingest_report(data)
+    failed = int(report["tanggal_gagal"].sum() + report["jumlah_gagal"].sum())
+    if failed:
+        log(f"Peringatan: {failed} baris transaksi gagal di-parse dan diabaikan")
+
+    years = list(years) if years else list(data.keys())
+    cells = cube.cells[cube.cells["source_year"].isin(years)]
+    usage_table = rop_engine.yearly_usage_table(cells, years)
+    log(f"{usage_table['nobar'].nunique()} barang x {len(years)} tahun x {len(lead_times)} lead time")
+
+    workers = workers or os.cpu_count() or 1
+    writer = ChunkWriter(output, fmt)
+    top_parts = []
+    try:
+        for part in evaluate_chunks(usage_table, lead_times, rop_existing, workers, chunk_size, what_ifs):
+            writer.write(part)
+            top_parts.append(_top_deviations(part, top))
+
+        top_deviations = _top_deviations(pd.concat(top_parts, ignore_index=True), top) \
+            if top_parts else pd.DataFrame()
+        writer.write_sheet("Deviasi Terbesar", top_deviations)
+    finally:
+        writer.close()
+
+    log(f"Selesai dalam {time.perf_counter() - started:.2f} detik -> {output}")
+    return top_deviations
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluasi ROP seluruh katalog warehouse.")
+    parser.add_argument("--output", "-o", required=True, help="File output (.csv, .parquet, .xlsx)")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, help="Paksa format output")
+    parser.add_argument("--years", type=int, nargs="+", help="Tahun transaksi (default semua)")
+    parser.add_argument("--workers", type=int, default=None, help="Jumlah proses (default jumlah CPU)")
+    parser.add_argument("--chunk-size", type=int, default=500, help="Jumlah nobar per chunk")
+    parser.add_argument("--top", type=int, default=20, help="Jumlah barang deviasi terbesar yang ditampilkan")
+    parser.add_argument("--what-if", nargs="+", default=[], type=parse_what_if, metavar="BASE:FAKTOR:HARI",
+                        help="Skenario lead time tambahan, mis. 2024:1.2:0 (lead time 2024 x1.2)")
+    args = parser.parse_args(argv)
+
+    top_deviations = run(args.output, args.format, args.years, args.workers, args.chunk_size, args.top,
+                         what_ifs=args.what_if)
+    if len(top_deviations):
+        cols = ["nobar", "lead_time", "year", "usage", "rop", "Rop Existing", "selisih_rop", "deviasi_pct"]
+        print("\nBarang dengan deviasi ROP terbesar:")
+        print(top_deviations[cols].to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""
+Mesin evaluasi level order (ROP, Min Stock, Order Qty, Max Stock).
+
+Rumus sama dengan kartu "Evaluasi Level Order" di dashboard, tetapi
+dihitung dengan NumPy untuk banyak barang dan tahun sekaligus:
+
+    pakai per hari (avg) = pemakaian 1 th / 12 / 4.29 / 7
+    pakai per hari (min) = avg * 0.5
+    pakai per hari (max) = avg * 1.5
+    ROP        = round(max * lead_time_maximal)
+    Min Stock  = ROP - round(avg * lead_time_avg)
+    Order Qty  = round((ROP - round(avg * lead_time_avg)) * 2)
+    Max Stock  = round(ROP + Order Qty - round(min * lead_time_minimal))
+
+Pembulatan memakai np.round (half-to-even), sama seperti round() Python.
+Sebagai alternatif pembagi tetap, measured_daily_usage memakai statistik
+permintaan terukur dari demand_stats.
+"""
+import numpy as np
+import pandas as pd
+
+BULAN_PER_TAHUN = 12
+MINGGU_PER_BULAN = 4.29
+HARI_PER_MINGGU = 7
+FAKTOR_MIN = 0.5
+FAKTOR_MAX = 1.5
+
+LEAD_TIME_COLUMNS = ["lead_time_minimal", "lead_time_avg", "lead_time_maximal"]
+
+
+# ----------------------------------------------------
+# Rumus dasar (vektor)
+# ----------------------------------------------------
+def daily_usage(usage):
+    """Turunan pemakaian dari total 1 tahun: dict berisi array per bulan/minggu/hari."""
+    usage = np.asarray(usage, dtype=float)
+    per_bulan = usage / BULAN_PER_TAHUN
+    per_minggu = per_bulan / MINGGU_PER_BULAN
+    per_hari_avg = per_minggu / HARI_PER_MINGGU
+    return {
+        "per_bulan": per_bulan,
+        "per_minggu": per_minggu,
+        "per_hari_avg": per_hari_avg,
+        "per_hari_min": per_hari_avg * FAKTOR_MIN,
+        "per_hari_max": per_hari_avg * FAKTOR_MAX,
+    }
+
+
+def measured_daily_usage(usage, harian_mean, mingguan_mean, mingguan_low, mingguan_high):
+    """
+    Seperti daily_usage, tetapi dari statistik permintaan terukur (demand_stats):
+    avg = rata-rata harian sebenarnya, min/max = minggu sepi/ramai (P10/P90) per hari.
+    """
+    usage = np.asarray(usage, dtype=float)
+    per_hari_avg = np.asarray(harian_mean, dtype=float)
+    return {
+        "per_bulan": usage / BULAN_PER_TAHUN,
+        "per_minggu": np.asarray(mingguan_mean, dtype=float),
+        "per_hari_avg": per_hari_avg,
+        "per_hari_min": np.minimum(per_hari_avg, np.asarray(mingguan_low, dtype=float) / HARI_PER_MINGGU),
+        "per_hari_max": np.maximum(per_hari_avg, np.asarray(mingguan_high, dtype=float) / HARI_PER_MINGGU),
+    }
+
+
+def order_levels(per_hari_avg, per_hari_min, per_hari_max, lt_min, lt_avg, lt_max):
+    """ROP / Min Stock / Order Qty / Max Stock untuk array pemakaian harian dan lead time."""
+    per_hari_avg = np.asarray(per_hari_avg, dtype=float)
+    lt_min = np.nan_to_num(np.asarray(lt_min, dtype=float))
+    lt_avg = np.nan_to_num(np.asarray(lt_avg, dtype=float))
+    lt_max = np.nan_to_num(np.asarray(lt_max, dtype=float))
+
+    rop = np.round(np.asarray(per_hari_max, dtype=float) * lt_max)
+    pakai_lead_time = np.round(per_hari_avg * lt_avg)
+    min_stock = rop - pakai_lead_time
+    order_qty = np.round(min_stock * 2)
+    max_stock = np.round(rop + order_qty - np.round(np.asarray(per_hari_min, dtype=float) * lt_min))
+    return {
+        "rop": rop.astype(np.int64),
+        "min_stock": min_stock.astype(np.int64),
+        "order_qty": order_qty.astype(np.int64),
+        "max_stock": max_stock.astype(np.int64),
+    }
+
+
+def evaluate_usage(usage, lt_min, lt_avg, lt_max):
+    """Gabungan daily_usage + order_levels untuk satu set pemakaian tahunan."""
+    daily = daily_usage(usage)
+    levels = order_levels(daily["per_hari_avg"], daily["per_hari_min"], daily["per_hari_max"],
+                          lt_min, lt_avg, lt_max)
+    return {**daily, **levels}
+
+
+# ----------------------------------------------------
+# Evaluasi seluruh katalog
+# ----------------------------------------------------
+def yearly_usage_table(cells, years=None):
+    """Tabel (nobar, year, usage) dari sel usage cube; nobar tanpa pemakaian di suatu tahun bernilai 0."""
+    if years is not None:
+        cells = cells[cells["year"].isin(list(years))]
+    usage = cells.groupby(["nobar", "year"])["jumlah"].sum()
+    if years is not None and len(usage):
+        # Lengkapi kombinasi nobar x tahun yang tidak punya transaksi
+        full = pd.MultiIndex.from_product([usage.index.levels[0], list(years)], names=["nobar", "year"])
+        usage = usage.reindex(full, fill_value=0.0)
+    return usage.rename("usage").reset_index()
+
+
+def first_lead_time(lead_time_df):
+    """Satu baris lead time per nobar (baris pertama, sama seperti iloc[0] di dashboard)."""
+    lt = lead_time_df[["nobar"] + LEAD_TIME_COLUMNS].copy()
+    lt["nobar"] = lt["nobar"].astype(str)
+    return lt.drop_duplicates("nobar", keep="first")
+
+
+def evaluate_catalogue(usage_table, lead_times):
+    """
+    Evaluasi semua nobar x tahun untuk setiap tabel lead time (skenario).
+
+    usage_table: hasil yearly_usage_table (kolom nobar, year, usage)
+    lead_times:  {label: DataFrame lead time}, mis. {2024: Book1, 2023: Book2}
+
+    Lead time semua skenario digabung ke usage_table sekali (tabel lebar), lalu
+    level order semua baris x skenario dihitung dengan satu order_levels.
+    Hasilnya tabel rapi dengan satu baris per (lead_time, nobar, year).
+    Barang tanpa data lead time dihitung dengan lead time 0, seperti dashboard.
+    """
+    labels = list(lead_times)
+    if not labels:
+        return pd.DataFrame()
+
+    wide = None
+    for i, label in enumerate(labels):
+        lt = first_lead_time(lead_times[label]).rename(columns={c: f"{c}#{i}" for c in LEAD_TIME_COLUMNS})
+        wide = lt if wide is None else wide.merge(lt, on="nobar", how="outer")
+    merged = usage_table.merge(wide, on="nobar", how="left")
+    lt_values = {c: np.column_stack([merged[f"{c}#{i}"].to_numpy(dtype=float) for i in range(len(labels))])
+                 for c in LEAD_TIME_COLUMNS}
+
+    daily = daily_usage(merged["usage"].to_numpy())
+    levels = order_levels(daily["per_hari_avg"][:, None], daily["per_hari_min"][:, None],
+                          daily["per_hari_max"][:, None], lt_values["lead_time_minimal"],
+                          lt_values["lead_time_avg"], lt_values["lead_time_maximal"])
+
+    frames = []
+    for i, label in enumerate(labels):
+        frame = usage_table.copy()
+        for c in LEAD_TIME_COLUMNS:
+            frame[c] = np.nan_to_num(lt_values[c][:, i])
+        frame["lead_time_found"] = ~np.isnan(lt_values["lead_time_maximal"][:, i])
+        for key, values in daily.items():
+            frame[key] = values
+        for key, values in levels.items():
+            frame[key] = values[:, i]
+        frame.insert(0, "lead_time", label)
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+
+def compare_with_existing(result, rop_existing):
+    """Tambah kolom Rop Existing, selisih_rop dan deviasi_pct (%) ke hasil evaluate_catalogue."""
+    existing = rop_existing[["nobar", "Rop Existing"]].copy()
+    existing["nobar"] = existing["nobar"].astype(str)
+    existing = existing.drop_duplicates("nobar", keep="first")
+    merged = result.merge(existing, on="nobar", how="left")
+    merged["selisih_rop"] = merged["rop"] - merged["Rop Existing"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        merged["deviasi_pct"] = np.where(
+            merged["Rop Existing"] > 0,
+            merged["selisih_rop"] / merged["Rop Existing"] * 100,
+            np.nan,
+        )
+    return merged
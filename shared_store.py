@@ -0,0 +1,115 @@
+"""
+Store tabel bersama berbasis file Arrow IPC yang di-memory-map.
+
+Tabel yang sudah siap pakai (transaksi ringkas, lead time, ROP existing,
+movement status) ditulis sekali per versi data ke folder cache sebagai file
+Arrow tanpa kompresi. Setiap proses (server Streamlit, worker rop_batch, dst.)
+membukanya lewat memory map, sehingga buffer kolom numerik dibaca langsung dari
+page cache OS yang dipakai bersama, bukan disalin per sesi atau per proses.
+Di dalam satu proses tabel dibuka sekali dan dipakai read-only oleh semua sesi.
+"""
+import glob
+import os
+import threading
+
+# Cache per proses: {name: (version, DataFrame)}
+_OPENED = {}
+_LOCK = threading.Lock()
+
+
+def _table_path(shared_dir, name, version):
+    safe_name = str(name).replace(" ", "_")
+    return os.path.join(shared_dir, f"{safe_name}-{version}.arrow")
+
+
+def publish(df, name, version, shared_dir):
+    """Tulis `df` sebagai file Arrow IPC untuk versi data `version`."""
+    import pyarrow as pa
+
+    os.makedirs(shared_dir, exist_ok=True)
+    path = _table_path(shared_dir, name, version)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+
+    # Versi lama tidak dipakai lagi (proses yang masih memetakannya tetap aman di Linux)
+    for old in glob.glob(_table_path(shared_dir, name, "*")):
+        if old != path:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+    return path
+
+
+def open_mapped(path):
+    """Buka file Arrow IPC lewat memory map dan kembalikan sebagai DataFrame."""
+    import pyarrow as pa
+
+    source = pa.memory_map(path, "r")
+    table = pa.ipc.open_file(source).read_all()
+    # split_blocks menghindari konsolidasi blok, jadi kolom numerik tanpa null
+    # tetap menunjuk ke buffer yang di-memory-map (tanpa salinan)
+    return table.to_pandas(split_blocks=True)
+
+
+def open_published(name, version, shared_dir):
+    """File Arrow yang sudah dipublikasikan untuk (`name`, `version`), atau None."""
+    path = _table_path(shared_dir, name, version)
+    if not os.path.exists(path):
+        return None
+    try:
+        return open_mapped(path)
+    except (OSError, ImportError, ValueError):
+        return None
+
+
+def get_shared(name, version, build, shared_dir):
+    """
+    DataFrame bersama untuk (`name`, `version`). Urutannya: cache proses ->
+    file Arrow yang sudah dipublikasikan proses lain -> build() lalu publish.
+    Jika pyarrow/IO gagal, hasil build() dipakai langsung dari memori.
+    """
+    with _LOCK:
+        opened = _OPENED.get(name)
+        if opened is not None and opened[0] == version:
+            return opened[1]
+
+        df = open_published(name, version, shared_dir)
+        if df is None:
+            built = build()
+            try:
+                df = open_mapped(publish(built, name, version, shared_dir))
+            except (OSError, ImportError, ValueError):
+                df = built
+
+        _OPENED[name] = (version, df)
+        return df
+
+
+def clear():
+    with _LOCK:
+        _OPENED.clear()
+
+
+# ----------------------------------------------------
+# Pengukuran memori proses
+# ----------------------------------------------------
+def rss_bytes():
+    """Resident set size proses saat ini (bytes), atau None jika tidak tersedia."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        # ru_maxrss: puncak RSS, KB di Linux / bytes di macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if os.uname().sysname == "Darwin" else peak * 1024
+    except (ImportError, AttributeError):
+        return None
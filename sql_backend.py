@@ -0,0 +1,200 @@
+"""
+Backend SQL opsional (SQLite, bawaan Python) untuk data transaksi.
+
+Store transaksi dimuat ke database lokal dengan index pada (nobar_key, tanggal)
+dan (nobar_key, year, month). Filter pencarian (nobar, tahun, bulan), total per
+tahun dan groupby per bulan dijalankan sebagai query SQL, sehingga waktu query
+tidak ikut naik saat tahun atau site bertambah.
+
+Aktifkan dengan environment variable ROP_BACKEND=sqlite. Objek backend punya
+method slice() yang sama dengan usage_cube.UsageCube, jadi dashboard tidak
+perlu tahu backend mana yang dipakai.
+"""
+import os
+import re
+import sqlite3
+import threading
+
+import pandas as pd
+
+from nobar_index import is_regex
+from usage_cube import CUBE_COLUMNS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS transaksi (
+    source_year INTEGER NOT NULL,
+    tanggal     TEXT,
+    year        INTEGER,
+    month       INTEGER,
+    nobar       TEXT,
+    nobar_key   TEXT,
+    nabar       TEXT,
+    satuan      TEXT,
+    jumlah      REAL
+);
+CREATE TABLE IF NOT EXISTS items (nobar_key TEXT PRIMARY KEY);
+"""
+INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_transaksi_nobar_tanggal ON transaksi (nobar_key, tanggal);
+CREATE INDEX IF NOT EXISTS idx_transaksi_nobar_periode ON transaksi (nobar_key, year, month, source_year);
+CREATE INDEX IF NOT EXISTS idx_transaksi_source_year ON transaksi (source_year);
+"""
+
+
+def _regexp(pattern, value):
+    return value is not None and re.search(pattern, value, re.IGNORECASE) is not None
+
+
+def _placeholders(values):
+    return ",".join("?" * len(values))
+
+
+class SqlUsageBackend:
+    def __init__(self, db_path, version):
+        self.db_path = db_path
+        self.version = version
+        self._local = threading.local()
+
+    # Satu koneksi per thread (sesi Streamlit berjalan di thread berbeda)
+    def connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path)
+            conn.create_function("REGEXP", 2, _regexp, deterministic=True)
+            self._local.conn = conn
+        return conn
+
+    # ------------------------------------------------
+    # Build
+    # ------------------------------------------------
+    def stored_version(self):
+        if not os.path.exists(self.db_path):
+            return None
+        try:
+            row = self.connection().execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        except sqlite3.Error:
+            return None
+        return row[0] if row is not None else None
+
+    def is_current(self):
+        return self.stored_version() == self.version
+
+    def load(self, store):
+        conn = self.connection()
+        conn.executescript("DROP TABLE IF EXISTS transaksi; DROP TABLE IF EXISTS items; DROP TABLE IF EXISTS meta;")
+        conn.executescript(SCHEMA)
+        self._insert(store)
+        with conn:
+            conn.executescript(INDEXES)
+
+    def update(self, store, changes, version):
+        """
+        Terapkan perubahan ingest (data_loader.last_changes()) ke database: tahun
+        sumber di `changes["replaced"]` (file baru, diedit atau dihapus, termasuk
+        tahun yang baru dimuat) dihapus lalu diisi dari `store`, dan baris tambahan
+        di `changes["appended"]` di-insert. Tahun lain dan index tidak disentuh.
+        """
+        conn = self.connection()
+        with conn:
+            conn.executescript(INDEXES)
+        replaced = sorted(int(y) for y in changes.get("replaced", ()))
+        if replaced:
+            with conn:
+                conn.execute(f"DELETE FROM transaksi WHERE source_year IN ({_placeholders(replaced)})", replaced)
+                conn.execute("DELETE FROM items WHERE nobar_key NOT IN (SELECT nobar_key FROM transaksi)")
+        parts = [store[store["source_year"].astype(int).isin(replaced)]]
+        parts += list(changes.get("appended", {}).values())
+        self.version = version
+        self._insert(pd.concat(parts, ignore_index=True))
+
+    def _insert(self, store):
+        conn = self.connection()
+        rows = pd.DataFrame({
+            "source_year": store["source_year"].astype(int),
+            "tanggal": store["tanggal"].dt.strftime("%Y-%m-%d"),
+            "year": store["year"].astype("float64"),
+            "month": store["month"].astype("float64"),
+            "nobar": store["nobar"].astype(str),
+            "nobar_key": store["nobar"].astype(str).str.lower(),
+            "nabar": store["nabar"].astype(str),
+            "satuan": store["satuan"].astype(str),
+            "jumlah": store["jumlah"].astype("float64"),
+        })
+        rows = rows.astype(object).where(rows.notna(), None)
+        with conn:
+            conn.executemany(
+                "INSERT INTO transaksi VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows.itertuples(index=False, name=None),
+            )
+            conn.executemany("INSERT OR IGNORE INTO items VALUES (?)",
+                             ((key,) for key in rows["nobar_key"].dropna().unique()))
+            conn.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (self.version,))
+
+    # ------------------------------------------------
+    # Query
+    # ------------------------------------------------
+    def match_keys(self, query):
+        """nobar_key yang memuat `query` (substring / regex, tidak peka huruf besar)."""
+        if is_regex(query):
+            sql, params = "SELECT nobar_key FROM items WHERE nobar_key REGEXP ?", (str(query),)
+        else:
+            sql, params = "SELECT nobar_key FROM items WHERE instr(nobar_key, ?) > 0", (str(query).lower(),)
+        return [row[0] for row in self.connection().execute(sql, params)]
+
+    def slice(self, nobar_keys, source_years=None, month_indices=None):
+        """Total jumlah & jumlah transaksi per (source_year, nobar, year, month), dihitung di SQL."""
+        keys = list(nobar_keys)
+        if not keys:
+            return pd.DataFrame(columns=CUBE_COLUMNS)
+        return self._cells([f"nobar_key IN ({_placeholders(keys)})"], keys, source_years, month_indices)
+
+    def catalogue_cells(self, source_years=None):
+        """Sel semua barang (seperti UsageCube.catalogue_cells) untuk tahun sumber terpilih."""
+        return self._cells([], [], source_years)
+
+    def _cells(self, where, params, source_years=None, month_indices=None):
+        where = where + ["year IS NOT NULL", "month IS NOT NULL"]
+        if source_years is not None:
+            source_years = [int(y) for y in source_years]
+            where.append(f"source_year IN ({_placeholders(source_years)})")
+            params = params + source_years
+        if month_indices is not None:
+            month_indices = [int(m) for m in month_indices]
+            where.append(f"month IN ({_placeholders(month_indices)})")
+            params = params + month_indices
+        sql = (
+            "SELECT source_year, nobar, nobar_key, year, month, SUM(jumlah) AS jumlah, COUNT(*) AS count "
+            "FROM transaksi WHERE " + " AND ".join(where) +
+            " GROUP BY source_year, nobar, nobar_key, year, month"
+        )
+        cells = pd.read_sql_query(sql, self.connection(), params=params)
+        return cells[CUBE_COLUMNS]
+
+
+# ----------------------------------------------------
+# Cache backend per proses
+# ----------------------------------------------------
+_BACKEND = {"version": None, "backend": None}
+_LOCK = threading.Lock()
+
+
+def get_backend(store, version, db_path, changes=None):
+    """
+    Backend SQLite untuk versi data `version`. Jika `changes` (data_loader.last_changes())
+    berasal dari versi yang tersimpan di database, hanya tahun sumber yang berubah
+    yang diperbarui (lihat SqlUsageBackend.update); selain itu database dibangun ulang.
+    """
+    with _LOCK:
+        if _BACKEND["version"] == version:
+            return _BACKEND["backend"]
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        backend = SqlUsageBackend(db_path, version)
+        stored = backend.stored_version()
+        if stored != version:
+            if changes and stored is not None and changes.get("base_version") == stored:
+                backend.update(store, changes, version)
+            else:
+                backend.load(store)
+        _BACKEND.update(version=version, backend=backend)
+        return backend
@@ -0,0 +1,295 @@
+"""
+Simulasi Monte Carlo stockout untuk kebijakan ROP (dashboard atau CLI).
+
+Setiap barang disimulasikan harian selama `horizon` hari pada ribuan percobaan
+sekaligus (array NumPy barang x percobaan), untuk dua kebijakan dengan angka
+acak yang sama:
+
+- "ROP Existing": pesan Order Qty saat stok + pesanan <= Rop Existing,
+- "ROP Hitungan": pesan Order Qty saat stok + pesanan <= ROP hasil rumus.
+
+Permintaan harian: hari ada transaksi dengan peluang harian_aktif / hari,
+besarnya berdistribusi gamma dengan rata-rata dan variansi dari demand_stats.
+Lead time per pesanan: segitiga (lead_time_minimal, lead_time_avg,
+lead_time_maximal). Permintaan yang tidak terpenuhi hilang (lost sales) dan
+paling banyak satu pesanan berjalan per barang. Stok awal = ROP + Order Qty.
+
+Contoh CLI:
+    python stockout_sim.py --output simulasi.csv --year 2024 --lead-time 2024
+    python stockout_sim.py --output simulasi.csv --trials 2000 --workers 4
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import data_loader
+import demand_stats
+import rop_engine
+import usage_cube
+
+POLICIES = ("ROP Existing", "ROP Hitungan")
+TRIALS = 1000
+HORIZON = 365
+PARAM_COLUMNS = ["harian_mean", "harian_std", "harian_aktif", "hari",
+                 "lead_time_minimal", "lead_time_avg", "lead_time_maximal",
+                 "rop_existing", "rop", "order_qty"]
+
+
+# ----------------------------------------------------
+# Model permintaan & lead time
+# ----------------------------------------------------
+def demand_model(harian_mean, harian_std, harian_aktif, hari):
+    """Peluang hari ada permintaan + parameter gamma (shape, scale) besar permintaannya."""
+    mean = np.nan_to_num(np.asarray(harian_mean, dtype=float))
+    std = np.nan_to_num(np.asarray(harian_std, dtype=float))
+    hari = np.maximum(np.asarray(hari, dtype=float), 1.0)
+    p = np.clip(np.nan_to_num(np.asarray(harian_aktif, dtype=float)) / hari, 0.0, 1.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        active_mean = np.where(p > 0, mean / p, 0.0)
+        second_moment = (std ** 2 * np.maximum(hari - 1, 0) / hari + mean ** 2)
+        active_var = np.where(p > 0, second_moment / p - active_mean ** 2, 0.0)
+        active_var = np.maximum(active_var, 1e-9)
+        shape = np.where(active_mean > 0, active_mean ** 2 / active_var, 1.0)
+        scale = np.where(active_mean > 0, active_var / active_mean, 0.0)
+    return p, shape, scale
+
+
+def triangular(rng, left, mode, right):
+    """Sampel distribusi segitiga; aman untuk left == right (nilai konstan)."""
+    left = np.asarray(left, dtype=float)
+    right = np.maximum(np.asarray(right, dtype=float), left)
+    mode = np.clip(np.asarray(mode, dtype=float), left, right)
+    u = rng.random(left.shape)
+    width = right - left
+    with np.errstate(divide="ignore", invalid="ignore"):
+        c = np.where(width > 0, (mode - left) / width, 0.0)
+        low = left + np.sqrt(u * width * (mode - left))
+        high = right - np.sqrt((1 - u) * width * (right - mode))
+    return np.where(u < c, low, high)
+
+
+# ----------------------------------------------------
+# Simulasi (vektor: kebijakan x barang x percobaan)
+# ----------------------------------------------------
+def simulate_arrays(params, trials=TRIALS, horizon=HORIZON, seed=0):
+    """
+    Simulasi untuk dict array per barang (PARAM_COLUMNS). Hasilnya dict array
+    berbentuk (kebijakan, barang): peluang_stockout, hari_stockout_pct,
+    rata_rata_stok, fill_rate.
+    """
+    rng = np.random.default_rng(seed)
+    n = len(params["rop"])
+    p, shape, scale = demand_model(params["harian_mean"], params["harian_std"],
+                                   params["harian_aktif"], params["hari"])
+    lt = [np.nan_to_num(np.asarray(params[c], dtype=float))
+          for c in ("lead_time_minimal", "lead_time_avg", "lead_time_maximal")]
+    order_qty = np.maximum(np.nan_to_num(np.asarray(params["order_qty"], dtype=float)), 0.0)
+    rop = np.stack([np.nan_to_num(np.asarray(params["rop_existing"], dtype=float)),
+                    np.nan_to_num(np.asarray(params["rop"], dtype=float))])
+
+    # Bentuk state: (kebijakan, barang, percobaan)
+    full = (len(POLICIES), n, trials)
+    rop_b = np.broadcast_to(rop[:, :, None], full).astype(np.float32)
+    qty_b = np.broadcast_to(order_qty[None, :, None], full).astype(np.float32)
+    on_hand = (rop_b + qty_b).copy()
+    on_order = np.zeros(full, dtype=np.float32)
+    arrival = np.full(full, -1, dtype=np.int32)
+    stockout_days = np.zeros(full, dtype=np.int32)
+    inventory = np.zeros(full, dtype=np.float64)
+    served = np.zeros(full, dtype=np.float64)
+    demanded = np.zeros((n, trials), dtype=np.float64)
+
+    p_b = p[:, None].astype(np.float32)
+    shape_b = np.broadcast_to(shape[:, None], (n, trials))
+    scale_b = scale[:, None].astype(np.float32)
+    lt_b = [np.broadcast_to(x[None, :, None], full) for x in lt]
+
+    for day in range(horizon):
+        # Pesanan yang tiba hari ini
+        arrived = arrival == day
+        on_hand += np.where(arrived, on_order, 0.0)
+        on_order[arrived] = 0.0
+
+        # Permintaan hari ini (sama untuk kedua kebijakan)
+        active = rng.random((n, trials), dtype=np.float32) < p_b
+        demand = np.where(active, rng.standard_gamma(shape_b, dtype=np.float32) * scale_b, 0.0)
+        demanded += demand
+        sold = np.minimum(on_hand, demand[None])
+        served += sold
+        stockout_days += (demand[None] - sold) > 1e-6
+        on_hand -= sold
+        inventory += on_hand
+
+        # Pesan ulang jika posisi stok <= ROP dan tidak ada pesanan berjalan
+        reorder = (on_hand + on_order <= rop_b) & (on_order == 0) & (qty_b > 0)
+        if reorder.any():
+            idx = np.nonzero(reorder)
+            lead = triangular(rng, lt_b[0][idx], lt_b[1][idx], lt_b[2][idx])
+            on_order[idx] = qty_b[idx]
+            arrival[idx] = day + np.maximum(np.ceil(lead), 1).astype(np.int32)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fill = np.where(demanded[None] > 0, served / demanded[None], 1.0)
+    return {
+        "peluang_stockout": (stockout_days > 0).mean(axis=2),
+        "hari_stockout_pct": stockout_days.mean(axis=2) / horizon * 100,
+        "rata_rata_stok": (inventory / horizon).mean(axis=2),
+        "fill_rate": fill.mean(axis=2),
+    }
+
+
+def _simulate_chunk(args):
+    chunk, trials, horizon, seed = args
+    params = {c: chunk[c].to_numpy() for c in PARAM_COLUMNS}
+    result = simulate_arrays(params, trials, horizon, seed)
+    frames = []
+    for i, policy in enumerate(POLICIES):
+        part = chunk[["nobar"]].copy()
+        part.insert(1, "kebijakan", policy)
+        part["rop"] = chunk["rop_existing" if i == 0 else "rop"].to_numpy()
+        part["order_qty"] = chunk["order_qty"].to_numpy()
+        for key, values in result.items():
+            part[key] = values[i]
+        frames.append(part)
+    return pd.concat(frames, ignore_index=True)
+
+
+def simulate(params, trials=TRIALS, horizon=HORIZON, seed=0, chunk_size=250, workers=1):
+    """
+    Simulasi untuk DataFrame parameter (kolom nobar + PARAM_COLUMNS), dipecah per
+    chunk barang; `workers` > 1 membagi chunk ke beberapa proses.
+    """
+    chunks = [(params.iloc[start:start + chunk_size], trials, horizon, seed + start)
+              for start in range(0, len(params), chunk_size)]
+    if workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_simulate_chunk, chunks))
+    else:
+        parts = [_simulate_chunk(c) for c in chunks]
+    if not parts:
+        return pd.DataFrame(columns=["nobar", "kebijakan", "rop", "order_qty"])
+    return pd.concat(parts, ignore_index=True)
+
+
+# ----------------------------------------------------
+# Satu barang (dashboard)
+# ----------------------------------------------------
+RESULT_COLUMNS = {
+    "kebijakan": "Kebijakan",
+    "rop": "ROP",
+    "order_qty": "Order Qty",
+    "peluang_stockout": "Peluang Stockout (%)",
+    "hari_stockout_pct": "Hari Stockout (%)",
+    "rata_rata_stok": "Rata-rata Stok",
+    "fill_rate": "Fill Rate (%)",
+}
+
+
+def item_params(result, scenario, year):
+    """
+    Parameter simulasi satu barang dari hasil item_search.compute_search() untuk
+    skenario lead time `scenario` dan tahun permintaan `year`; None jika ROP
+    Existing tidak berupa angka.
+    """
+    evaluation = result["evaluations"][scenario]
+    rop_existing = pd.to_numeric(pd.Series([evaluation["rop_existing"]]), errors="coerce").iloc[0]
+    if pd.isna(rop_existing):
+        return None
+    position = [str(y) for y in result["demand_stats"].index].index(str(year))
+    stats = result["demand_stats"].iloc[position]
+    row = {
+        "nobar": result["detail"]["nobar"],
+        "lead_time_minimal": evaluation["lt_min"],
+        "lead_time_avg": evaluation["lt_avg"],
+        "lead_time_maximal": evaluation["lt_max"],
+        "rop_existing": rop_existing,
+        "rop": evaluation["levels"]["rop"][position],
+        "order_qty": evaluation["levels"]["order_qty"][position],
+    }
+    for column in ("harian_mean", "harian_std", "harian_aktif", "hari"):
+        row[column] = stats[column]
+    return pd.DataFrame([row])
+
+
+def simulate_item(result, scenario, year, trials=TRIALS, horizon=HORIZON, seed=0):
+    """Tabel hasil simulasi satu barang (baris per kebijakan), atau None."""
+    params = item_params(result, scenario, year)
+    if params is None:
+        return None
+    table = simulate(params, trials, horizon, seed)
+    for column in ("peluang_stockout", "fill_rate"):
+        table[column] = table[column] * 100
+    return table[list(RESULT_COLUMNS)].rename(columns=RESULT_COLUMNS).round(2)
+
+
+# ----------------------------------------------------
+# Seluruh katalog (CLI)
+# ----------------------------------------------------
+def catalogue_params(year, lead_time):
+    """Parameter simulasi semua barang yang punya ROP Existing dan transaksi di `year`."""
+    data = data_loader.load_transactions()
+    store = data_loader.load_transaction_store()[0]
+    lead_times = {str(label): df for label, df in data_loader.load_lead_times().items()}
+    rop_existing = data_loader.load_rop_existing()
+    cube = usage_cube.get_cube(data, data_loader.transaction_version(), data_loader.last_changes(),
+                               data_loader.source_versions())
+
+    usage_table = rop_engine.yearly_usage_table(cube.cells, [year])
+    evaluated = rop_engine.evaluate_catalogue(usage_table, {lead_time: lead_times[str(lead_time)]})
+    existing = rop_existing[["nobar", "Rop Existing"]].astype({"nobar": str}).drop_duplicates("nobar")
+    params = evaluated.merge(existing, on="nobar", how="inner").rename(columns={"Rop Existing": "rop_existing"})
+    params["rop_existing"] = pd.to_numeric(params["rop_existing"], errors="coerce")
+
+    stats = demand_stats.get_demand_stats(store, data_loader.transaction_version())
+    stats = stats[stats["year"] == year].drop(columns="year")
+    params["nobar_key"] = params["nobar"].str.lower()
+    params = params.merge(stats, on="nobar_key", how="inner")
+    return params.dropna(subset=["rop_existing"]).reset_index(drop=True)
+
+
+def run(output, year=None, lead_time="2024", trials=TRIALS, horizon=HORIZON,
+        workers=None, chunk_size=250, seed=0, log=print):
+    started = time.perf_counter()
+    year = year or max(data_loader.discover_transaction_files())
+    params = catalogue_params(year, lead_time)
+    log(f"{len(params)} barang x {trials} percobaan x {horizon} hari (tahun {year}, lead time {lead_time})")
+
+    workers = workers or os.cpu_count() or 1
+    result = simulate(params, trials, horizon, seed, chunk_size, workers)
+    if output.lower().endswith(".parquet"):
+        result.to_parquet(output, index=False)
+    else:
+        result.to_csv(output, index=False)
+
+    log(f"Selesai dalam {time.perf_counter() - started:.2f} detik -> {output}")
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulasi stockout ROP seluruh katalog.")
+    parser.add_argument("--output", "-o", required=True, help="File output (.csv atau .parquet)")
+    parser.add_argument("--year", type=int, default=None, help="Tahun data permintaan (default terbaru)")
+    parser.add_argument("--lead-time", default="2024", help="Skenario lead time (2024, 2023, atau nama lead_time_<nama>.xlsx)")
+    parser.add_argument("--trials", type=int, default=TRIALS, help="Jumlah percobaan per barang")
+    parser.add_argument("--horizon", type=int, default=HORIZON, help="Panjang simulasi (hari)")
+    parser.add_argument("--workers", type=int, default=None, help="Jumlah proses (default jumlah CPU)")
+    parser.add_argument("--chunk-size", type=int, default=250, help="Jumlah barang per chunk")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    result = run(args.output, args.year, args.lead_time, args.trials, args.horizon,
+                 args.workers, args.chunk_size, args.seed)
+    if len(result):
+        metrics = ["peluang_stockout", "hari_stockout_pct", "rata_rata_stok", "fill_rate"]
+        print("\nRata-rata per kebijakan:")
+        print(result.groupby("kebijakan")[metrics].mean().to_string())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,55 +1,97 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+import os
+import uuid
 from datetime import datetime
 
-# ----------------------------------------------------
-# Fungsi buat label Ranking
-# ----------------------------------------------------
-def get_rank_labels(n):
-    if n <= 0:
-        return []
-    if n == 1:
-        return ["Tertinggi"]
-    if n == 2:
-        return ["Tertinggi", "Terendah"]
-    if n == 3:
-        return ["Tertinggi", "Tertinggi ke-2", "Terendah"]
-    if n == 4:
-        return ["Tertinggi", "Tertinggi ke-2", "Tertinggi ke-3", "Terendah"]
-    # n >= 5
-    return ["Tertinggi", "Tertinggi ke-2", "Tertinggi ke-3", "Tertinggi ke-4", "Terendah"]
-
+import charts
+import data_loader
+import demand_stats
+import export
+import forecast
+import item_compare
+import item_search
+import item_suggest
+import lead_time_scenarios
+import movement
+import nobar_index
+import profiling
+import usage_cube
+import shared_store
+import stockout_sim
+import table_style
+import sql_backend
 
 # ----------------------------------------------------
 # Load Data Excel
 # ----------------------------------------------------
-file_paths = {
-    2020: "2020.xlsx",
-    2021: "2021.xlsx",
-    2022: "2022.xlsx",
-    2023: "2023.xlsx",
-    2024: "2024.xlsx"
-}
-data = {year: pd.read_excel(path) for year, path in file_paths.items()}
-
-# ROP Existing
-rop_existing = pd.read_excel("rop existing_fix.xlsx")
-
-# Lead time 2024 => Book1.xlsx, 2023 => Book2.xlsx
-lead_time_data_2024 = pd.read_excel("Book1.xlsx")
-lead_time_data_2023 = pd.read_excel("Book2.xlsx")
-
-# Pastikan kolom lead_time numerik
-for df_lead in [lead_time_data_2024, lead_time_data_2023]:
-    df_lead['lead_time_minimal'] = pd.to_numeric(df_lead['lead_time_minimal'], errors='coerce')
-    df_lead['lead_time_avg'] = pd.to_numeric(df_lead['lead_time_avg'], errors='coerce')
-    df_lead['lead_time_maximal'] = pd.to_numeric(df_lead['lead_time_maximal'], errors='coerce')
-
-# Add this where other Excel files are loaded
-movement_status = pd.read_excel("movement_status.xlsx")
+# File transaksi (2024.xlsx, 2025-01.xlsx, ...) ditemukan otomatis di folder data.
+# Tabel referensi dan tahun default "Pilih Tahun" (ROP_DEFAULT_YEARS tahun
+# terakhir, 0 = semua) dimuat di thread background (paralel, lewat cache), jadi
+# halaman awal langsung tampil; tahun lain baru dibaca saat dipilih.
+file_paths = data_loader.discover_transaction_files()
+DEFAULT_YEAR_COUNT = int(os.environ.get("ROP_DEFAULT_YEARS", "3"))
+default_years = list(file_paths)[-DEFAULT_YEAR_COUNT:] if DEFAULT_YEAR_COUNT > 0 else list(file_paths)
+data_loader.warm_up(file_paths, years=default_years)
+# Selama warm-up halaman mengecek setiap detik dan tampil ulang begitu data siap
+WARM_UP_POLL_SECONDS = 1.0
+
+# Sumber data pemakaian: cube di memori (default) atau SQLite (ROP_BACKEND=sqlite)
+USAGE_BACKEND = os.environ.get("ROP_BACKEND", "cube").lower()
+
+
+def load_data(selected_years):
+    """Muat tabel dashboard (tahun transaksi yang belum dipilih tidak dibaca)."""
+    data_loader.wait_until_warm()
+    tables = {}
+    # Workbook dibaca lewat data_loader: cache Parquet di disk (dikunci fingerprint
+    # file) + cache di memori proses, jadi rerun tidak mem-parsing Excel lagi.
+    # Semua tahun disimpan dalam satu store ringkas; data[year] adalah partisinya.
+    tables["transaction_store"], tables["data"] = data_loader.load_transaction_store(
+        file_paths, years=selected_years
+    )
+    # ROP Existing, skenario lead time (2024 => Book1.xlsx, 2023 => Book2.xlsx,
+    # lead_time_<nama>.xlsx), movement status
+    tables["rop_existing"], tables["lead_times"], tables["movement_status"] = data_loader.load_reference_tables()
+
+    # Index nobar untuk semua tabel (dibangun sekali per versi data)
+    tables["item_index"] = nobar_index.get_index({
+        **tables["data"],
+        "movement_status": tables["movement_status"],
+        **{lead_time_scenarios.index_table(label): df for label, df in tables["lead_times"].items()},
+        "rop_existing": tables["rop_existing"],
+    })
+
+    if USAGE_BACKEND == "sqlite":
+        tables["usage_data"] = sql_backend.get_backend(
+            tables["transaction_store"],
+            data_loader.transaction_version(),
+            os.path.join(data_loader.CACHE_DIR, "transaksi.sqlite"),
+            changes=data_loader.last_changes(),
+        )
+        tables["match_usage_keys"] = tables["usage_data"].match_keys
+    else:
+        # Cube pemakaian (nobar x tahun x bulan), dipakai tabel pemakaian & grafik
+        tables["usage_data"] = usage_cube.get_cube(
+            tables["data"], data_loader.transaction_version(), data_loader.last_changes(),
+            data_loader.source_versions()
+        )
+        tables["match_usage_keys"] = tables["item_index"].match_keys
+
+    # Statistik permintaan terukur per barang x tahun (dihitung sekali per versi data)
+    tables["demand_stats"] = demand_stats.get_demand_stats(
+        tables["transaction_store"], data_loader.transaction_version()
+    )
+    # Movement status semua barang dari transaksi (diperbarui per tahun sumber yang berubah)
+    tables["movement"] = movement.get_movement(
+        tables["data"], data_loader.transaction_version(), data_loader.last_changes(),
+        data_loader.source_versions()
+    )
+    # Forecast pemakaian tahun berikutnya semua barang (dihitung sekali per versi data,
+    # dari riwayat semua file, bukan hanya tahun yang sudah dimuat)
+    tables["forecast"] = forecast.get_forecast(
+        tables["transaction_store"], data_loader.files_version(file_paths), file_paths
+    )
+    return tables
 
 # ----------------------------------------------------
 # Set Page Config
@@ -219,45 +261,406 @@ st.sidebar.title("📊 PT Bakrie Pipe Industries")
 st.sidebar.subheader("Dashboard Visualisasi Evaluasi ROP Warehouse")
 
 # Filter Options
-months = [
-    "Januari", "Februari", "Maret", "April", "Mei",
-    "Juni", "Juli", "Agustus", "September",
-    "Oktober", "November", "Desember"
-]
-years = list(data.keys())
-
-nobar_input = st.sidebar.text_input("Masukkan Nomor Barang:")
+months = item_search.MONTHS
+years = list(file_paths.keys())
+
+# Mode banding: beberapa nobar sekaligus (ditempel atau di-upload)
+search_mode = st.sidebar.radio("Mode Pencarian:", ["Satu Barang", "Bandingkan Barang"], horizontal=True)
+if search_mode == "Satu Barang":
+    nobar_input = st.sidebar.text_input("Masukkan Nomor Barang:")
+else:
+    nobar_list_input = st.sidebar.text_area("Daftar Nomor Barang (satu per baris / dipisah koma):")
+    nobar_file = st.sidebar.file_uploader("Atau upload daftar nobar (.csv/.xlsx/.txt):", type=["csv", "xlsx", "txt"])
+    nobar_list = item_compare.parse_nobar_list(nobar_list_input)
+    if nobar_file is not None:
+        nobar_list = list(dict.fromkeys(nobar_list + item_compare.read_nobar_file(nobar_file.name, nobar_file.getvalue())))
+    nobar_input = ", ".join(nobar_list)
 selected_months = st.sidebar.multiselect("Pilih Bulan:", ["Semua Bulan"] + months, default="Semua Bulan")
-selected_years = st.sidebar.multiselect("Pilih Tahun:", years, default=years)
+selected_years = st.sidebar.multiselect("Pilih Tahun:", years, default=default_years)
+demand_basis = st.sidebar.radio(
+    "Dasar pakai per hari:", list(item_search.DEMAND_BASES),
+    format_func=lambda basis: item_search.DEMAND_BASES[basis],
+    help="Terukur: rata-rata harian dari tanggal transaksi, Min/Max dari minggu sepi/ramai (P10/P90)."
+)
+
+# Skenario lead time what-if: (skenario dasar, faktor, tambahan hari), satu kartu per skenario
+what_ifs = st.session_state.setdefault("what_if_scenarios", [])
+with st.sidebar.expander("Skenario lead time (what-if)"):
+    with st.form("what_if_form", clear_on_submit=True):
+        what_if_base = st.selectbox("Skenario dasar:", list(data_loader.lead_time_files()))
+        what_if_factor = st.number_input("Faktor lead time:", min_value=0.0, value=1.0, step=0.1)
+        what_if_days = st.number_input("Tambahan hari:", value=0.0, step=1.0)
+        if st.form_submit_button("Tambah skenario"):
+            scenario = (what_if_base, float(what_if_factor), float(what_if_days))
+            if scenario not in what_ifs and scenario[1:] != (1.0, 0.0):
+                what_ifs.append(scenario)
+    for scenario in what_ifs:
+        st.caption("• " + lead_time_scenarios.what_if_label(*scenario))
+    if what_ifs and st.button("Hapus semua skenario"):
+        what_ifs.clear()
+        st.rerun()
+what_ifs = tuple(what_ifs)
+
+@st.fragment(run_every=WARM_UP_POLL_SECONDS)
+def wait_for_warm_up():
+    # Selama warm-up: cek berkala, lalu jalankan ulang halaman sekali saat data siap
+    if data_loader.is_warm():
+        st.rerun()
+
+
+if data_loader.is_warm():
+    transaction_store, data = data_loader.load_transaction_store(file_paths, years=selected_years)
+    rop_existing, lead_times, movement_status = data_loader.load_reference_tables()
+
+    # Saran barang (nobar + nama) untuk input; memilih saran = cari nobar itu saja
+    if search_mode == "Satu Barang" and nobar_input:
+        suggestions = item_suggest.get_suggester(transaction_store).suggest(nobar_input)
+        if len(suggestions) and list(suggestions["nobar_key"]) != [nobar_input.strip().lower()]:
+            labels = ["Semua barang yang cocok dengan input"] + [
+                f"{nobar} — {nabar}" for nobar, nabar in zip(suggestions["nobar"], suggestions["nabar"])
+            ]
+            choice = st.sidebar.selectbox("Saran barang:", range(len(labels)), format_func=lambda i: labels[i])
+            if choice:
+                nobar_input = item_suggest.exact_query(suggestions.iloc[choice - 1]["nobar"])
+
+    # Info baris yang gagal di-parse saat ingest
+    ingest_summary = data_loader.ingest_report(data)
+    failed_rows = int(ingest_summary["tanggal_gagal"].sum() + ingest_summary["jumlah_gagal"].sum())
+    if failed_rows:
+        st.sidebar.caption(f"⚠️ {failed_rows} baris transaksi gagal di-parse (tanggal/jumlah) dan diabaikan.")
+
+    with st.sidebar.expander("Info memori data"):
+        st.dataframe(data_loader.memory_report({
+            "transaksi": transaction_store,
+            "rop_existing": rop_existing,
+            **{lead_time_scenarios.index_table(label): df for label, df in lead_times.items()},
+            "movement_status": movement_status,
+        }), hide_index=True)
+        rss = shared_store.rss_bytes()
+        if rss:
+            st.caption(f"RSS proses server: {rss / 1e6:.1f} MB (tabel dipakai bersama semua sesi)")
+else:
+    st.sidebar.caption("⏳ Data sedang dimuat di background...")
+    wait_for_warm_up()
+
+
+# ----------------------------------------------------
+# Bagian hasil pencarian
+# ----------------------------------------------------
+# Setiap kartu adalah fragment: bisa dijalankan ulang sendiri tanpa menggambar
+# ulang kartu lain. Hasil pencarian disimpan di session state, jadi tetap tampil
+# saat widget lain berubah, dan figure Plotly dipakai ulang selama datanya sama.
+@st.fragment
+@profiling.fragment_request("fragment:kartu pemakaian")
+def render_usage_card(result):
+    # ------------------------------------------------
+    # CARD - Data Pemakaian per Tahun
+    # ------------------------------------------------
+    st.markdown(f"<div style='border: 1px solid #000000; padding: 10px; margin-bottom: 20px; border-radius: 10px;'>", unsafe_allow_html=True)
+    st.markdown("""
+    
+        <div class="title-section-no-bg">
+            <h3>📊 Data Pemakaian per Tahun</h3>
+        </div>
+    """, unsafe_allow_html=True)
+
+    with profiling.stage("style"):
+        df_pemakaian = result["df_pemakaian"]
+        st.write(table_style.styled(df_pemakaian, table_style.usage_styles(df_pemakaian)))
+    with st.expander("Statistik permintaan terukur (dari tanggal transaksi)"):
+        st.table(result["df_demand"].set_index("Keterangan"))
+    st.markdown('</div>', unsafe_allow_html=True)
+
+
+@st.fragment
+@profiling.fragment_request("fragment:kartu evaluasi")
+def render_evaluation_card(scenario, evaluation):
+    # ------------------------------------------------
+    # CARD - Evaluasi Level Order (per lead time)
+    #   TABEL di kiri, INFORMASI di kanan
+    # ------------------------------------------------
+    st.markdown(f"<div style='border: 1px solid #000000; padding: 10px; margin-bottom: 20px; border-radius: 10px;'>", unsafe_allow_html=True)
+    st.markdown(f"""
+    
+        <div class="title-section-no-bg">
+            <h3>🔍 Evaluasi Level Order ({scenario})</h3>
+        </div>
+        <div class="subtitle">Note: Menggunakan perhitungan Lead Time {scenario}</div>
+    """, unsafe_allow_html=True)
+
+    colEvLeft, colEvRight = st.columns([2, 1])
+
+    # TABEL evaluasi
+    with colEvLeft:
+        with profiling.stage("style"):
+            df_eval = evaluation["df_eval"]
+            st.write(table_style.styled(df_eval, table_style.evaluation_styles(df_eval)))
+
+    # INFORMASI di kolom kanan (ROP Existing sama untuk semua lead time)
+    with colEvRight:
+        st.markdown(f"""
+        <div class="info-section">
+            <strong>Informasi Tambahan ({scenario})</strong>
+        </div>
+        """, unsafe_allow_html=True)
+        st.markdown(f"**ROP Existing:** {evaluation['rop_existing']}")
+        st.markdown(f"**Lead Time Minimal:** {evaluation['lt_min']} hari")
+        st.markdown(f"**Lead Time Rata-rata:** {evaluation['lt_avg']} hari")
+        st.markdown(f"**Lead Time Maksimal:** {evaluation['lt_max']} hari")
+
+    st.markdown('</div>', unsafe_allow_html=True)
+
+
+@st.fragment
+@profiling.fragment_request("fragment:simulasi")
+def render_simulation_card(result, selected_years):
+    # ------------------------------------------------
+    # CARD - Simulasi Stockout (Monte Carlo)
+    #   dijalankan hanya saat tombol diklik (fragment, bukan seluruh halaman)
+    # ------------------------------------------------
+    st.markdown(f"<div style='border: 1px solid #000000; padding: 10px; margin-bottom: 20px; border-radius: 10px;'>", unsafe_allow_html=True)
+    st.markdown(f"""
+    
+        <div class="title-section-no-bg">
+            <h3>🎲 Simulasi Stockout</h3>
+        </div>
+        <div class="subtitle">Note: {stockout_sim.TRIALS} percobaan x {stockout_sim.HORIZON} hari, lead time acak antara minimal dan maksimal</div>
+    """, unsafe_allow_html=True)
+
+    colSimLt, colSimYear = st.columns(2)
+    with colSimLt:
+        scenario = st.selectbox("Lead time:", list(result["evaluations"]), key="sim_lead_time")
+    with colSimYear:
+        sim_year = st.selectbox("Data permintaan tahun:", selected_years, key="sim_year")
+
+    sim_key = (id(result), scenario, sim_year)
+    if st.button("Jalankan Simulasi", key="sim_run"):
+        with st.spinner("Menjalankan simulasi..."):
+            table = stockout_sim.simulate_item(result, scenario, sim_year)
+        st.session_state["simulation"] = (sim_key, table)
+
+    simulation = st.session_state.get("simulation")
+    if simulation is not None and simulation[0] == sim_key:
+        if simulation[1] is None:
+            st.warning("ROP Existing tidak ditemukan, simulasi tidak bisa dijalankan.")
+        else:
+            st.dataframe(simulation[1], hide_index=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+
+
+def get_charts(result, selected_years, granularity):
+    # Figure dibangun ulang hanya jika hasil pencarian (objek dari cache) atau granularitas berganti
+    cached = st.session_state.get("chart_figures")
+    if cached is not None and cached[0] is result and cached[1] == granularity:
+        return cached[2]
+    figures = charts.build_charts(result, selected_years, granularity)
+    st.session_state["chart_figures"] = (result, granularity, figures)
+    return figures
+
+
+@st.fragment
+@profiling.fragment_request("fragment:grafik")
+def render_charts(result, selected_years):
+    # ------------------------------------------------
+    # CARD - Visualisasi
+    # ------------------------------------------------
+    st.markdown(f"<div style='border: 1px solid #000000; padding: 10px; margin-bottom: 20px; border-radius: 10px;'>", unsafe_allow_html=True)
+    st.markdown("""
+    <div class="card-container">
+        <div class="title-section-no-bg">
+            <h3>📈 Visualisasi Data</h3>
+        </div>
+    <div style="text-align: center; margin-bottom: 20px;">
+        <p>
+            Di bawah ini, Anda akan menemukan berbagai visualisasi yang dirancang untuk memberikan wawasan mendalam tentang tren dan pola penggunaan barang selama beberapa tahun terakhir. Visualisasi ini mencakup total barang keluar per bulan dan tren perubahan barang keluar dari waktu ke waktu. Dengan data ini, Anda dapat dengan mudah mengidentifikasi periode dengan permintaan tinggi atau rendah, serta memahami dinamika inventaris Anda secara keseluruhan.
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    granularity = st.radio("Granularitas:", list(charts.GRANULARITIES), horizontal=True, key="chart_granularity")
+    period = charts.GRANULARITIES[granularity]
+    with profiling.stage("chart"):
+        fig, fig2 = get_charts(result, selected_years, granularity)
+
+    # 1) Total Barang Keluar per Bulan
+    st.markdown(f"<div style='border: 1px solid #000000; padding: 10px; margin-bottom: 20px; border-radius: 10px;'>", unsafe_allow_html=True)
+    st.markdown(f"""
+    <div class="title-section-no-bg">
+        <h4>📦 Total Barang Keluar per {period}</h4>
+    </div>
+    """, unsafe_allow_html=True)
+    with profiling.stage("chart"):
+        st.plotly_chart(fig)
+    
+    st.markdown(
+    f"""<div style=>
+    <b style='color:#000000;'>Penjelasan:</b> Grafik ini menampilkan jumlah keseluruhan barang yang dikeluarkan dari inventaris setiap bulan, memberikan wawasan mengenai fluktuasi permintaan dan membantu dalam mengidentifikasi tren permintaan sepanjang tahun. Informasi ini sangat penting untuk mengelola stok gudang secara efisien sesuai dengan kebutuhan yang diajukan oleh para pekerja produksi di PT Bakrie Pipe Industries.
+    </div>""",
+    unsafe_allow_html=True
+    )
+
+    # 2) Tren Barang Keluar per Bulan
+    st.markdown(f"<div style='border: 1px solid #000000; padding: 10px; margin-bottom: 20px; border-radius: 10px;'>", unsafe_allow_html=True)
+    st.markdown(f"""
+    <div class="title-section-no-bg">
+        <h4>📉 Tren Barang Keluar per {period}</h4>
+    </div>
+    """, unsafe_allow_html=True)
+    with profiling.stage("chart"):
+        st.plotly_chart(fig2)
+
+    st.markdown(
+    f"""<div style=>
+    <b style='color:#000000;'>Penjelasan:</b> Grafik ini menunjukkan pola pergerakan barang yang keluar dari inventaris seiring waktu, memungkinkan identifikasi pola musiman serta analisis perubahan dalam volume pengeluaran. Data ini krusial untuk memastikan ketersediaan stok gudang yang sesuai dengan permintaan produksi, sehingga para pekerja produksi di PT Bakrie Pipe Industries dapat bekerja dengan lancar tanpa kendala terkait ketersediaan bahan baku.
+    </div>""",
+    unsafe_allow_html=True
+    )
+
+    st.markdown('</div>', unsafe_allow_html=True)
+
+
+# ----------------------------------------------------
+# Bagian mode banding (beberapa barang)
+# ----------------------------------------------------
+@st.fragment
+@profiling.fragment_request("fragment:banding pemakaian")
+def render_comparison_usage(comparison):
+    st.markdown(f"<div style='border: 1px solid #000000; padding: 10px; margin-bottom: 20px; border-radius: 10px;'>", unsafe_allow_html=True)
+    st.markdown("""
+        <div class="title-section-no-bg">
+            <h3>📊 Data Pemakaian per Tahun</h3>
+        </div>
+    """, unsafe_allow_html=True)
+    with profiling.stage("style"):
+        # Kolom tahun diwarnai ranking per barang (tabel besar tanpa warna)
+        usage = comparison["usage"]
+        year_columns = [c for c in usage.columns if c not in ("Nomor Barang", "Nama Barang", "Satuan")]
+        st.dataframe(table_style.styled(usage, table_style.comparison_styles(usage, year_columns)), hide_index=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+
+
+@st.fragment
+@profiling.fragment_request("fragment:banding evaluasi")
+def render_comparison_evaluation(scenario, evaluation):
+    st.markdown(f"<div style='border: 1px solid #000000; padding: 10px; margin-bottom: 20px; border-radius: 10px;'>", unsafe_allow_html=True)
+    st.markdown(f"""
+        <div class="title-section-no-bg">
+            <h3>🔍 Evaluasi Level Order ({scenario})</h3>
+        </div>
+        <div class="subtitle">Note: Menggunakan perhitungan Lead Time {scenario}</div>
+    """, unsafe_allow_html=True)
+    with profiling.stage("style"):
+        st.dataframe(evaluation, hide_index=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+
+
+@st.fragment
+@profiling.fragment_request("fragment:banding grafik")
+def render_comparison_trend(comparison, selected_years):
+    st.markdown(f"<div style='border: 1px solid #000000; padding: 10px; margin-bottom: 20px; border-radius: 10px;'>", unsafe_allow_html=True)
+    granularity = st.radio("Granularitas:", list(charts.GRANULARITIES), horizontal=True, key="compare_granularity")
+    st.markdown(f"""
+    <div class="title-section-no-bg">
+        <h4>📉 Tren Barang Keluar per {charts.GRANULARITIES[granularity]}</h4>
+    </div>
+    """, unsafe_allow_html=True)
+    with profiling.stage("chart"):
+        fig = charts.comparison_trend(comparison, selected_years, granularity)
+        st.plotly_chart(fig)
+    if len(comparison["items"]) > item_compare.MAX_TREND_ITEMS:
+        st.caption(f"Grafik menampilkan {item_compare.MAX_TREND_ITEMS} barang pertama dari daftar.")
+    st.markdown('</div>', unsafe_allow_html=True)
+
+
+@st.fragment
+@profiling.fragment_request("fragment:unduh")
+def render_downloads(named_tables, file_stem, tables, selected_years, what_ifs):
+    # ------------------------------------------------
+    # Unduhan: tabel yang sedang tampil & evaluasi seluruh katalog
+    #   file baru dibuat saat tombol diklik (callable, di luar thread script)
+    # ------------------------------------------------
+    with st.expander("⬇️ Unduh"):
+        fmt = st.selectbox("Format:", list(export.FORMATS), key="download_format")
+        colItem, colCatalogue = st.columns(2)
+        with colItem:
+            st.download_button(
+                "Tabel di halaman ini", lambda: export.tables_file(named_tables, fmt),
+                file_name=f"{file_stem}.{fmt}", mime=export.FORMATS[fmt], key="download_tables",
+            )
+        with colCatalogue:
+            st.download_button(
+                "Evaluasi ROP seluruh katalog",
+                lambda: export.read_file(export.catalogue_file(tables, selected_years, what_ifs, fmt)),
+                file_name=f"evaluasi_rop_katalog.{fmt}", mime=export.FORMATS[fmt], key="download_catalogue",
+            )
+        st.caption("Evaluasi katalog memakai pemakaian setahun penuh untuk tahun terpilih "
+                   "(filter bulan tidak berlaku), satu baris per lead time x barang x tahun.")
 
 
 # ----------------------------------------------------
 # Handle Search
 # ----------------------------------------------------
-if st.sidebar.button("Search"):
-    if not nobar_input:
-        st.warning("Nomor barang wajib diisi sebelum klik tombol search.")
+# Nobar yang terakhir dicari disimpan di session state; filter bulan/tahun yang
+# diubah sesudahnya langsung diterapkan tanpa klik Search lagi.
+search_clicked = st.sidebar.button("Search")
+if search_clicked:
+    if search_mode == "Satu Barang":
+        st.session_state["search_nobar"] = nobar_input
     else:
-        # Filter Data
-        filtered_data = []
-        for year in selected_years:
-            df = data[year].copy()
-            if 'tanggal' not in df.columns:
-                st.error(f"Kolom 'tanggal' tidak ditemukan di data tahun {year}.")
-                continue
-            df['tanggal'] = pd.to_datetime(df['tanggal'], format='%d/%m/%Y', errors='coerce')
-            df = df[df['nobar'].astype(str).str.contains(nobar_input, case=False, na=False)]
-
-            if "Semua Bulan" not in selected_months:
-                m_indices = [months.index(m) + 1 for m in selected_months if m in months]
-                df = df[df['tanggal'].dt.month.isin(m_indices)]
-
-            filtered_data.append(df)
-
-        if len(filtered_data) > 0:
-            filtered_data = pd.concat(filtered_data)
+        st.session_state["compare_nobars"] = nobar_list
+
+# Panel debug: waktu per tahap request (load, filter, aggregate, evaluate, style,
+# chart); semua request juga dicatat di log profiling.LOG_PATH
+if st.session_state.pop("timing_profile_done", False):
+    st.session_state["timing_profile"] = False
+with st.sidebar.expander("⏱️ Debug waktu"):
+    show_timing = st.checkbox("Tampilkan waktu per tahap", key="timing_panel")
+    profile_request = st.checkbox("Rekam cProfile (satu request)", key="timing_profile")
+timing_meta = {
+    "session": st.session_state.setdefault("timing_session", uuid.uuid4().hex[:8]),
+    "years": list(selected_years),
+    "months": selected_months,
+}
+timer = None
+
+# Request selalu ditutup (cProfile dilepas, record masuk log), juga jika hitungan gagal
+try:
+    if search_clicked and not nobar_input:
+        st.warning("Nomor barang wajib diisi sebelum klik tombol search.")
+    elif search_mode == "Bandingkan Barang" and st.session_state.get("compare_nobars"):
+        timer = profiling.start_request("bandingkan", profile_request,
+                                        query=", ".join(st.session_state["compare_nobars"]), **timing_meta)
+        with st.spinner("Memuat data..."), profiling.stage("load"):
+            tables = load_data(selected_years)
+        m_indices = item_search.month_indices(selected_months)
+        comparison = item_compare.compare(tables, st.session_state["compare_nobars"], m_indices, selected_years, what_ifs)
+
+        st.markdown("""
+        <div class="title-section-bg">
+            <h2>🎯 Perbandingan Barang Berdasarkan Daftar Anda!</h2>
+        </div>
+        """, unsafe_allow_html=True)
+        if comparison["not_found"]:
+            st.warning("Nomor barang tidak ditemukan: " + ", ".join(comparison["not_found"]))
+        if comparison["items"].empty:
+            st.warning("Tidak ada data untuk filter yang dipilih.")
         else:
-            filtered_data = pd.DataFrame()
+            render_comparison_usage(comparison)
+            for scenario, evaluation in comparison["evaluations"].items():
+                render_comparison_evaluation(scenario, evaluation)
+            render_comparison_trend(comparison, selected_years)
+            render_downloads(export.comparison_tables(comparison), "banding_barang", tables, selected_years, what_ifs)
+    elif search_mode == "Satu Barang" and st.session_state.get("search_nobar"):
+        search_nobar = st.session_state["search_nobar"]
+        timer = profiling.start_request("cari", profile_request, query=search_nobar, **timing_meta)
+        with st.spinner("Memuat data..."), profiling.stage("load"):
+            tables = load_data(selected_years)
+
+        # Hasil dihitung sekali per (versi data, nobar, bulan, tahun) lalu diambil dari cache
+        m_indices = item_search.month_indices(selected_months)
+        result = item_search.search(tables, search_nobar, m_indices, selected_years, demand_basis, what_ifs)
+        for message in result["errors"]:
+            st.error(message)
 
         # Judul Hasil Pencarian dengan Background
         st.markdown("""
@@ -266,382 +669,66 @@ if st.sidebar.button("Search"):
         </div>
         """, unsafe_allow_html=True)
 
-        if filtered_data.empty:
+        if result["empty"]:
             st.warning("Tidak ada data untuk filter yang dipilih.")
         else:
             # Existing detail barang section
-            first_row = filtered_data.iloc[0]
-            nobar_value = first_row.get("nobar", "")
-            nabar_value = first_row.get("nabar", "nabar TIDAK ADA")
-            satuan_value = first_row.get("satuan", "satuan TIDAK ADA")
+            detail = result["detail"]
 
             # First line with existing details
-            st.write(f"**Nomor Barang:** {nobar_value} | **Nama Barang:** {nabar_value} | **Satuan:** {satuan_value}")
-            
-            # Add movement status on a new line
-            movement_data = movement_status[movement_status['nobar'].astype(str).str.contains(nobar_input, case=False, na=False)]
-            if not movement_data.empty:
-                status_value = movement_data.iloc[0].get('count', 'Status tidak ditemukan')
-                st.write(f"**Movement Status:** {status_value}")
-            else:
-                st.write("**Movement Status:** Data status tidak ditemukan")
+            st.write(f"**Nomor Barang:** {detail['nobar']} | **Nama Barang:** {detail['nabar']} | **Satuan:** {detail['satuan']}")
 
-                
-            # ------------------------------------------------
-            # CARD - Data Pemakaian per Tahun
-            # ------------------------------------------------
-            st.markdown(f"<div style='border: 1px solid #000000; padding: 10px; margin-bottom: 20px; border-radius: 10px;'>", unsafe_allow_html=True)
-            st.markdown("""
-            
-                <div class="title-section-no-bg">
-                    <h3>📊 Data Pemakaian per Tahun</h3>
-                </div>
-            """, unsafe_allow_html=True)
-
-            # Hitung Usage
-            usage_per_year = []
-            for y in selected_years:
-                val = filtered_data[filtered_data['tanggal'].dt.year == y]['jumlah'].sum()
-                usage_per_year.append(val)
-
-            pakai_per_bulan = [v / 12 for v in usage_per_year]
-            pakai_per_minggu = [v / 4.29 for v in pakai_per_bulan]
-            pakai_per_hari_avg = [v / 7 for v in pakai_per_minggu]
-            pakai_per_hari_min = [v * 0.5 for v in pakai_per_hari_avg]
-            pakai_per_hari_max = [v * 1.5 for v in pakai_per_hari_avg]
-
-            # Ranking
-            usage_dict = dict(zip(selected_years, usage_per_year))
-            sorted_usage = sorted(usage_dict.items(), key=lambda x: x[1], reverse=True)
-            rank_labels = get_rank_labels(len(sorted_usage))
-            rank_dict = {}
-            for i, (yr, val) in enumerate(sorted_usage):
-                rank_dict[yr] = rank_labels[i] if i < len(rank_labels) else "-"
-
-            keterangan_pemakaian = [rank_dict[y] for y in selected_years]
-
-            usage_cols = ["Keterangan"] + [str(y) for y in selected_years]
-            usage_rows = [
-                ["Pemakaian Mutasi 1 th"] + usage_per_year,
-                ["Pakai per bulan"] + pakai_per_bulan,
-                ["Pakai per minggu"] + pakai_per_minggu,
-                ["Pakai per hari (Avg)"] + pakai_per_hari_avg,
-                ["Pakai per hari (Min)"] + pakai_per_hari_min,
-                ["Pakai per hari (Max)"] + pakai_per_hari_max,
-                ["Keterangan Pemakaian"] + keterangan_pemakaian
-            ]
-            df_pemakaian = pd.DataFrame(usage_rows, columns=usage_cols)
-
-            def highlight_pemakaian(row):
-                k_val = row["Keterangan"]
-                if k_val == "Keterangan Pemakaian":
-                    row_styles = ['background-color: #d4edda'] * len(row)
-                    for i in range(1, len(row)):
-                        val_text = str(row[i]).lower()
-                        if val_text.startswith("tertinggi ke-4"):
-                            row_styles[i] = 'background-color: #42a5f5'
-                        elif val_text.startswith("tertinggi ke-3"):
-                            row_styles[i] = 'background-color: #1e88e5'
-                        elif val_text.startswith("tertinggi ke-2"):
-                            row_styles[i] = 'background-color: #1565c0; color: #ffffff;'
-                        elif val_text == "tertinggi":
-                            row_styles[i] = 'background-color: #0d47a1; color: #ffffff;'
-                        elif val_text == "terendah":
-                            row_styles[i] = 'background-color: #bbdefb'
-                        else:
-                            row_styles[i] = 'background-color: #ffffff'
-                    return row_styles
-                else:
-                    idx = row.name
-                    if idx < 6:
-                        return ['background-color: #fff3cd'] * len(row)
-                    else:
-                        return ['background-color: #d4edda'] * len(row)
-
-            styled_pemakaian = df_pemakaian.style.apply(highlight_pemakaian, axis=1)
-            st.write(styled_pemakaian)
-            st.markdown('</div>', unsafe_allow_html=True)
-
-            # ------------------------------------------------
-            # CARD - Evaluasi Level Order (2024)
-            #   TABEL di kiri, INFORMASI di kanan
-            # ------------------------------------------------
-            st.markdown(f"<div style='border: 1px solid #000000; padding: 10px; margin-bottom: 20px; border-radius: 10px;'>", unsafe_allow_html=True)
-            st.markdown("""
-            
-                <div class="title-section-no-bg">
-                    <h3>🔍 Evaluasi Level Order (2024)</h3>
-                </div>
-                <div class="subtitle">Note: Menggunakan perhitungan Lead Time 2024</div>
-            """, unsafe_allow_html=True)
-
-            colEvLeft2024, colEvRight2024 = st.columns([2, 1])
-
-            # Lead Time 2024
-            lt_2024 = lead_time_data_2024[lead_time_data_2024['nobar'].astype(str).str.contains(nobar_input, case=False, na=False)]
-            if not lt_2024.empty:
-                lt_min_2024 = lt_2024.iloc[0]['lead_time_minimal']
-                lt_avg_2024 = lt_2024.iloc[0]['lead_time_avg']
-                lt_max_2024 = lt_2024.iloc[0]['lead_time_maximal']
-            else:
-                lt_min_2024 = lt_avg_2024 = lt_max_2024 = 0
-
-            # ROP Existing
-            rop_24 = rop_existing[rop_existing['nobar'].astype(str).str.contains(nobar_input, case=False, na=False)]
-            if not rop_24.empty:
-                rop_val_2024 = rop_24.iloc[0]['Rop Existing']
-            else:
-                rop_val_2024 = "Data tidak ditemukan"
-
-            usage_rounded = [round(v, 2) for v in usage_per_year]
-            rop_vals_2024 = [round(pakai_per_hari_max[i] * lt_max_2024) for i in range(len(selected_years))]
-            min_stock_2024 = [
-                rop_vals_2024[i] - round(pakai_per_hari_avg[i] * lt_avg_2024)
-                for i in range(len(selected_years))
-            ]
-            order_qty_2024 = [
-                round((rop_vals_2024[i] - round(pakai_per_hari_avg[i] * lt_avg_2024)) * 2)
-                for i in range(len(selected_years))
-            ]
-            max_stock_2024 = []
-            for i in range(len(selected_years)):
-                v_24 = rop_vals_2024[i] + order_qty_2024[i] - round(pakai_per_hari_min[i] * lt_min_2024)
-                max_stock_2024.append(round(v_24))
-
-            # TABEL 2024
-            with colEvLeft2024:
-                eval_cols_2024 = ["Keterangan"] + [str(y) for y in selected_years]
-                eval_rows_2024 = [
-                    ["Pemakaian Mutasi 1 th"] + usage_rounded,
-                    ["ROP"] + rop_vals_2024,
-                    ["Min Stock"] + min_stock_2024,
-                    ["Order Qty"] + order_qty_2024,
-                    ["Max Stock"] + max_stock_2024,
-                    ["Keterangan Pemakaian"] + keterangan_pemakaian
-                ]
-                df_eval_2024 = pd.DataFrame(eval_rows_2024, columns=eval_cols_2024)
-
-                def highlight_eval_2024(row):
-                    k_val = row["Keterangan"]
-                    if k_val == "Keterangan Pemakaian":
-                        row_styles = ['background-color: #d4edda'] * len(row)
-                        for i in range(1, len(row)):
-                            val_text = str(row[i]).lower()
-                            if val_text.startswith("tertinggi ke-4"):
-                                row_styles[i] = 'background-color: #42a5f5'
-                            elif val_text.startswith("tertinggi ke-3"):
-                                row_styles[i] = 'background-color: #1e88e5'
-                            elif val_text.startswith("tertinggi ke-2"):
-                                row_styles[i] = 'background-color: #1565c0; color: #ffffff;'
-                            elif val_text == "tertinggi":
-                                row_styles[i] = 'background-color: #0d47a1; color: #ffffff;'
-                            elif val_text == "terendah":
-                                row_styles[i] = 'background-color: #bbdefb'
-                            else:
-                                row_styles[i] = 'background-color: #ffffff'
-                        return row_styles
-                    elif k_val == "Pemakaian Mutasi 1 th":
-                        return ['background-color: #fff3cd'] * len(row)
+            # Add movement status on a new line
+            if detail["movement_status"] is not None:
+                st.write(f"**Movement Status:** {detail['movement_status']}")
+                computed = detail["movement_computed"]
+                if computed is not None:
+                    basis = (f"{computed['transaksi_12bln']} transaksi dalam {computed['bulan_aktif_12bln']} bulan aktif "
+                             f"({movement.JENDELA_BULAN} bulan terakhir), transaksi terakhir {computed['transaksi_terakhir']:%d/%m/%Y} "
+                             f"({computed['recency_hari']} hari sebelum transaksi terbaru di data)")
+                    if detail["movement_source"] == "transaksi":
+                        st.caption(f"Dihitung dari transaksi: {basis}.")
                     else:
-                        return ['background-color: #d4edda'] * len(row)
-
-                styled_eval_2024 = df_eval_2024.style.apply(highlight_eval_2024, axis=1)
-                st.write(styled_eval_2024)
-
-            # INFORMASI (2024) di kolom kanan
-            with colEvRight2024:
-                st.markdown("""
-                <div class="info-section">
-                    <strong>Informasi Tambahan (2024)</strong>
-                </div>
-                """, unsafe_allow_html=True)
-                st.markdown(f"**ROP Existing:** {rop_val_2024}")
-                st.markdown(f"**Lead Time Minimal:** {lt_min_2024} hari")
-                st.markdown(f"**Lead Time Rata-rata:** {lt_avg_2024} hari")
-                st.markdown(f"**Lead Time Maksimal:** {lt_max_2024} hari")
-
-            st.markdown('</div>', unsafe_allow_html=True)
-
-            # ------------------------------------------------
-            # CARD - Evaluasi Level Order (2023)
-            #   TABEL di kiri, INFORMASI di kanan
-            # ------------------------------------------------
-            st.markdown(f"<div style='border: 1px solid #000000; padding: 10px; margin-bottom: 20px; border-radius: 10px;'>", unsafe_allow_html=True)
-            st.markdown("""
-            
-                <div class="title-section-no-bg">
-                    <h3>🔍 Evaluasi Level Order (2023)</h3>
-                </div>
-                <div class="subtitle">Note: Menggunakan perhitungan Lead Time 2023</div>
-            """, unsafe_allow_html=True)
-
-            colEvLeft2023, colEvRight2023 = st.columns([2, 1])
-
-            # Lead Time 2023
-            lt_2023 = lead_time_data_2023[lead_time_data_2023['nobar'].astype(str).str.contains(nobar_input, case=False, na=False)]
-            if not lt_2023.empty:
-                lt_min_2023 = lt_2023.iloc[0]['lead_time_minimal']
-                lt_avg_2023 = lt_2023.iloc[0]['lead_time_avg']
-                lt_max_2023 = lt_2023.iloc[0]['lead_time_maximal']
+                        st.caption(f"Dari movement_status.xlsx (override). Hasil hitungan: {computed['movement']}, {basis}.")
             else:
-                lt_min_2023 = lt_avg_2023 = lt_max_2023 = 0
-
-            # Tabel Evaluasi 2023
-            with colEvLeft2023:
-                rop_2023 = [round(pakai_per_hari_max[i] * lt_max_2023) for i in range(len(selected_years))]
-                min_stock_2023 = [
-                    rop_2023[i] - round(pakai_per_hari_avg[i] * lt_avg_2023)
-                    for i in range(len(selected_years))
-                ]
-                order_qty_2023 = [
-                    round((rop_2023[i] - round(pakai_per_hari_avg[i] * lt_avg_2023)) * 2)
-                    for i in range(len(selected_years))
-                ]
-                max_stock_2023 = []
-                for i in range(len(selected_years)):
-                    v_23 = rop_2023[i] + order_qty_2023[i] - round(pakai_per_hari_min[i] * lt_min_2023)
-                    max_stock_2023.append(round(v_23))
-
-                eval_cols_2023 = ["Keterangan"] + [str(y) for y in selected_years]
-                eval_rows_2023 = [
-                    ["Pemakaian Mutasi 1 th"] + usage_rounded,
-                    ["ROP"] + rop_2023,
-                    ["Min Stock"] + min_stock_2023,
-                    ["Order Qty"] + order_qty_2023,
-                    ["Max Stock"] + max_stock_2023,
-                    ["Keterangan Pemakaian"] + keterangan_pemakaian
-                ]
-                df_eval_2023 = pd.DataFrame(eval_rows_2023, columns=eval_cols_2023)
-
-                def highlight_eval_2023(row):
-                    k_val = row["Keterangan"]
-                    if k_val == "Keterangan Pemakaian":
-                        row_styles = ['background-color: #d4edda'] * len(row)
-                        for i in range(1, len(row)):
-                            val_text = str(row[i]).lower()
-                            if val_text.startswith("tertinggi ke-4"):
-                                row_styles[i] = 'background-color: #42a5f5'
-                            elif val_text.startswith("tertinggi ke-3"):
-                                row_styles[i] = 'background-color: #1e88e5'
-                            elif val_text.startswith("tertinggi ke-2"):
-                                row_styles[i] = 'background-color: #1565c0; color: #ffffff;'
-                            elif val_text == "tertinggi":
-                                row_styles[i] = 'background-color: #0d47a1; color: #ffffff;'
-                            elif val_text == "terendah":
-                                row_styles[i] = 'background-color: #bbdefb'
-                            else:
-                                row_styles[i] = 'background-color: #ffffff'
-                        return row_styles
-                    elif k_val == "Pemakaian Mutasi 1 th":
-                        return ['background-color: #fff3cd'] * len(row)
-                    else:
-                        return ['background-color: #d4edda'] * len(row)
-
-                styled_eval_2023 = df_eval_2023.style.apply(highlight_eval_2023, axis=1)
-                st.write(styled_eval_2023)
-
-            # INFORMASI 2023 di kolom kanan
-            with colEvRight2023:
-                st.markdown("""
-                <div class="info-section">
-                    <strong>Informasi Tambahan (2023)</strong>
-                </div>
-                """, unsafe_allow_html=True)
-                st.markdown(f"**ROP Existing:** {rop_val_2024}")  # Asumsi ROP Existing sama untuk 2023
-                st.markdown(f"**Lead Time Minimal:** {lt_min_2023} hari")
-                st.markdown(f"**Lead Time Rata-rata:** {lt_avg_2023} hari")
-                st.markdown(f"**Lead Time Maksimal:** {lt_max_2023} hari")
-
-            st.markdown('</div>', unsafe_allow_html=True)
-
-            # ------------------------------------------------
-            # CARD - Visualisasi
-            # ------------------------------------------------
-            st.markdown(f"<div style='border: 1px solid #000000; padding: 10px; margin-bottom: 20px; border-radius: 10px;'>", unsafe_allow_html=True)
-            st.markdown("""
-            <div class="card-container">
-                <div class="title-section-no-bg">
-                    <h3>📈 Visualisasi Data</h3>
-                </div>
-            <div style="text-align: center; margin-bottom: 20px;">
-                <p>
-                    Di bawah ini, Anda akan menemukan berbagai visualisasi yang dirancang untuk memberikan wawasan mendalam tentang tren dan pola penggunaan barang selama beberapa tahun terakhir. Visualisasi ini mencakup total barang keluar per bulan dan tren perubahan barang keluar dari waktu ke waktu. Dengan data ini, Anda dapat dengan mudah mengidentifikasi periode dengan permintaan tinggi atau rendah, serta memahami dinamika inventaris Anda secara keseluruhan.
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
-
-
-            # 1) Total Barang Keluar per Bulan
-            st.markdown(f"<div style='border: 1px solid #000000; padding: 10px; margin-bottom: 20px; border-radius: 10px;'>", unsafe_allow_html=True)
-            st.markdown("""
-            <div class="title-section-no-bg">
-                <h4>📦 Total Barang Keluar per Bulan</h4>
-            </div>
-            """, unsafe_allow_html=True)
-            fig = make_subplots(rows=1, cols=len(selected_years),
-                                subplot_titles=[str(y) for y in selected_years])
-            for i, year in enumerate(selected_years):
-                if year in filtered_data['tanggal'].dt.year.unique():
-                    yearly_data = filtered_data[filtered_data['tanggal'].dt.year == year]
-                    monthly_data = yearly_data.groupby(yearly_data['tanggal'].dt.month)['jumlah'].sum().reset_index()
-                    monthly_data['tanggal'] = monthly_data['tanggal'].apply(lambda x: months[x-1] if x-1 < len(months) else x)
-                    fig.add_trace(
-                        go.Bar(x=monthly_data['tanggal'], y=monthly_data['jumlah'], name=str(year)),
-                        row=1, col=i+1
-                    )
-            fig.update_layout(title_text="Total Barang Keluar per Bulan", showlegend=False, height=400)
-            st.plotly_chart(fig)
-            
-            st.markdown(
-            f"""<div style=>
-            <b style='color:#000000;'>Penjelasan:</b> Grafik ini menampilkan jumlah keseluruhan barang yang dikeluarkan dari inventaris setiap bulan, memberikan wawasan mengenai fluktuasi permintaan dan membantu dalam mengidentifikasi tren permintaan sepanjang tahun. Informasi ini sangat penting untuk mengelola stok gudang secara efisien sesuai dengan kebutuhan yang diajukan oleh para pekerja produksi di PT Bakrie Pipe Industries.
-            </div>""",
-            unsafe_allow_html=True
-            )
-
-            # 2) Tren Barang Keluar per Bulan
-            st.markdown(f"<div style='border: 1px solid #000000; padding: 10px; margin-bottom: 20px; border-radius: 10px;'>", unsafe_allow_html=True)
-            st.markdown("""
-            <div class="title-section-no-bg">
-                <h4>📉 Tren Barang Keluar per Bulan</h4>
-            </div>
-            """, unsafe_allow_html=True)
-            fig2 = make_subplots(rows=1, cols=len(selected_years),
-                                 subplot_titles=[str(y) for y in selected_years])
-            for i, year in enumerate(selected_years):
-                if year in filtered_data['tanggal'].dt.year.unique():
-                    yearly_data = filtered_data[filtered_data['tanggal'].dt.year == year]
-                    monthly_trend = yearly_data.groupby(yearly_data['tanggal'].dt.month)['jumlah'].sum().reset_index()
-                    monthly_trend['tanggal'] = monthly_trend['tanggal'].apply(lambda x: months[x-1] if x-1 < len(months) else x)
-                    fig2.add_trace(
-                        go.Scatter(x=monthly_trend['tanggal'], y=monthly_trend['jumlah'],
-                                   mode='lines+markers', name=str(year)),
-                        row=1, col=i+1
-                    )
-            fig2.update_layout(title_text="Tren Barang Keluar per Bulan", showlegend=False, height=400)
-            st.plotly_chart(fig2)
-
-            st.markdown(
-            f"""<div style=>
-            <b style='color:#000000;'>Penjelasan:</b> Grafik ini menunjukkan pola pergerakan barang yang keluar dari inventaris seiring waktu, memungkinkan identifikasi pola musiman serta analisis perubahan dalam volume pengeluaran. Data ini krusial untuk memastikan ketersediaan stok gudang yang sesuai dengan permintaan produksi, sehingga para pekerja produksi di PT Bakrie Pipe Industries dapat bekerja dengan lancar tanpa kendala terkait ketersediaan bahan baku.
-            </div>""",
-            unsafe_allow_html=True
-            )
+                st.write("**Movement Status:** Data status tidak ditemukan")
 
-            st.markdown('</div>', unsafe_allow_html=True)
+            render_usage_card(result)
+            for scenario, evaluation in result["evaluations"].items():
+                render_evaluation_card(scenario, evaluation)
+            render_simulation_card(result, selected_years)
+            render_charts(result, selected_years)
+            render_downloads(export.search_tables(result), f"barang_{detail['nobar']}", tables, selected_years, what_ifs)
 
-else:
-    # Halaman awal (belum klik search)
-    st.markdown("""
-    <div class="main-header">
-        <h1>🌟 Selamat Datang di Smart Inventory Management (Evaluasi ROP)</h1>
-        <p>Warehouse PT Bakrie Pipe Industries</p>
-        <p><b>Hari ini:</b> """ + datetime.now().strftime('%A, %d %B %Y') + """</p>
-    </div>
-    """, unsafe_allow_html=True)
-
-    st.write("Gunakan filter di sebelah kiri, lalu klik tombol 'Search' untuk **mulai!**")
+    else:
+        # Halaman awal (belum klik search)
+        st.markdown("""
+        <div class="main-header">
+            <h1>🌟 Selamat Datang di Smart Inventory Management (Evaluasi ROP)</h1>
+            <p>Warehouse PT Bakrie Pipe Industries</p>
+            <p><b>Hari ini:</b> """ + datetime.now().strftime('%A, %d %B %Y') + """</p>
+        </div>
+        """, unsafe_allow_html=True)
 
+        st.write("Gunakan filter di sebelah kiri, lalu klik tombol 'Search' untuk **mulai!**")
+except Exception as exc:
+    if timer is not None:
+        timer.error = f"{type(exc).__name__}: {exc}"
+    raise
+finally:
+    if timer is not None:
+        timing = profiling.finish_request(timer)
+        if timer.profiler is not None:
+            st.session_state["timing_profile_done"] = True
+
+if timer is not None:
+    if show_timing:
+        with st.sidebar.expander("⏱️ Waktu request ini", expanded=True):
+            st.dataframe(profiling.breakdown(timing), hide_index=True)
+            st.caption(f"Total {timing['total']:.3f} s. Log: {profiling.LOG_PATH or '(mati)'}")
+            if timer.profile_text:
+                st.caption(f"cProfile disimpan di {timer.profile_path}")
+                st.code(timer.profile_text)
 
 # (Opsional) Footer
 st.markdown("""
@@ -0,0 +1,97 @@
+"""
+Warna tabel pemakaian, evaluasi dan banding tanpa callback Python per baris.
+
+Style dihitung sekali sebagai DataFrame CSS dengan mask vektor (baris
+"Keterangan Pemakaian", baris pemakaian, kolom tahun), lalu dipasang dengan
+satu Styler.apply(axis=None). Warna ranking ("Tertinggi", "Tertinggi ke-2",
+..., "Terendah") diambil dari satu mapping RANK_COLORS untuk semua tabel.
+
+Tabel besar (lebih dari MAX_STYLED_CELLS sel, mis. banding ratusan barang)
+tidak memakai Styler: Styler menghitung HTML/CSS per sel, jadi tabel seperti
+itu ditampilkan apa adanya dengan format kolom bawaan st.dataframe.
+"""
+import numpy as np
+import pandas as pd
+
+from item_search import get_rank_labels
+
+YELLOW = "background-color: #fff3cd"
+GREEN = "background-color: #d4edda"
+WHITE = "background-color: #ffffff"
+RANK_COLORS = {
+    "tertinggi": "background-color: #0d47a1; color: #ffffff;",
+    "tertinggi ke-2": "background-color: #1565c0; color: #ffffff;",
+    "tertinggi ke-3": "background-color: #1e88e5",
+    "tertinggi ke-4": "background-color: #42a5f5",
+    "terendah": "background-color: #bbdefb",
+}
+RANK_ROW = "Keterangan Pemakaian"
+MAX_STYLED_CELLS = 5000
+
+
+# ----------------------------------------------------
+# Ranking
+# ----------------------------------------------------
+def rank_colors(labels):
+    """CSS per label ranking (array / Series teks); label lain putih."""
+    labels = np.asarray(labels, dtype=object)
+    css = pd.Series(labels.ravel()).astype(str).str.lower().map(RANK_COLORS).fillna(WHITE)
+    return css.to_numpy(dtype=object).reshape(labels.shape)
+
+
+def rank_labels(values):
+    """
+    Label ranking per baris matriks pemakaian (barang x tahun), sama seperti
+    item_search.get_rank_labels: urut menurun, seri tetap urutan kolom.
+    """
+    values = np.asarray(values, dtype=float)
+    n_rows, n_cols = values.shape
+    names = np.array(get_rank_labels(n_cols) + ["-"] * n_cols, dtype=object)[:n_cols]
+    order = np.argsort(-np.nan_to_num(values, nan=-np.inf), axis=1, kind="stable")
+    labels = np.empty((n_rows, n_cols), dtype=object)
+    np.put_along_axis(labels, order, np.broadcast_to(names, (n_rows, n_cols)), axis=1)
+    return labels
+
+
+# ----------------------------------------------------
+# Style per tabel (DataFrame CSS, bentuk sama dengan tabel)
+# ----------------------------------------------------
+def _rank_row_styles(df, styles):
+    rank_row = (df["Keterangan"] == RANK_ROW).to_numpy()
+    if rank_row.any():
+        styles[rank_row, 0] = GREEN
+        styles[rank_row, 1:] = rank_colors(df.iloc[rank_row, 1:].to_numpy())
+    return styles
+
+
+def usage_styles(df):
+    """Tabel pemakaian: 6 baris pertama kuning, sisanya hijau, baris ranking berwarna."""
+    first_rows = np.asarray(df.index < 6)
+    styles = np.where(first_rows[:, None], YELLOW, GREEN).astype(object)
+    styles = np.broadcast_to(styles, df.shape).copy()
+    return pd.DataFrame(_rank_row_styles(df, styles), index=df.index, columns=df.columns)
+
+
+def evaluation_styles(df):
+    """Tabel evaluasi: baris pemakaian kuning, level order hijau, baris ranking berwarna."""
+    usage_row = (df["Keterangan"] == "Pemakaian Mutasi 1 th").to_numpy()
+    styles = np.broadcast_to(np.where(usage_row[:, None], YELLOW, GREEN).astype(object), df.shape).copy()
+    return pd.DataFrame(_rank_row_styles(df, styles), index=df.index, columns=df.columns)
+
+
+def comparison_styles(df, year_columns):
+    """Tabel pemakaian banding: kolom tahun diwarnai ranking per barang, kolom lain putih."""
+    styles = pd.DataFrame("", index=df.index, columns=df.columns)
+    if len(df) and year_columns:
+        styles[year_columns] = rank_colors(rank_labels(df[year_columns].to_numpy()))
+    return styles
+
+
+def styled(df, styles):
+    """
+    Styler dengan CSS yang sudah dihitung, atau DataFrame apa adanya jika tabel
+    lebih besar dari MAX_STYLED_CELLS sel.
+    """
+    if df.size > MAX_STYLED_CELLS:
+        return df
+    return df.style.apply(lambda _: styles, axis=None)
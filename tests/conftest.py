@@ -0,0 +1,5 @@
+# Modul aplikasi ada di root repo (bukan package), sama seperti di benchmarks/
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
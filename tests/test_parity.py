@@ -0,0 +1,137 @@
+"""
+Paritas dengan rumus dan filter dashboard awal.
+
+Mesin vektor (rop_engine, nobar_index, demand_stats) menggantikan kode per
+barang di dashboard lama; test ini mengunci hasilnya terhadap versi brute-force:
+
+- order_levels / evaluate_usage vs rumus list + round() Python (half-to-even),
+- NobarIndex.filter vs str.contains(query, case=False, na=False), termasuk regex
+  dan nobar kosong ("nan"),
+- demand_stats._bucket_stats vs np.mean / np.std / np.percentile pada deret
+  lengkap (bucket kosong = 0).
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+import demand_stats
+import lead_time_scenarios
+import rop_engine
+from nobar_index import NobarIndex
+
+
+# ----------------------------------------------------
+# Rumus dashboard awal (per tahun, list + round())
+# ----------------------------------------------------
+def baseline_levels(usage_per_year, lt_min, lt_avg, lt_max):
+    pakai_per_bulan = [v / 12 for v in usage_per_year]
+    pakai_per_minggu = [v / 4.29 for v in pakai_per_bulan]
+    pakai_per_hari_avg = [v / 7 for v in pakai_per_minggu]
+    pakai_per_hari_min = [v * 0.5 for v in pakai_per_hari_avg]
+    pakai_per_hari_max = [v * 1.5 for v in pakai_per_hari_avg]
+    n = len(usage_per_year)
+    rop = [round(pakai_per_hari_max[i] * lt_max) for i in range(n)]
+    min_stock = [rop[i] - round(pakai_per_hari_avg[i] * lt_avg) for i in range(n)]
+    order_qty = [round((rop[i] - round(pakai_per_hari_avg[i] * lt_avg)) * 2) for i in range(n)]
+    max_stock = [round(rop[i] + order_qty[i] - round(pakai_per_hari_min[i] * lt_min)) for i in range(n)]
+    return {"rop": rop, "min_stock": min_stock, "order_qty": order_qty, "max_stock": max_stock}
+
+
+USAGES = [0.0, 1.0, 7.5, 123.45, 360.36, 1000.0, 5405.4, 40804.64, -12.0]
+LEAD_TIMES = [(0, 0, 0), (1, 2, 3), (17.0, 30.17, 48.0), (14, 21.33, 36), (21, 21, 21), (0.5, 2.5, 4.5)]
+
+
+@pytest.mark.parametrize("lt", LEAD_TIMES)
+def test_evaluate_usage_matches_baseline(lt):
+    result = rop_engine.evaluate_usage(USAGES, *lt)
+    expected = baseline_levels(USAGES, *lt)
+    for key, values in expected.items():
+        assert result[key].tolist() == values, key
+
+
+def test_order_levels_rounds_half_to_even():
+    # Hasil kali tepat .5: round() Python dan np.round sama-sama ke genap
+    avg = np.array([0.5, 0.5, 1.5, 2.5, 0.25])
+    levels = rop_engine.order_levels(avg, avg, avg, 1.0, 1.0, 1.0)
+    assert levels["rop"].tolist() == [round(v) for v in avg] == [0, 0, 2, 2, 0]
+    levels = rop_engine.order_levels(avg, avg * 0.5, avg * 1.5, 5.0, 3.0, 3.0)
+    for i, v in enumerate(avg):
+        rop = round(v * 1.5 * 3.0)
+        min_stock = rop - round(v * 3.0)
+        order_qty = round(min_stock * 2)
+        assert levels["rop"][i] == rop
+        assert levels["min_stock"][i] == min_stock
+        assert levels["max_stock"][i] == round(rop + order_qty - round(v * 0.5 * 5.0))
+
+
+def test_catalogue_and_card_agree_for_missing_lead_time():
+    # Barang tanpa lead time: dashboard awal memakai 0; what-if tidak boleh
+    # mengubahnya menjadi lead time sungguhan
+    usage = pd.DataFrame({"nobar": ["A1", "A1", "B2", "B2"], "year": [2023, 2024] * 2,
+                          "usage": [500.0, 800.0, 1200.0, 90.0]})
+    lead_times = {"2024": pd.DataFrame({"nobar": ["A1"], "lead_time_minimal": [3.0],
+                                        "lead_time_avg": [5.0], "lead_time_maximal": [9.0]})}
+    what_ifs = (("2024", 1.0, 7.0),)
+    catalogue = rop_engine.evaluate_catalogue(usage, lead_time_scenarios.scenario_tables(lead_times, what_ifs))
+
+    index = NobarIndex({lead_time_scenarios.index_table("2024"): lead_times["2024"]})
+    for nobar, lt in (("A1", (3.0, 5.0, 9.0)), ("B2", (0, 0, 0))):
+        item_usage = usage.loc[usage["nobar"] == nobar, "usage"].tolist()
+        values = lead_time_scenarios.item_lead_times(index, nobar, ["2024"], what_ifs)
+        card = lead_time_scenarios.evaluate(rop_engine.daily_usage(item_usage), values)
+        for label, levels in card.items():
+            rows = catalogue[(catalogue["nobar"] == nobar) & (catalogue["lead_time"] == label)]
+            assert levels["rop"].tolist() == rows["rop"].tolist()
+            assert levels["max_stock"].tolist() == rows["max_stock"].tolist()
+        assert card["2024"]["rop"].tolist() == baseline_levels(item_usage, *lt)["rop"]
+    assert card["2024 +7 hari"]["rop"].tolist() == [0, 0]
+
+
+# ----------------------------------------------------
+# Pencarian nobar
+# ----------------------------------------------------
+NOBARS = ["CA0A00001", "ca0a00002", "CB4A60001", "PB1A.01", "RA5A00002", "nan", None, np.nan,
+          12345, "X(1)", "ML-200", "CA0A00001"]
+QUERIES = ["CA0A", "ca0a0000", "a0", "", "1", "nan", "NaN", "pb1a.", "^ca", "01$", "A|RA5", "X\\(1",
+           "CA0.0", "[0-9]{5}", "ml-2", "zzz", "123"]
+
+
+@pytest.mark.parametrize("categorical", [False, True])
+@pytest.mark.parametrize("query", QUERIES)
+def test_nobar_filter_matches_str_contains(query, categorical):
+    df = pd.DataFrame({"nobar": pd.Series(NOBARS, dtype=object), "nilai": range(len(NOBARS))})
+    if categorical:
+        df["nobar"] = df["nobar"].astype("category")
+    expected = df[df["nobar"].astype(str).str.contains(query, case=False, na=False)]
+    got = NobarIndex({"t": df}).filter("t", query)
+    assert got["nilai"].tolist() == expected["nilai"].tolist()
+
+
+# ----------------------------------------------------
+# Statistik permintaan
+# ----------------------------------------------------
+def test_bucket_stats_matches_numpy():
+    rng = np.random.default_rng(7)
+    n_buckets = np.array([365, 52, 1, 10, 0, 7])
+    group_ids, values, full = [], [], []
+    for g, n in enumerate(n_buckets):
+        filled = rng.choice(n, size=rng.integers(0, n + 1), replace=False) if n else np.array([], dtype=int)
+        series = np.zeros(n)
+        series[filled] = rng.normal(20, 15, size=len(filled)).round(2)
+        if g == 3 and len(filled):
+            series[filled[0]] = -5.0  # retur (pemakaian negatif)
+        full.append(series)
+        group_ids += [g] * len(filled)
+        values += series[filled].tolist()
+
+    percentiles = (10, 50, 90, 95)
+    stats = demand_stats._bucket_stats(np.asarray(group_ids, dtype=np.int64), np.asarray(values, dtype=float),
+                                       n_buckets, percentiles, "x")
+    for g, series in enumerate(full):
+        if len(series) == 0:
+            assert stats["x_mean"][g] == 0
+            continue
+        assert stats["x_mean"][g] == pytest.approx(series.mean())
+        assert stats["x_std"][g] == pytest.approx(series.std(ddof=1) if len(series) > 1 else 0.0, abs=1e-9)
+        for p in percentiles:
+            assert stats[f"x_p{p}"][g] == pytest.approx(np.percentile(series, p)), (g, p)
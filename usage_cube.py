@@ -0,0 +1,194 @@
+"""
+Usage cube: total pemakaian (jumlah) dan jumlah transaksi per
+(tahun file sumber, nobar, tahun, bulan).
+
+Cube dibangun sekali dari data transaksi per tahun dan diperbarui per file
+sumber: kalau hanya satu workbook berubah, hanya bagian tahun itu yang
+diagregasi ulang. Tabel "Data Pemakaian per Tahun", kartu evaluasi dan grafik
+bulanan membaca dari cube ini, bukan dari baris transaksi mentah.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+CUBE_COLUMNS = ["source_year", "nobar", "nobar_key", "year", "month", "jumlah", "count"]
+
+
+def aggregate_transactions(df, source_year):
+    """Agregasi satu frame transaksi menjadi sel cube (baris tanpa tanggal valid dibuang)."""
+    if "year" in df.columns and "month" in df.columns:
+        # Tanggal sudah di-parse saat ingest (data_loader.prepare_transactions)
+        year, month = df["year"], df["month"]
+    else:
+        tanggal = pd.to_datetime(df["tanggal"], format="%d/%m/%Y", errors="coerce")
+        year, month = tanggal.dt.year, tanggal.dt.month
+    work = pd.DataFrame({
+        "nobar": df["nobar"].astype(str),
+        "year": year.astype("float64"),
+        "month": month.astype("float64"),
+        "jumlah": df["jumlah"].astype("float64"),
+    }).dropna(subset=["year", "month"])
+    cube = (work.groupby(["nobar", "year", "month"], sort=False)["jumlah"]
+            .agg(["sum", "size"])
+            .rename(columns={"sum": "jumlah", "size": "count"})
+            .reset_index())
+    cube["year"] = cube["year"].astype(int)
+    cube["month"] = cube["month"].astype(int)
+    cube["source_year"] = source_year
+    cube["nobar_key"] = cube["nobar"].str.lower()
+    return cube[CUBE_COLUMNS]
+
+
+def merge_cells(current, added):
+    """Gabungkan sel cube lama dengan sel dari baris baru (jumlah & count dijumlahkan)."""
+    if current is None or not len(current):
+        return added
+    merged = pd.concat([current, added], ignore_index=True)
+    return (merged.groupby(["source_year", "nobar", "nobar_key", "year", "month"], sort=False)
+            [["jumlah", "count"]].sum().reset_index())[CUBE_COLUMNS]
+
+
+class UsageCube:
+    def __init__(self, parts=None):
+        # parts: {source_year: DataFrame sel cube}
+        self.parts = dict(parts or {})
+        self._rebuild()
+
+    def _rebuild(self):
+        frames = [p for p in self.parts.values() if len(p)]
+        if frames:
+            cube = pd.concat(frames, ignore_index=True)
+        else:
+            cube = pd.DataFrame(columns=CUBE_COLUMNS)
+        cube = cube.sort_values("nobar_key", kind="stable").reset_index(drop=True)
+        self.cells = cube
+        self._keys = cube["nobar_key"].to_numpy(dtype=object)
+
+    # ------------------------------------------------
+    # Update
+    # ------------------------------------------------
+    def replace_source(self, source_year, df):
+        self.parts[source_year] = aggregate_transactions(df, source_year)
+        self._rebuild()
+
+    def append_transactions(self, source_year, new_rows):
+        """Tambah baris transaksi baru ke sumber `source_year` tanpa agregasi ulang data lama."""
+        self.parts[source_year] = merge_cells(self.parts.get(source_year),
+                                              aggregate_transactions(new_rows, source_year))
+        self._rebuild()
+
+    # ------------------------------------------------
+    # Query
+    # ------------------------------------------------
+    def slice(self, nobar_keys, source_years=None, month_indices=None):
+        """Sel cube untuk nobar (lowercase) terpilih, tahun sumber dan bulan (1-12)."""
+        keys = np.sort(np.asarray(list(nobar_keys), dtype=object))
+        if len(keys) == 0 or len(self._keys) == 0:
+            return self.cells.iloc[0:0]
+        left = np.searchsorted(self._keys, keys, side="left")
+        right = np.searchsorted(self._keys, keys, side="right")
+        rows = [np.arange(a, b) for a, b in zip(left, right) if b > a]
+        sl = self.cells.iloc[np.concatenate(rows)] if rows else self.cells.iloc[0:0]
+        if source_years is not None:
+            sl = sl[sl["source_year"].isin(list(source_years))]
+        if month_indices is not None:
+            sl = sl[sl["month"].isin(list(month_indices))]
+        return sl
+
+    def catalogue_cells(self, source_years=None):
+        """Sel semua barang untuk tahun sumber terpilih (semua tahun jika None)."""
+        if source_years is None:
+            return self.cells
+        return self.cells[self.cells["source_year"].isin(list(source_years))]
+
+
+def yearly_usage(cells, years):
+    """Total jumlah per tahun (float, 0.0 jika tidak ada pemakaian)."""
+    totals = cells.groupby("year")["jumlah"].sum().to_dict()
+    return [float(totals.get(y, 0.0)) for y in years]
+
+
+def monthly_usage(cells, year):
+    """Series bulan (1-12) -> total jumlah untuk satu tahun; kosong jika tidak ada data."""
+    yearly = cells[cells["year"] == year]
+    return yearly.groupby("month")["jumlah"].sum()
+
+
+def daily_usage(df, years=None, by=()):
+    """
+    Total jumlah per hari dari baris transaksi (dasar grafik harian/mingguan):
+    kolom `by` (mis. nobar_key), year, tanggal, jumlah. Baris tanpa tanggal dibuang;
+    dengan `years`, hanya tahun tanggal itu yang disimpan.
+    """
+    by = list(by)
+    tanggal = pd.to_datetime(df["tanggal"]).dt.normalize()
+    work = pd.DataFrame({
+        **{c: df[c].to_numpy() for c in by},
+        "tanggal": tanggal.to_numpy(),
+        "jumlah": df["jumlah"].to_numpy(dtype="float64"),
+    }).dropna(subset=["tanggal"])
+    if years is not None:
+        work = work[work["tanggal"].dt.year.isin([int(y) for y in years])]
+    series = work.groupby(by + ["tanggal"], sort=True)["jumlah"].sum().reset_index()
+    series.insert(len(by), "year", series["tanggal"].dt.year)
+    return series
+
+
+# ----------------------------------------------------
+# Cache cube per proses
+# ----------------------------------------------------
+_CUBE = {"sources": {}, "cube": None, "version": None}
+_LOCK = threading.Lock()
+
+
+def source_key(df, year, source_versions=None):
+    """
+    Penanda isi partisi tahun `year`: versi file sumber dari
+    data_loader.source_versions() jika ada, selain itu objek DataFrame-nya.
+    """
+    version = (source_versions or {}).get(year)
+    return ("version", version) if version is not None else ("object", df)
+
+
+def is_unchanged(seen, df, year, source_versions=None):
+    """True jika partisi sama dengan penanda `seen` dari source_key sebelumnya."""
+    if seen is None:
+        return False
+    key = source_key(df, year, source_versions)
+    return seen[0] == key[0] and (seen[1] == key[1] if key[0] == "version" else seen[1] is key[1])
+
+
+def get_cube(data, version=None, changes=None, source_versions=None):
+    """
+    Cube untuk dict {tahun: DataFrame transaksi}. Hanya tahun yang berubah yang
+    diproses ulang: dengan `source_versions` (data_loader.source_versions())
+    dibandingkan versi file sumbernya, tanpa itu objek DataFrame-nya. Jika `changes`
+    (data_loader.last_changes()) berasal dari versi cube saat ini, tahun yang hanya
+    mendapat baris tambahan cukup digabung dengan agregasi baris barunya.
+    """
+    with _LOCK:
+        sources = _CUBE["sources"]
+        cube = _CUBE["cube"]
+        changed = [y for y, df in data.items() if not is_unchanged(sources.get(y), df, y, source_versions)]
+        removed = [y for y in sources if y not in data]
+        if cube is not None and not changed and not removed:
+            return cube
+
+        appended = {}
+        if changes and cube is not None and changes.get("base_version") == _CUBE["version"]:
+            appended = changes.get("appended", {})
+
+        parts = {y: p for y, p in (cube.parts.items() if cube is not None else []) if y in data}
+        for y in changed:
+            if y in appended and y in parts:
+                parts[y] = merge_cells(parts[y], aggregate_transactions(appended[y], y))
+            else:
+                parts[y] = aggregate_transactions(data[y], y)
+            sources[y] = source_key(data[y], y, source_versions)
+        for y in removed:
+            sources.pop(y, None)
+        cube = UsageCube(parts)
+        _CUBE["cube"] = cube
+        _CUBE["version"] = version
+        return cube